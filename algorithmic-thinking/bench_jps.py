@@ -0,0 +1,67 @@
+"""
+Benchmark: mini_astar_grid.astar vs. jps on open and maze-like grids.
+
+    python bench_jps.py
+
+JPS pays off when straight runs are long. On open maps it skips most of the
+symmetric cells. In a one-cell-wide maze almost every cell is already a
+decision point, so there is little left to prune.
+"""
+
+import random
+import time
+
+from mini_astar_grid import Grid, astar, jps
+
+
+def open_grid(size: int, wall_prob: float = 0.05, seed: int = 0) -> Grid:
+    rng = random.Random(seed)
+    grid = [[int(rng.random() < wall_prob) for _ in range(size)] for _ in range(size)]
+    grid[0][0] = grid[-1][-1] = 0
+    return grid
+
+
+def maze_grid(size: int, seed: int = 0) -> Grid:
+    """Perfect maze (iterative backtracker) on an odd-sized grid."""
+    rng = random.Random(seed)
+    size |= 1
+    grid = [[1] * size for _ in range(size)]
+    grid[0][0] = 0
+    stack = [(0, 0)]
+    while stack:
+        r, c = stack[-1]
+        options = [(r + dr, c + dc, dr // 2, dc // 2)
+                   for dr, dc in ((2, 0), (-2, 0), (0, 2), (0, -2))
+                   if 0 <= r + dr < size and 0 <= c + dc < size and grid[r + dr][c + dc]]
+        if not options:
+            stack.pop()
+            continue
+        nr, nc, hr, hc = rng.choice(options)
+        grid[r + hr][c + hc] = 0
+        grid[nr][nc] = 0
+        stack.append((nr, nc))
+    return grid
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    for label, grid in (("open 300x300, 5% walls", open_grid(300)),
+                        ("open 300x300, 20% walls", open_grid(300, 0.20)),
+                        ("maze 301x301", maze_grid(301))):
+        start, goal = (0, 0), (len(grid) - 1, len(grid[0]) - 1)
+        ref, t_astar = timed(astar, grid, start, goal)
+        path, t_jps = timed(jps, grid, start, goal)
+        path8, t_jps8 = timed(jps, grid, start, goal, diagonal=True)
+        assert (ref is None) == (path is None)
+        if ref is not None:
+            assert len(ref) == len(path), "JPS must match astar's optimal length"
+        print(f"{label}")
+        print(f"  astar      {t_astar:7.3f}s  length {len(ref) if ref else None}")
+        print(f"  jps        {t_jps:7.3f}s  length {len(path) if path else None}"
+              f"  ({t_astar / t_jps:.1f}x)")
+        print(f"  jps (8-way){t_jps8:7.3f}s  cells {len(path8) if path8 else None}")
@@ -0,0 +1,181 @@
+"""
+D* Lite: incremental replanning on mini_astar_grid-style grids
+--------------------------------------------------------------
+The planner searches backwards from the goal and keeps its g / rhs tables
+between calls. When cells change, only the vertices whose cost-to-goal is
+actually affected are re-expanded; everything else is reused. Moving the
+start (the agent walking along its path) is handled with the usual key
+modifier km, so the queue never has to be rebuilt.
+
+Same conventions as mini_astar_grid: 0 = free, 1 = wall, 4-connected moves
+of cost 1, Manhattan heuristic.
+
+    planner = DStarLite(grid, start, goal)
+    path = planner.plan()
+    planner.update_cells([(r, c, 1)])    # a wall appears
+    planner.move_start(path[1])          # the agent took one step
+    path = planner.plan()                # repaired, not recomputed
+
+Reference: Koenig & Likhachev, "D* Lite" (AAAI 2002), optimized version.
+"""
+
+from heapq import heappush, heappop
+from typing import Iterable
+
+from mini_astar_grid import Grid, Point, heuristic
+
+INF = float("inf")
+
+
+class DStarLite:
+    def __init__(self, grid: Grid, start: Point, goal: Point):
+        self.grid = grid
+        self.height, self.width = len(grid), len(grid[0])
+        self.start = start
+        self.goal = goal
+        self.km = 0
+        self._last = start
+        self.g: dict[Point, float] = {}
+        self.rhs: dict[Point, float] = {goal: 0}
+        self._queue: list[tuple[tuple[float, float], Point]] = []
+        self._queued: dict[Point, tuple[float, float]] = {}   # live key per vertex
+        self.expansions = 0
+        self._push(goal, self._key(goal))
+
+    # --- graph -----------------------------------------------------------
+    def _adjacent(self, p: Point) -> list[Point]:
+        r, c = p
+        return [(rr, cc) for rr, cc in ((r-1, c), (r+1, c), (r, c-1), (r, c+1))
+                if 0 <= rr < self.height and 0 <= cc < self.width]
+
+    def _cost(self, a: Point, b: Point) -> float:
+        return INF if self.grid[a[0]][a[1]] or self.grid[b[0]][b[1]] else 1
+
+    # --- priority queue with lazy deletion -------------------------------
+    def _key(self, s: Point) -> tuple[float, float]:
+        best = min(self.g.get(s, INF), self.rhs.get(s, INF))
+        return (best + heuristic(self.start, s) + self.km, best)
+
+    def _push(self, s: Point, key: tuple[float, float]) -> None:
+        self._queued[s] = key
+        heappush(self._queue, (key, s))
+
+    def _top(self) -> tuple[tuple[float, float], Point] | None:
+        while self._queue:
+            key, s = self._queue[0]
+            if self._queued.get(s) == key:
+                return key, s
+            heappop(self._queue)   # stale: vertex was re-keyed or removed
+        return None
+
+    # --- D* Lite core ----------------------------------------------------
+    def _update_vertex(self, u: Point) -> None:
+        if u != self.goal:
+            self.rhs[u] = min((self._cost(u, s) + self.g.get(s, INF) for s in self._adjacent(u)),
+                              default=INF)
+        self._queued.pop(u, None)
+        if self.g.get(u, INF) != self.rhs.get(u, INF):
+            self._push(u, self._key(u))
+
+    def _compute_shortest_path(self) -> None:
+        while True:
+            top = self._top()
+            start_key = self._key(self.start)
+            g_start, rhs_start = self.g.get(self.start, INF), self.rhs.get(self.start, INF)
+            if top is None or (top[0] >= start_key and rhs_start == g_start):
+                return
+            k_old, u = top
+            k_new = self._key(u)
+            if k_old < k_new:
+                self._push(u, k_new)
+                continue
+            heappop(self._queue)
+            del self._queued[u]
+            self.expansions += 1
+            g_u, rhs_u = self.g.get(u, INF), self.rhs.get(u, INF)
+            if g_u > rhs_u:
+                self.g[u] = rhs_u
+                for s in self._adjacent(u):
+                    self._update_vertex(s)
+            else:
+                self.g[u] = INF
+                self._update_vertex(u)
+                for s in self._adjacent(u):
+                    self._update_vertex(s)
+
+    # --- public API --------------------------------------------------------
+    def plan(self) -> list[Point] | None:
+        """Repair the search as needed and return the current start → goal path."""
+        self._compute_shortest_path()
+        if self.rhs.get(self.start, INF) == INF:
+            return None
+        path = [self.start]
+        cur = self.start
+        while cur != self.goal:
+            cur = min(self._adjacent(cur), key=lambda s: self._cost(cur, s) + self.g.get(s, INF))
+            path.append(cur)
+            if len(path) > self.height * self.width:
+                raise RuntimeError("D* Lite path extraction looped; g-values are inconsistent")
+        return path
+
+    def move_start(self, new_start: Point) -> None:
+        self.start = new_start
+        self.km += heuristic(self._last, new_start)
+        self._last = new_start
+
+    def update_cells(self, changes: Iterable[tuple[int, int, int]]) -> None:
+        """Apply (row, col, value) changes; affected vertices are re-queued for plan()."""
+        touched: set[Point] = set()
+        for r, c, value in changes:
+            if self.grid[r][c] == value:
+                continue
+            self.grid[r][c] = value
+            touched.add((r, c))
+            touched.update(self._adjacent((r, c)))
+        for s in touched:
+            self._update_vertex(s)
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    from mini_astar_grid import astar
+
+    rng = random.Random(1)
+    size = 80
+    grid = [[int(rng.random() < 0.2) for _ in range(size)] for _ in range(size)]
+    start, goal = (0, 0), (size - 1, size - 1)
+    grid[0][0] = grid[-1][-1] = 0
+
+    planner = DStarLite([row[:] for row in grid], start, goal)
+    reference = [row[:] for row in grid]
+    t_inc = t_full = 0.0
+    ticks = 0
+    path = planner.plan()
+    while path is not None and len(path) > 1:
+        # The agent takes one step, then a few walls appear or disappear
+        changes = []
+        for _ in range(3):
+            r, c = rng.randrange(size), rng.randrange(size)
+            if (r, c) not in (path[1], goal):
+                changes.append((r, c, 1 - planner.grid[r][c]))
+        for r, c, v in changes:
+            reference[r][c] = v
+
+        t0 = time.perf_counter()
+        planner.move_start(path[1])
+        planner.update_cells(changes)
+        path = planner.plan()
+        t_inc += time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        fresh = astar(reference, planner.start, goal)
+        t_full += time.perf_counter() - t0
+
+        assert (fresh is None) == (path is None)
+        assert fresh is None or len(fresh) == len(path)
+        ticks += 1
+
+    print(f"{ticks} ticks on {size}x{size}: D* Lite {t_inc:.3f}s, "
+          f"astar from scratch {t_full:.3f}s, reached goal: {path is not None}")
@@ -0,0 +1,529 @@
+"""
+NumPy-backed grid A* engine
+---------------------------
+Same search as mini_astar_grid.astar (4-connected, every move costs 1,
+Manhattan heuristic, identical tie-breaking, so identical paths), laid out
+for big occupancy maps:
+
+  - the grid is a uint8 array padded with a one-cell wall border, so path
+    tracing never needs a bounds check; each row is also kept as a Python
+    int bitset (bit c = column c is free), plus a bit-reversed copy
+  - cells are flat int indices; a neighbor is just idx ± 1 or idx ± stride
+  - g-cost and parent live in preallocated arrays reused between queries.
+    g_cost holds base + g, where base is a per-query stamp that shrinks
+    every query, so nothing is cleared between queries: older entries read
+    as unseen, and walls hold 0, so a single read tells "wall", "this
+    query" and "unseen" apart
+
+Instead of popping one cell at a time, the search expands a whole f level
+per row with big-int arithmetic. f only stays the same or grows by 2 along
+an edge, and within one level astar's (f, (r, c)) heap order is fixed:
+
+  - rows above the goal row come off top-down; in each row every cell runs
+    sideways toward the goal column, so the row's share of the level is one
+    carry-propagation, ((F + X) ^ F | X) & F, over its free bits F from the
+    seeds X (left of the goal column in normal bit order, right of it in
+    reversed order, so "toward the goal" is always toward the higher bits)
+  - the goal row and the rows below come off as a depth-first stack (up
+    before sideways), swept bottom-up the same way
+  - moves away from the goal seed the next level, f + 2
+
+A query costs a few big-int operations per (level, row) it touches, not per
+cell. Finished levels are written into g_cost in vectorized batches. The
+path is then traced back from the goal: above the goal row, a cell's parent
+is its first-popped neighbor one step closer to the start, i.e. the smallest
+(level, index); at and below it, the parent comes from the depth-first order,
+found by sweeping the level's bitsets backward from the cell (cone()). The
+parents go into the parent array and the path is read off it.
+
+components() labels the map's free regions once (a few vectorized passes
+over every cell, ~seconds at 4096x4096, dropped by set_cell()); after that,
+astar answers unreachable goals without flooding the start's region.
+
+On random maps with 25% walls, long queries run a median ~20x faster than
+astar at 1024x1024 and ~55x at 4096x4096 (50-70x corner to corner). The gain
+is smallest (2-5x) when the levels are only a cell or two per row: nearly
+straight paths, where astar pops little more than the path itself, and long
+detours around wall clusters. A query a few dozen cells long is mostly fixed
+per-query cost.
+
+Usage:
+    engine = GridEngine(grid)          # list[list[int]] or 2-D array, 0 = free
+    path = engine.astar((0, 0), (H-1, W-1))
+"""
+
+from bisect import bisect_left
+import time
+
+import numpy as np
+
+from mini_astar_grid import Grid, Point, astar
+
+UNSEEN = np.iinfo(np.int64).max
+G_BITS = 32              # g of any path fits in 32 bits (fewer cells than that)
+GENERATIONS = 1 << 30    # queries between full resets of g_cost
+FLUSH_ROWS = 4096        # (level, row) bitsets buffered before writing g_cost
+REVERSED_BYTES = bytes(int(f"{i:08b}"[::-1], 2) for i in range(256))
+
+
+def _reverse_bits(bits: int, width: int) -> int:
+    """Bit i of the result is bit width-1-i of bits."""
+    nbytes = (width + 7) // 8
+    flipped = bits.to_bytes(nbytes, "little").translate(REVERSED_BYTES)
+    return int.from_bytes(flipped, "big") >> (nbytes * 8 - width)
+
+
+def _run_toward(free: int, seeds: int) -> int:
+    """Seeds plus every free bit reachable from one by stepping to higher bits."""
+    seeds &= free
+    return ((free + seeds) ^ free | seeds) & free
+
+
+class GridEngine:
+    def __init__(self, grid: Grid | np.ndarray):
+        cells = np.asarray(grid, dtype=np.uint8)
+        if cells.ndim != 2:
+            raise ValueError(f"grid must be 2-D, got shape {cells.shape}")
+        self.height, self.width = cells.shape
+        self.stride = self.width + 2
+        padded = np.ones((self.height + 2, self.stride), dtype=np.uint8)
+        padded[1:-1, 1:-1] = cells != 0
+        self.blocked = padded.ravel()
+        free = cells == 0
+        self._row_bits = [int.from_bytes(row.tobytes(), "little")
+                          for row in np.packbits(free, axis=1, bitorder="little")]
+        self._row_bits_rev = [int.from_bytes(row.tobytes(), "little")
+                              for row in np.packbits(free[:, ::-1], axis=1, bitorder="little")]
+        self.g_cost = np.empty(self.blocked.size, dtype=np.int64)
+        self.parent = np.full(self.blocked.size, -1, dtype=np.int32)
+        self._labels: np.ndarray | None = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self.g_cost.fill(UNSEEN)
+        self.g_cost[self.blocked != 0] = 0     # walls can never be improved
+        self._generation = 0
+
+    def _next_base(self) -> int:
+        """Stamp for a new query: g_cost holds base + g, and base shrinks every
+        query, so anything written by an earlier query reads as unseen."""
+        self._generation += 1
+        if self._generation == GENERATIONS:
+            self._reset()
+            self._generation = 1
+        return (GENERATIONS - self._generation) << G_BITS
+
+    def to_index(self, p: Point) -> int:
+        return (p[0] + 1) * self.stride + (p[1] + 1)
+
+    def to_point(self, idx: int) -> Point:
+        r, c = divmod(idx, self.stride)
+        return (r - 1, c - 1)
+
+    def set_cell(self, p: Point, value: int) -> None:
+        idx = self.to_index(p)
+        if self.blocked[idx] != (value != 0):
+            self.blocked[idx] = value != 0
+            self.g_cost[idx] = 0 if value else UNSEEN
+            r, c = p
+            self._row_bits[r] ^= 1 << c
+            self._row_bits_rev[r] ^= 1 << (self.width - 1 - c)
+            self._labels = None
+
+    def components(self) -> np.ndarray:
+        """
+        Label 4-connected free regions (label = smallest flat index in the region).
+        Min-label hooking plus pointer jumping; converges in a handful of
+        vectorized rounds, but still touches every cell several times (seconds
+        on a 4096x4096 map). Cached until set_cell() changes the map.
+        """
+        if self._labels is not None:
+            return self._labels
+        free = self.blocked == 0
+        a = np.concatenate([np.flatnonzero(free[:-off] & free[off:]) for off in (1, self.stride)])
+        b = a.copy()
+        split = np.count_nonzero(free[:-1] & free[1:])
+        b[:split] += 1
+        b[split:] += self.stride
+        labels = np.arange(self.blocked.size, dtype=np.int32)
+        while True:
+            la, lb = labels[a], labels[b]
+            if np.array_equal(la, lb):
+                break
+            low = np.minimum(la, lb)
+            np.minimum.at(labels, la, low)
+            np.minimum.at(labels, lb, low)
+            while True:
+                jumped = labels[labels]
+                if np.array_equal(jumped, labels):
+                    break
+                labels = jumped
+        self._labels = labels
+        return labels
+
+    def reachable(self, start: Point, goal: Point) -> bool:
+        s, t = self.to_index(start), self.to_index(goal)
+        if s == t:
+            return True
+        if self.blocked[t]:
+            return False
+        if self.blocked[s]:
+            return True   # astar still expands a walled start cell; let the search decide
+        labels = self.components()
+        return bool(labels[s] == labels[t])
+
+    def astar(self, start: Point, goal: Point) -> list[Point] | None:
+        """
+        Same path as mini_astar_grid.astar. Unreachable goals are answered
+        without a search only once components() has labelled the current map;
+        otherwise they flood the start's region, like astar.
+        """
+        for r, c in (start, goal):
+            if not (0 <= r < self.height and 0 <= c < self.width):
+                raise ValueError(f"point {(r, c)} is outside the {self.height}x{self.width} grid")
+        s, t = self.to_index(start), self.to_index(goal)
+        if s == t:
+            return [start]
+        if self.blocked[t]:
+            return None
+        if self._labels is not None and not self.reachable(start, goal):
+            return None
+        try:
+            return self._search(s, t, self._next_base())
+        finally:
+            if self.blocked[s]:
+                self.g_cost[s] = 0    # the search wrote a g for the walled start
+
+    def _search(self, s: int, t: int, base: int) -> list[Point] | None:
+        W, H = self.width, self.height
+        sr, sc = self.to_point(s)
+        gr, gc = self.to_point(t)
+        row_bits, row_bits_rev = self._row_bits, self._row_bits_rev
+        # One int per row: columns 0..gc at bits 0..gc, a zero guard bit, then
+        # columns W-1..gc at bits gc+2..W+1, so both halves run toward the
+        # goal column at their top bit (the goal column is in both halves).
+        off = gc + 2
+        left, right = (1 << (gc + 1)) - 1, (1 << (W - gc)) - 1
+        axis = 1 << gc | 1 << (W + 1)
+        start = (1 << sc if sc <= gc else 0) | (1 << (W + 1 + gc - sc) if sc >= gc else 0)
+        avail = {sr: row_bits[sr] & left | (row_bits_rev[sr] & right) << off | start}
+        seeds = {sr: start}       # row -> cells pushed at f - 2 that come off at f
+        f = abs(sr - gr) + abs(sc - gc)
+        below: dict[int, dict[int, tuple[int, int]]] = {}   # f -> row -> (cells, roots)
+        done: list[tuple[int, int, int]] = []                # (row, f, cells) not yet in g_cost
+
+        while seeds:
+            pushed: dict[int, int] = {}
+            rows = sorted(seeds)
+            n_above = bisect_left(rows, gr)
+            # Rows above the goal row, top-down; each row hands its cells down
+            i, carry, r = 0, 0, -1
+            while True:
+                if carry:
+                    r += 1
+                    if r == gr:
+                        break
+                    x = carry
+                    if i < n_above and rows[i] == r:
+                        x |= seeds[r]
+                        i += 1
+                elif i < n_above:
+                    r = rows[i]
+                    x = seeds[r]
+                    i += 1
+                else:
+                    break
+                F = avail.get(r)
+                if F is None:
+                    F = row_bits[r] & left | (row_bits_rev[r] & right) << off
+                x &= F
+                level = ((F + x) ^ F | x) & F     # _run_toward(F, x), inlined
+                if level & axis:
+                    level |= axis
+                carry = level
+                if not level:
+                    continue
+                avail[r] = F ^ level
+                done.append((r, f, level))
+                if r:
+                    pushed[r - 1] = pushed.get(r - 1, 0) | level
+                pushed[r] = pushed.get(r, 0) | level >> 1
+            from_above = carry if r == gr else 0
+
+            # The goal row and below, bottom-up: a row's cells come off right
+            # after the cells below them, as long as they stay at this level
+            rows = rows[n_above:]
+            if from_above and (not rows or rows[0] != gr):
+                rows.insert(0, gr)
+            level_below: dict[int, tuple[int, int]] = {}
+            n_done = len(done)
+            i, carry, r = len(rows) - 1, 0, H
+            found = False
+            while True:
+                if carry:
+                    r -= 1
+                    if r < gr:
+                        break
+                    if i >= 0 and rows[i] == r:
+                        i -= 1
+                elif i >= 0:
+                    r = rows[i]
+                    i -= 1
+                else:
+                    break
+                F = avail.get(r)
+                if F is None:
+                    F = row_bits[r] & left | (row_bits_rev[r] & right) << off
+                roots = seeds.get(r, 0) | (from_above if r == gr else 0)
+                roots &= F
+                if roots & axis:
+                    roots |= axis
+                x = carry & F | roots
+                level = ((F + x) ^ F | x) & F     # _run_toward(F, x), inlined
+                if level & axis:
+                    level |= axis
+                carry = level
+                if not level:
+                    continue
+                avail[r] = F ^ level
+                done.append((r, f, level))
+                level_below[r] = (level, roots)
+                if r + 1 < H:
+                    pushed[r + 1] = pushed.get(r + 1, 0) | level
+                pushed[r] = pushed.get(r, 0) | level >> 1
+                if r == gr:
+                    carry = 0
+                    if r:
+                        pushed[r - 1] = pushed.get(r - 1, 0) | level
+                    found = bool(level >> gc & 1)
+            below[f] = level_below
+
+            if found:
+                # The last level below the goal row is traced from its bitsets
+                del done[n_done:]
+                if done:
+                    self._write_g(base, gr, gc, done)
+                return self._trace(s, t, base, f, below)
+            if len(done) >= FLUSH_ROWS:
+                self._write_g(base, gr, gc, done)
+                done = []
+            seeds = pushed
+            f += 2
+        return None
+
+    def _write_g(self, base: int, gr: int, gc: int, done: list[tuple[int, int, int]]) -> None:
+        """g_cost[cell] = base + f - h(cell) for every cell of every (row, f, cells)."""
+        W = self.width
+        nbytes = (W + 2 + 63) // 64 * 8
+        rows, f, cells = zip(*done)
+        words = np.frombuffer(b"".join([bits.to_bytes(nbytes, "little") for bits in cells]),
+                              dtype=np.uint64)
+        nonzero = np.flatnonzero(words)
+        bits = np.unpackbits(words[nonzero].view(np.uint8), bitorder="little").reshape(-1, 64)
+        word, bit = np.nonzero(bits)
+        pos = nonzero[word]
+        entry = pos // (nbytes // 8)
+        rows = np.array(rows, dtype=np.int64)[entry]
+        f = np.array(f, dtype=np.int64)[entry]
+        bit = (pos % (nbytes // 8)) * 64 + bit
+        cols = np.where(bit <= gc, bit, W + 1 + gc - bit)
+        idx = (rows + 1) * self.stride + (cols + 1)
+        self.g_cost[idx] = base + f - (np.abs(rows - gr) + np.abs(cols - gc))
+
+    def _trace(self, s: int, t: int, base: int, f: int,
+               below: dict[int, dict[int, tuple[int, int]]]) -> list[Point]:
+        """Walk back from the goal, writing each cell's astar parent, then read the path off."""
+        W, stride = self.width, self.stride
+        g_cost = memoryview(self.g_cost)
+        parent = memoryview(self.parent)
+        gr, gc = divmod(t, stride)     # padded, like the indices
+        split = W + 2 - gc    # reversed row: right half at bits 0.., left half from bit split
+
+        def is_root(f: int, idx: int) -> bool:
+            r, c = divmod(idx, stride)
+            cells = below[f].get(r - 1)
+            if cells is None:
+                return False
+            return bool(cells[1] >> (c - 1 if c <= gc else W + 1 + gc - c) & 1)
+
+        def cone(f: int, idx: int, last_row: int | None = None) -> tuple[int, dict[int, int]] | None:
+            """
+            Cells of level f (goal row and below) that reach idx without passing
+            a root, swept downward row by row in reversed bit order (away from
+            the goal column is toward the higher bits). Returns the smallest root
+            that reaches idx, which is the one whose depth-first run popped it,
+            and the swept cells per row; None if no root at or above last_row.
+            """
+            level_below = below[f]
+            r, c = divmod(idx, stride)
+            front = (1 << (split + gc - c) if c <= gc else 0) | (1 << (c - gc) if c >= gc else 0)
+            axis = 1 | 1 << split
+            swept = {}
+            while last_row is None or r <= last_row:
+                cells, roots = level_below[r - 1]
+                cells, roots = _reverse_bits(cells, W + 2), _reverse_bits(roots, W + 2)
+                front &= cells
+                if front & axis:
+                    front |= axis
+                hit = front & roots
+                run = _run_toward(cells & ~roots, front)
+                hit |= run << 1 & roots
+                swept[r] = run
+                if hit:
+                    left_hit = hit >> split
+                    if left_hit:
+                        c = gc - (left_hit.bit_length() - 1)
+                    else:
+                        c = gc + (hit & -hit).bit_length() - 1
+                    return r * stride + c, swept
+                front = run
+                r += 1
+            return None
+
+        x, g = t, f
+        while x != s:
+            r = x // stride
+            c = x - r * stride
+            want = base + g - 1
+            if r < gr:
+                # First popped neighbor one step closer to the start: the
+                # smallest (level, index), and level f - 2 lies toward the goal
+                if c > gc and g_cost[x - 1] == want:
+                    p, f = x - 1, f - 2
+                elif c < gc and g_cost[x + 1] == want:
+                    p, f = x + 1, f - 2
+                elif g_cost[x + stride] == want:
+                    p, f = x + stride, f - 2
+                elif g_cost[x - stride] == want:
+                    p = x - stride
+                elif c <= gc and g_cost[x - 1] == want:
+                    p = x - 1
+                else:
+                    p = x + 1
+            elif not is_root(f, x):
+                # Popped by the depth-first run of the smallest root reaching it,
+                # along the first path (up before sideways) that run takes
+                root, swept = cone(f, x)
+                z = root
+                while z != x:
+                    zr, zc = divmod(z, stride)
+                    up = z - stride
+                    run = swept.get(zr - 1, 0)
+                    if zr > gr and (up == x or run >> (split + gc - zc if zc <= gc else zc - gc) & 1):
+                        nxt = up
+                    else:
+                        nxt = z + 1 if zc < gc else z - 1
+                    parent[nxt] = z
+                    z = nxt
+                x = root
+                r, c = divmod(x, stride)
+                g = f - abs(r - gr) - abs(c - gc)
+                continue
+            else:
+                # A root: pushed at level f - 2 from above or from the goal
+                # column side, else handed down from the row above
+                up = x - stride if r > gr and g_cost[x - stride] == want else None
+                side = x + 1 if c < gc else x - 1 if c > gc else None
+                if side is not None and g_cost[side] != want:
+                    side = None
+                if up is None and side is None:
+                    p = x - stride
+                elif up is None or side is None:
+                    p, f = up if side is None else side, f - 2
+                else:
+                    # Both came off at f - 2: the one whose depth-first run came first
+                    f -= 2
+                    root_up = up if is_root(f, up) else cone(f, up)[0]
+                    if is_root(f, side):
+                        root_side = side
+                    else:
+                        swept_side = cone(f, side, root_up // stride)
+                        root_side = swept_side[0] if swept_side else None
+                    p = side if root_side is not None and root_side < root_up else up
+            parent[x] = p
+            x = p
+            g -= 1
+        return self._reconstruct(s, t)
+
+    def _reconstruct(self, s: int, t: int) -> list[Point]:
+        parent = memoryview(self.parent)
+        path = [self.to_point(t)]
+        cur = t
+        while cur != s:
+            cur = parent[cur]
+            path.append(self.to_point(cur))
+        path.reverse()
+        return path
+
+
+def random_grid(height: int, width: int, wall_prob: float = 0.25, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    grid = (rng.random((height, width)) < wall_prob).astype(np.uint8)
+    grid[0, 0] = grid[-1, -1] = 0
+    return grid
+
+
+if __name__ == "__main__":
+    # Small sanity check against the reference implementation
+    grid = [
+        [0,0,0,0,0],
+        [0,1,1,1,0],
+        [0,0,0,1,0],
+        [1,1,0,0,0],
+        [0,0,0,1,0],
+    ]
+    assert GridEngine(grid).astar((0, 0), (4, 4)) == astar(grid, (0, 0), (4, 4))
+
+    # Identical paths on many small random maps, between arbitrary cells
+    rng = np.random.default_rng(1)
+    for trial in range(300):
+        small = random_grid(*rng.integers(1, 16, size=2), wall_prob=trial % 4 / 10, seed=trial)
+        engine = GridEngine(small)
+        cells = small.tolist()
+        for _ in range(5):
+            start = tuple(int(v) for v in rng.integers(0, small.shape))
+            goal = tuple(int(v) for v in rng.integers(0, small.shape))
+            assert engine.astar(start, goal) == astar(cells, start, goal), (trial, start, goal)
+
+    # Reachable and unreachable queries on larger random maps
+    for size, seed in ((256, 0), (1024, 0), (1024, 2)):
+        big = random_grid(size, size, seed=seed)
+        goal = (size - 1, size - 1)
+        t0 = time.perf_counter()
+        ref = astar(big.tolist(), (0, 0), goal)
+        t_ref = time.perf_counter() - t0
+        engine = GridEngine(big)
+        t0 = time.perf_counter()
+        fast = engine.astar((0, 0), goal)
+        t_fast = time.perf_counter() - t0
+        assert fast == ref
+        print(f"{size}x{size}: astar {t_ref:.3f}s, GridEngine {t_fast:.3f}s "
+              f"({t_ref / t_fast:.1f}x), path length {len(fast) if fast else None}")
+        if fast is None:
+            t0 = time.perf_counter()
+            engine.components()
+            t_labels = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            assert engine.astar((0, 0), goal) is None
+            t_query = time.perf_counter() - t0
+            print(f"  with components(): {t_labels:.3f}s once per map, then "
+                  f"{t_query * 1e6:.0f}us per unreachable query "
+                  f"({t_ref / (t_labels + t_query):.1f}x for the first one)")
+
+    # 4096x4096: a long query, and a short one that costs only the cells it touches
+    size = 4096
+    big = random_grid(size, size, seed=0)
+    big[2000, 2000:2011] = 0
+    big[3000, 3000] = big[2000, 1000] = 0
+    cells = big.tolist()
+    engine = GridEngine(big)
+    for start, goal in (((3000, 3000), (2000, 1000)), ((2000, 2000), (2000, 2010))):
+        t0 = time.perf_counter()
+        ref = astar(cells, start, goal)
+        t_ref = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        fast = engine.astar(start, goal)
+        t_fast = time.perf_counter() - t0
+        assert fast == ref
+        print(f"{size}x{size}, {start} -> {goal}: astar {t_ref * 1e3:.2f}ms, "
+              f"GridEngine {t_fast * 1e3:.2f}ms ({t_ref / t_fast:.1f}x)")
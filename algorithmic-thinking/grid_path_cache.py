@@ -0,0 +1,150 @@
+"""
+LRU path cache in front of mini_astar_grid.astar
+------------------------------------------------
+Repeated (start, goal) queries on a map that barely changes should not
+re-run A*. PathCache keeps the most recently used paths and, when cells
+change, drops only the entries the change can actually affect:
+
+  - a cell becomes a wall -> entries whose path runs through that cell
+    (found via a cell -> keys index, no scan)
+  - a wall is removed     -> entries that could now get shorter: no-path
+    entries, and paths where manhattan(start, cell) + manhattan(cell, goal)
+    is below the cached length (a shortcut through the cell must be at least
+    that long)
+
+Every other entry is still an optimal path on the new map and is kept.
+
+    cache = PathCache(grid, maxsize=10_000)
+    cache.get((0, 0), (4, 4))
+    cache.update_cells([(2, 2, 1)])     # (row, col, value), 1 = wall
+    cache.stats()
+"""
+
+from collections import OrderedDict
+from typing import Callable, Iterable
+
+from mini_astar_grid import Grid, Point, astar, heuristic
+
+Planner = Callable[[Grid, Point, Point], list[Point] | None]
+
+
+class PathCache:
+    def __init__(self, grid: Grid, maxsize: int = 1024, planner: Planner = astar):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.grid = grid
+        self.maxsize = maxsize
+        self.planner = planner
+        self.version = 0           # number of updates that changed the map (reported by stats())
+        self._entries: OrderedDict[tuple[Point, Point], list[Point] | None] = OrderedDict()
+        self._by_cell: dict[Point, set[tuple[Point, Point]]] = {}
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def get(self, start: Point, goal: Point) -> list[Point] | None:
+        key = (start, goal)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            path = self._entries[key]
+            return None if path is None else list(path)
+
+        self.misses += 1
+        path = self.planner(self.grid, start, goal)
+        self._store(key, path)
+        return None if path is None else list(path)
+
+    def _store(self, key: tuple[Point, Point], path: list[Point] | None) -> None:
+        self._entries[key] = path
+        for cell in path or ():
+            self._by_cell.setdefault(cell, set()).add(key)
+        if len(self._entries) > self.maxsize:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def _drop(self, key: tuple[Point, Point]) -> None:
+        path = self._entries.pop(key)
+        for cell in path or ():
+            keys = self._by_cell.get(cell)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_cell[cell]
+
+    def update_cells(self, changes: Iterable[tuple[int, int, int]]) -> int:
+        """Apply (row, col, value) changes to the grid; return the number of entries dropped."""
+        walled: list[Point] = []
+        freed: list[Point] = []
+        for r, c, value in changes:
+            if self.grid[r][c] == value:
+                continue
+            self.grid[r][c] = value
+            (walled if value else freed).append((r, c))
+        if not walled and not freed:
+            return 0
+        self.version += 1
+
+        stale: set[tuple[Point, Point]] = set()
+        for cell in walled:
+            stale |= self._by_cell.get(cell, set())
+        if freed:
+            for key, path in self._entries.items():
+                if key in stale:
+                    continue
+                start, goal = key
+                if path is None:
+                    stale.add(key)
+                    continue
+                length = len(path) - 1
+                if any(heuristic(start, cell) + heuristic(cell, goal) < length for cell in freed):
+                    stale.add(key)
+        for key in stale:
+            self._drop(key)
+        self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_cell.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "version": self.version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    rng = random.Random(0)
+    size = 60
+    grid = [[int(rng.random() < 0.2) for _ in range(size)] for _ in range(size)]
+    free = [(r, c) for r in range(size) for c in range(size) if grid[r][c] == 0]
+    pairs = [(rng.choice(free), rng.choice(free)) for _ in range(50)]
+
+    cache = PathCache([row[:] for row in grid], maxsize=40)
+    t0 = time.perf_counter()
+    for tick in range(2000):
+        start, goal = rng.choice(pairs)
+        path = cache.get(start, goal)
+        if tick % 100 == 99:
+            # Toggle one cell, then check the cache against a fresh astar
+            r, c = rng.choice(free)
+            cache.update_cells([(r, c, 1 - cache.grid[r][c])])
+            for s, g in pairs[:10]:
+                fresh = astar(cache.grid, s, g)
+                cached = cache.get(s, g)
+                assert (fresh is None) == (cached is None)
+                assert fresh is None or len(fresh) == len(cached)
+    elapsed = time.perf_counter() - t0
+    print(f"2000 queries in {elapsed:.2f}s:", cache.stats())
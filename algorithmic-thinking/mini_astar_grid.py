@@ -46,6 +46,140 @@ def astar(grid: Grid, start: Point, goal: Point) -> list[Point] | None:
 
     return None  # no path
 
+# ---------------------------------------------------------------------
+# Jump Point Search: same grids, prunes symmetric paths on open maps
+# ---------------------------------------------------------------------
+SQRT2 = 2 ** 0.5
+
+# JPS helpers work on a copy of the grid padded with a wall border, in padded
+# coordinates (row + 1, col + 1), so every lookup is a plain walls[r][c].
+def _pad(grid: Grid) -> Grid:
+    border = [1] * (len(grid[0]) + 2)
+    return [border] + [[1, *row, 1] for row in grid] + [border]
+
+def _can_step(walls: Grid, r: int, c: int, dr: int, dc: int) -> bool:
+    # Diagonal moves may not cut corners: both orthogonal cells must be free
+    if walls[r + dr][c + dc]:
+        return False
+    return dr == 0 or dc == 0 or not (walls[r + dr][c] or walls[r][c + dc])
+
+def _jump_straight(walls: Grid, r: int, c: int, dr: int, dc: int, goal: Point,
+                   diagonal: bool) -> Point | None:
+    """Walk from (r, c) in a straight line until a jump point, a wall, or the goal."""
+    while True:
+        r, c = r + dr, c + dc
+        if walls[r][c]:
+            return None
+        if (r, c) == goal:
+            return (r, c)
+        # Forced neighbor: a side cell that opens up just past a wall behind us
+        if dc:
+            above, below = walls[r - 1], walls[r + 1]
+            if (not above[c] and above[c - dc]) or (not below[c] and below[c - dc]):
+                return (r, c)
+        else:
+            row, behind = walls[r], walls[r - dr]
+            if (not row[c - 1] and behind[c - 1]) or (not row[c + 1] and behind[c + 1]):
+                return (r, c)
+            if not diagonal:
+                # 4-connected: vertical runs stop wherever a horizontal run finds something
+                if (_jump_straight(walls, r, c, 0, 1, goal, diagonal)
+                        or _jump_straight(walls, r, c, 0, -1, goal, diagonal)):
+                    return (r, c)
+
+def _jump_diagonal(walls: Grid, r: int, c: int, dr: int, dc: int, goal: Point) -> Point | None:
+    """Walk diagonally until a straight jump from the current cell finds something."""
+    while _can_step(walls, r, c, dr, dc):
+        r, c = r + dr, c + dc
+        if (r, c) == goal:
+            return (r, c)
+        if (_jump_straight(walls, r, c, dr, 0, goal, True)
+                or _jump_straight(walls, r, c, 0, dc, goal, True)):
+            return (r, c)
+    return None
+
+def _pruned_directions(walls: Grid, p: Point, parent: Point | None,
+                       diagonal: bool) -> list[tuple[int, int]]:
+    r, c = p
+    if parent is None:
+        cand = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+        if diagonal:
+            cand += [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+    else:
+        dr = (r > parent[0]) - (r < parent[0])
+        dc = (c > parent[1]) - (c < parent[1])
+        if dr and dc:
+            cand = [(dr, 0), (0, dc), (dr, dc)]
+        elif dc:
+            cand = [(0, dc), (-1, 0), (1, 0)]
+            if diagonal:
+                cand += [(-1, dc), (1, dc)]
+        else:
+            cand = [(dr, 0), (0, -1), (0, 1)]
+            if diagonal:
+                cand += [(dr, -1), (dr, 1)]
+    return [d for d in cand if _can_step(walls, r, c, *d)]
+
+def _octile(a: Point, b: Point) -> float:
+    dr, dc = abs(a[0] - b[0]), abs(a[1] - b[1])
+    return max(dr, dc) + (SQRT2 - 1) * min(dr, dc)
+
+def jps(grid: Grid, start: Point, goal: Point, diagonal: bool = False) -> list[Point] | None:
+    """
+    Jump Point Search. With diagonal=False it finds a path as short as astar's;
+    with diagonal=True moves may go diagonally (cost sqrt(2), no corner cutting).
+    Returns the full cell-by-cell path, like astar.
+    """
+    walls = _pad(grid)
+    dist = _octile if diagonal else heuristic
+    s, t = (start[0] + 1, start[1] + 1), (goal[0] + 1, goal[1] + 1)
+    # Ties on f go to the deeper node (-g), which keeps open maps from
+    # expanding a whole band of equal-f jump points
+    frontier: list[tuple[float, float, Point]] = []
+    heappush(frontier, (dist(s, t), 0, s))
+    came_from: dict[Point, Point | None] = {s: None}
+    g_cost: dict[Point, float] = {s: 0}
+    closed: set[Point] = set()
+
+    while frontier:
+        _, _, current = heappop(frontier)
+        if current in closed:
+            continue
+        closed.add(current)
+        if current == t:
+            jump_points = []
+            while current is not None:
+                jump_points.append((current[0] - 1, current[1] - 1))
+                current = came_from[current]
+            jump_points.reverse()
+            return _expand_jumps(jump_points)
+
+        for dr, dc in _pruned_directions(walls, current, came_from[current], diagonal):
+            if dr and dc:
+                nxt = _jump_diagonal(walls, *current, dr, dc, t)
+            else:
+                nxt = _jump_straight(walls, *current, dr, dc, t, diagonal)
+            if nxt is None or nxt in closed:
+                continue
+            tentative = g_cost[current] + dist(current, nxt)
+            if nxt not in g_cost or tentative < g_cost[nxt]:
+                g_cost[nxt] = tentative
+                came_from[nxt] = current
+                heappush(frontier, (tentative + dist(nxt, t), -tentative, nxt))
+
+    return None  # no path
+
+def _expand_jumps(jump_points: list[Point]) -> list[Point]:
+    """Fill in the straight / diagonal runs between consecutive jump points."""
+    path = [jump_points[0]]
+    for (r, c), (r2, c2) in zip(jump_points, jump_points[1:]):
+        dr = (r2 > r) - (r2 < r)
+        dc = (c2 > c) - (c2 < c)
+        while (r, c) != (r2, c2):
+            r, c = r + dr, c + dc
+            path.append((r, c))
+    return path
+
 if __name__ == "__main__":
     # 0 = free, 1 = wall
     grid = [
@@ -63,4 +197,8 @@ if __name__ == "__main__":
     print("Length:", len(path) if path else None)
 
     # quick sanity check
-    assert path is not None and path[0] == start and path[-1] == goal
\ No newline at end of file
+    assert path is not None and path[0] == start and path[-1] == goal
+
+    jps_path = jps(grid, start, goal)
+    print("JPS path:", jps_path)
+    assert jps_path is not None and len(jps_path) == len(path)
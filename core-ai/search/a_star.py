@@ -1,27 +1,144 @@
 # Minimal A* scaffold (fill in for practice)
 from heapq import heappush, heappop
 
-def a_star(start, goal_test, neighbors, h):
-    frontier = []
-    heappush(frontier, (h(start), 0, start, None))
-    came_from = {}
+from csr_graph import CSRGraph, csr_search
+from frontier import HeapFrontier
+
+def a_star(start, goal_test, neighbors, h, frontier=None, stats=None):
+    # neighbors: function(state) → list of (neighbor, cost), or a csr_graph.CSRGraph
+    # frontier: empty priority queue from frontier.py (default: HeapFrontier)
+    # stats:    optional instrumentation.SearchStats, filled in for this run
+    if stats is not None:
+        return stats.run(a_star, start, goal_test, neighbors, h, frontier)
+    if frontier is None and isinstance(neighbors, CSRGraph):
+        return csr_search(neighbors, start, goal_test, h)
+    if frontier is None:
+        frontier = HeapFrontier()
+    frontier.push(start, h(start))
+    came_from = {start: None}
     g = {start: 0}
+    closed = set()
 
     while frontier:
-        f, g_cost, state, parent = heappop(frontier)
-        if state not in came_from:
-            came_from[state] = parent
-            if goal_test(state):
-                # Reconstruct path
-                path = []
-                s = state
-                while s is not None:
-                    path.append(s)
-                    s = came_from[s]
-                return list(reversed(path))
-            for nxt, step_cost in neighbors(state):
-                new_g = g_cost + step_cost
-                if nxt not in g or new_g < g[nxt]:
-                    g[nxt] = new_g
-                    heappush(frontier, (new_g + h(nxt), new_g, nxt, state))
-    return None
\ No newline at end of file
+        f, state = frontier.pop()
+        if state in closed:
+            continue  # stale duplicate from a lazy frontier
+        closed.add(state)
+        if goal_test(state):
+            # Reconstruct path
+            path = []
+            s = state
+            while s is not None:
+                path.append(s)
+                s = came_from[s]
+            return list(reversed(path))
+        g_cost = g[state]
+        for nxt, step_cost in neighbors(state):
+            if nxt in closed:
+                continue
+            new_g = g_cost + step_cost
+            if nxt not in g or new_g < g[nxt]:
+                g[nxt] = new_g
+                came_from[nxt] = state
+                frontier.push(nxt, new_g + h(nxt))
+    return None
+
+def bidirectional_a_star(start, goal, neighbors, reverse_neighbors, h_fwd, h_bwd):
+    """
+    A* run from both ends at once, meeting in the middle.
+
+    Parameters:
+        start             – the initial state
+        goal              – the goal state (a single state, not a test)
+        neighbors         – function(state) → list of (successor, cost)
+        reverse_neighbors – function(state) → list of (predecessor, cost)
+        h_fwd             – function(state) → estimated cost to goal
+        h_bwd             – function(state) → estimated cost from start
+
+    Both heuristics must be consistent. Every frontier key g + h is then a
+    lower bound on any path through that node, so the search stops as soon
+    as either frontier's smallest key reaches the best meeting cost found.
+
+    Returns:
+        (path, expansions) – path is the same optimal path cost as a_star
+        (or None), expansions is {"forward": n, "backward": m}.
+    """
+    if start == goal:
+        return [start], {"forward": 0, "backward": 0}
+
+    frontiers = ([(h_fwd(start), 0, start)], [(h_bwd(goal), 0, goal)])
+    g = ({start: 0}, {goal: 0})
+    came_from = ({start: None}, {goal: None})
+    closed = (set(), set())
+    expand = (neighbors, reverse_neighbors)
+    heuristic = (h_fwd, h_bwd)
+    expansions = [0, 0]
+    best, meet = float("inf"), None
+
+    while frontiers[0] and frontiers[1]:
+        if frontiers[0][0][0] >= best or frontiers[1][0][0] >= best:
+            break
+
+        # Expand the side with the smaller frontier (Pohl's cardinality rule)
+        d = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        other = 1 - d
+        _, g_cost, state = heappop(frontiers[d])
+        if state in closed[d]:
+            continue
+        closed[d].add(state)
+        expansions[d] += 1
+
+        for nxt, step_cost in expand[d](state):
+            new_g = g_cost + step_cost
+            if nxt in closed[d] or (nxt in g[d] and new_g >= g[d][nxt]):
+                continue
+            g[d][nxt] = new_g
+            came_from[d][nxt] = state
+            heappush(frontiers[d], (new_g + heuristic[d](nxt), new_g, nxt))
+            if nxt in g[other] and new_g + g[other][nxt] < best:
+                best, meet = new_g + g[other][nxt], nxt
+
+    counts = {"forward": expansions[0], "backward": expansions[1]}
+    if meet is None:
+        return None, counts
+
+    path = []
+    s = meet
+    while s is not None:
+        path.append(s)
+        s = came_from[0][s]
+    path.reverse()
+    s = came_from[1][meet]
+    while s is not None:
+        path.append(s)
+        s = came_from[1][s]
+    return path, counts
+
+
+# Example usage: 4-connected open grid, forward vs. bidirectional expansions
+if __name__ == "__main__":
+    N = 60
+    goal = (N - 1, N - 1)
+
+    def grid_neighbors(p):
+        r, c = p
+        return [((r + dr, c + dc), 1) for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                if 0 <= r + dr < N and 0 <= c + dc < N]
+
+    def manhattan(a, b):
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    expanded = [0]
+
+    def counting_neighbors(p):
+        expanded[0] += 1
+        return grid_neighbors(p)
+
+    path = a_star((0, 0), lambda s: s == goal, counting_neighbors, lambda s: manhattan(s, goal))
+    bi_path, counts = bidirectional_a_star(
+        (0, 0), goal, grid_neighbors, grid_neighbors,
+        lambda s: manhattan(s, goal), lambda s: manhattan(s, (0, 0)))
+
+    print("a_star:        cost", len(path) - 1, "expansions", expanded[0])
+    print("bidirectional: cost", len(bi_path) - 1, "expansions", counts)
+    assert len(path) == len(bi_path)
@@ -0,0 +1,209 @@
+"""
+Weighted A* and Anytime Repairing A* (ARA*) under a deadline
+------------------------------------------------------------
+Weighted A* orders the frontier by g + w·h (w >= 1). It usually reaches the
+goal after far fewer expansions, and the path is at most w times longer than
+optimal (for admissible h).
+
+ARA* runs weighted A* with a large w first, so some path exists quickly. It
+then lowers w step by step and reuses the previous search each time: only
+states whose g improved are expanded again. Each finished pass tightens the
+bound, and at w = 1 the path is optimal.
+
+Both take the a_star signature (start, goal_test, neighbors, h) plus a time
+and/or expansion budget. A budgeted call returns the best path found so far
+with its bound, and calling improve() again continues from where it stopped.
+
+    planner = ARAStar(start, goal_test, neighbors, h, epsilon=3.0)
+    result = planner.improve(time_budget=0.005)     # 5 ms
+    result.path, result.cost, result.bound          # cost <= bound * optimal
+    result = planner.improve(time_budget=0.005)     # keep improving
+
+Reference: Likhachev, Gordon & Thrun, "ARA*: Anytime A* with Provable
+Bounds on Sub-Optimality" (NIPS 2003).
+"""
+
+from collections import namedtuple
+from heapq import heappush, heappop
+from itertools import count
+import time
+
+INF = float("inf")
+
+AnytimeResult = namedtuple("AnytimeResult", "path cost bound optimal expansions")
+AnytimeResult.__doc__ = """path/cost of the best solution so far (None/inf if none);
+bound: cost <= bound * optimal cost; optimal: bound is 1 and the search is done"""
+
+
+class ARAStar:
+    def __init__(self, start, goal_test, neighbors, h, epsilon=3.0, decrement=0.5,
+                 final_epsilon=1.0):
+        """
+        Parameters:
+            start, goal_test, neighbors, h – as for a_star (h admissible)
+            epsilon        – initial heuristic weight (>= 1)
+            decrement      – how much epsilon drops after each finished pass
+            final_epsilon  – stop improving once a pass at this weight is done
+        """
+        if epsilon < final_epsilon or final_epsilon < 1:
+            raise ValueError("need epsilon >= final_epsilon >= 1")
+        self.goal_test = goal_test
+        self.neighbors = neighbors
+        self.h = h
+        self.epsilon = epsilon
+        self.decrement = decrement
+        self.final_epsilon = final_epsilon
+
+        self.g = {start: 0}
+        self.parent = {start: None}
+        self._h = {}                 # cached heuristic values
+        self._open = set()
+        self._closed = set()
+        self._incons = set()
+        self._heap = []
+        self._tie = count()
+        self.goal = start if goal_test(start) else None
+        self.expansions = 0
+        self.bound = INF             # proven bound from the last finished pass
+        self.done = False
+        self._push(start)
+
+    def _hval(self, s):
+        value = self._h.get(s)
+        if value is None:
+            value = self._h[s] = self.h(s)
+        return value
+
+    def _push(self, s):
+        self._open.add(s)
+        heappush(self._heap, (self.g[s] + self.epsilon * self._hval(s), next(self._tie), s))
+
+    def _goal_cost(self):
+        return INF if self.goal is None else self.g[self.goal]
+
+    def _improve_path(self, deadline, expansion_limit):
+        """One weighted-A* pass; returns False if the budget ran out first."""
+        heap = self._heap
+        while heap:
+            key, _, s = heap[0]
+            if s not in self._open or key != self.g[s] + self.epsilon * self._hval(s):
+                heappop(heap)   # stale entry
+                continue
+            if self._goal_cost() <= key:
+                return True
+            if expansion_limit is not None and self.expansions >= expansion_limit:
+                return False
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+            heappop(heap)
+            self._open.discard(s)
+            self._closed.add(s)
+            self.expansions += 1
+            g_s = self.g[s]
+            for nxt, step_cost in self.neighbors(s):
+                new_g = g_s + step_cost
+                if new_g < self.g.get(nxt, INF):
+                    self.g[nxt] = new_g
+                    self.parent[nxt] = s
+                    if new_g < self._goal_cost() and self.goal_test(nxt):
+                        self.goal = nxt
+                    if nxt in self._closed:
+                        self._incons.add(nxt)   # revisit in the next pass
+                    else:
+                        self._push(nxt)
+        return True
+
+    def _dynamic_bound(self):
+        """ARA*'s eps' = g(goal) / min over OPEN ∪ INCONS of (g + h)."""
+        lower = min((self.g[s] + self._hval(s) for s in self._open | self._incons), default=INF)
+        goal_cost = self._goal_cost()
+        if goal_cost == INF:
+            return INF
+        if lower >= goal_cost:
+            return 1.0
+        return goal_cost / lower if lower > 0 else INF
+
+    def improve(self, time_budget=None, max_expansions=None):
+        """Search until the budget runs out or the final pass completes."""
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        limit = None if max_expansions is None else self.expansions + max_expansions
+        while not self.done:
+            if not self._improve_path(deadline, limit):
+                break
+            self.bound = min(self.epsilon, self._dynamic_bound())
+            if self.epsilon <= self.final_epsilon or not self._open and not self._incons:
+                self.done = True
+                break
+            # Next pass: lower epsilon, move INCONS into OPEN, forget CLOSED, re-key
+            self.epsilon = max(self.final_epsilon, self.epsilon - self.decrement)
+            self._open |= self._incons
+            self._incons.clear()
+            self._closed.clear()
+            self._heap = []
+            for s in self._open:
+                heappush(self._heap,
+                         (self.g[s] + self.epsilon * self._hval(s), next(self._tie), s))
+        return self.result()
+
+    def result(self):
+        if self.goal is None:
+            return AnytimeResult(None, INF, INF, False, self.expansions)
+        path = []
+        s = self.goal
+        while s is not None:
+            path.append(s)
+            s = self.parent[s]
+        path.reverse()
+        optimal = self.done and self.bound <= 1.0
+        return AnytimeResult(path, self.g[self.goal], self.bound, optimal, self.expansions)
+
+
+def weighted_a_star(start, goal_test, neighbors, h, weight=2.0, time_budget=None,
+                    max_expansions=None):
+    """A single weighted-A* pass (cost <= weight * optimal) under an optional budget."""
+    planner = ARAStar(start, goal_test, neighbors, h, epsilon=weight, final_epsilon=weight)
+    return planner.improve(time_budget, max_expansions)
+
+
+# Example usage: weighted grid, 5 ms slices until the answer is proven optimal
+if __name__ == "__main__":
+    import random
+
+    from a_star import a_star
+
+    rng = random.Random(0)
+    N = 120
+    cost = {(r, c): rng.choice((1, 1, 1, 3, 9)) for r in range(N) for c in range(N)}
+    goal = (N - 1, N - 1)
+
+    def neighbors(p):
+        r, c = p
+        return [((r + dr, c + dc), cost[(r + dr, c + dc)])
+                for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1)) if (r + dr, c + dc) in cost]
+
+    def h(p):
+        return abs(p[0] - goal[0]) + abs(p[1] - goal[1])
+
+    def path_cost(path):
+        return sum(cost[p] for p in path[1:])
+
+    t0 = time.perf_counter()
+    optimal = path_cost(a_star((0, 0), lambda s: s == goal, neighbors, h))
+    print(f"a_star: cost {optimal} in {(time.perf_counter() - t0) * 1e3:.1f} ms")
+
+    for w in (1.5, 3.0):
+        r = weighted_a_star((0, 0), lambda s: s == goal, neighbors, h, weight=w)
+        print(f"weighted A* w={w}: cost {r.cost}, bound {r.bound:.2f}, expansions {r.expansions}")
+        assert r.cost <= r.bound * optimal
+
+    planner = ARAStar((0, 0), lambda s: s == goal, neighbors, h, epsilon=3.0)
+    slices = 0
+    while True:
+        r = planner.improve(time_budget=0.005)
+        slices += 1
+        print(f"ARA* slice {slices}: cost {r.cost}, bound {r.bound:.2f}, "
+              f"epsilon {planner.epsilon}, optimal {r.optimal}")
+        assert r.path is None or r.cost <= r.bound * optimal
+        if r.optimal:
+            break
+    assert r.cost == optimal
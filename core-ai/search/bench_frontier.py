@@ -0,0 +1,68 @@
+"""
+Frontier benchmark
+------------------
+Runs uniform_cost_search and a_star with each frontier from frontier.py and
+reports peak frontier size and wall time.
+
+    python bench_frontier.py [nodes] [out_degree]
+
+The dense random graph is where lazy deletion hurts: every cheaper path found
+to a queued node adds another heap entry, so HeapFrontier can grow to many
+times the node count while the indexed and bucket queues stay at most one
+entry per node.
+"""
+
+import random
+import sys
+import time
+
+from a_star import a_star
+from frontier import BucketFrontier, HeapFrontier, IndexedHeapFrontier
+from uniform_cost import uniform_cost_search
+
+FRONTIERS = [HeapFrontier, IndexedHeapFrontier, BucketFrontier]
+
+
+def random_graph(n, degree, max_cost=20, seed=0):
+    rng = random.Random(seed)
+    return {u: [(rng.randrange(n), rng.randint(1, max_cost)) for _ in range(degree)]
+            for u in range(n)}
+
+
+def grid_graph(size, seed=0):
+    rng = random.Random(seed)
+    cost = {(r, c): rng.randint(1, 9) for r in range(size) for c in range(size)}
+
+    def neighbors(p):
+        r, c = p
+        return [((r + dr, c + dc), cost[(r + dr, c + dc)])
+                for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                if (r + dr, c + dc) in cost]
+    return neighbors
+
+
+def run(label, search):
+    print(f"\n{label}")
+    print(f"{'frontier':22s} {'peak size':>10s} {'time (s)':>10s}")
+    for cls in FRONTIERS:
+        frontier = cls()
+        t0 = time.perf_counter()
+        path = search(frontier)
+        elapsed = time.perf_counter() - t0
+        print(f"{cls.__name__:22s} {frontier.max_size:10d} {elapsed:10.3f}"
+              f"   (path length {len(path) if path else None})")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    degree = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    graph = random_graph(n, degree)
+    run(f"UCS, random graph: {n} nodes, out-degree {degree}",
+        lambda fr: uniform_cost_search(0, lambda s: s == -1, graph.__getitem__, frontier=fr))
+
+    size = 200
+    goal = (size - 1, size - 1)
+    neighbors = grid_graph(size)
+    run(f"A*, {size}x{size} weighted grid, Manhattan heuristic",
+        lambda fr: a_star((0, 0), lambda s: s == goal, neighbors,
+                          lambda s: abs(s[0] - goal[0]) + abs(s[1] - goal[1]), frontier=fr))
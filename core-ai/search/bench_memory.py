@@ -0,0 +1,115 @@
+"""
+Memory benchmark: a_star vs. ida_star vs. sma_star
+--------------------------------------------------
+Solves scrambled sliding-tile puzzles (15-puzzle by default) with Manhattan
+distance and reports solution length, wall time and peak RSS for each search.
+Each run happens in a fresh process, because ru_maxrss is a per-process
+high-water mark and would otherwise carry over between runs.
+
+    python bench_memory.py [side] [scramble_moves] [sma_max_nodes]
+
+On the harder instances a_star's RSS grows with every state it has seen,
+ida_star stays flat, and sma_star levels off at max_nodes tree nodes, about
+2.5 KB each here (a node keeps its successor list and heap entries). On an
+instance a_star solves with fewer states than that (seed 2 at the default
+max_nodes), a_star's peak is lower: sma_star's bound only pays off once
+a_star would store more than max_nodes * b states.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import random
+import resource
+import sys
+import time
+
+from a_star import a_star
+from memory_bounded import MemoryLimitExceeded, ida_star, sma_star
+
+
+def puzzle(side):
+    goal = tuple(range(1, side * side)) + (0,)
+    where = {tile: divmod(i, side) for i, tile in enumerate(goal)}
+
+    def neighbors(state):
+        blank = state.index(0)
+        r, c = divmod(blank, side)
+        result = []
+        for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < side and 0 <= nc < side:
+                s = list(state)
+                j = nr * side + nc
+                s[blank], s[j] = s[j], s[blank]
+                result.append((tuple(s), 1))
+        return result
+
+    def h(state):
+        total = 0
+        for i, tile in enumerate(state):
+            if tile:
+                r, c = divmod(i, side)
+                gr, gc = where[tile]
+                total += abs(r - gr) + abs(c - gc)
+        return total
+
+    return goal, neighbors, h
+
+
+def scramble(goal, neighbors, moves, seed):
+    rng = random.Random(seed)
+    state, previous = goal, None
+    for _ in range(moves):
+        options = [s for s, _ in neighbors(state) if s != previous]
+        previous, state = state, rng.choice(options)
+    return state
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def solve(name, side, start, max_nodes):
+    """Runs in a worker process; returns (solution moves or None, seconds, peak RSS MB)."""
+    goal, neighbors, h = puzzle(side)
+    goal_test = lambda s: s == goal
+    baseline = peak_rss_mb()
+    t0 = time.perf_counter()
+    try:
+        if name == "a_star":
+            path = a_star(start, goal_test, neighbors, h)
+        elif name == "ida_star":
+            path = ida_star(start, goal_test, neighbors, h)
+        else:
+            path = sma_star(start, goal_test, neighbors, h, max_nodes=max_nodes)
+    except MemoryLimitExceeded:
+        path = None
+    elapsed = time.perf_counter() - t0
+    moves = None if path is None else len(path) - 1
+    return moves, elapsed, peak_rss_mb(), baseline
+
+
+if __name__ == "__main__":
+    side = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    moves = int(sys.argv[2]) if len(sys.argv) > 2 else 70
+    max_nodes = int(sys.argv[3]) if len(sys.argv) > 3 else 20_000
+
+    goal, neighbors, h = puzzle(side)
+    spawn = multiprocessing.get_context("spawn")
+    print(f"{side * side - 1}-puzzle, {moves} random moves, sma_star max_nodes={max_nodes}")
+    print(f"{'seed':>4s} {'h(start)':>8s}  {'search':9s} {'moves':>5s} {'time (s)':>9s} "
+          f"{'peak RSS (MB)':>14s} {'over baseline':>14s}")
+    for seed in range(3):
+        start = scramble(goal, neighbors, moves, seed)
+        lengths = set()
+        for name in ("a_star", "ida_star", "sma_star"):
+            with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+                length, elapsed, rss, baseline = pool.submit(
+                    solve, name, side, start, max_nodes).result()
+            if length is not None:
+                lengths.add(length)
+            print(f"{seed:4d} {h(start):8d}  {name:9s} {str(length):>5s} {elapsed:9.2f} "
+                  f"{rss:14.1f} {rss - baseline:14.1f}")
+        assert len(lengths) == 1, "optimal solution lengths differ"
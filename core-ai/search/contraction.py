@@ -0,0 +1,309 @@
+"""
+Contraction hierarchies for repeated point-to-point queries
+-----------------------------------------------------------
+Offline, nodes are contracted one at a time in order of "importance". A
+removed node v gets a shortcut u → w (weight c(u,v) + c(v,w)) whenever
+u → v → w is the only shortest way between u and w; a small bounded Dijkstra
+(the witness search) checks that. Every edge then points "up" or "down" in
+contraction order. A query is a bidirectional Dijkstra that only climbs
+upward from both ends, so it settles a few hundred nodes at most, even on
+graphs where uniform_cost_search would settle all of them.
+
+Costs match uniform_cost_search exactly; shortcuts are unpacked back into
+the original edges. The preprocessed graph is a set of CSR arrays saved as
+.npy files, so ContractionHierarchy.load(..., mmap=True) maps them instead
+of reading them.
+
+    ch = build_ch(graph)                  # graph: {node: [(neighbor, cost), ...]}
+    ch.save("ch_dir")
+    ch = ContractionHierarchy.load("ch_dir", mmap=True)
+    cost, path = ch.query("A", "D")
+"""
+
+from heapq import heappush, heappop
+from pathlib import Path
+
+import numpy as np
+
+ARRAYS = ("rank",
+          "up_offsets", "up_targets", "up_weights", "up_middle",
+          "down_offsets", "down_targets", "down_weights", "down_middle")
+
+
+class ContractionHierarchy:
+    def __init__(self, nodes, arrays):
+        """
+        nodes  – node ids; node i in the arrays is nodes[i]
+        arrays – dict with the CSR arrays in ARRAYS:
+                   up[v]   holds edges v → w with rank[w] > rank[v]
+                   down[v] holds edges u → v with rank[u] > rank[v], stored as u
+                 middle is the contracted node a shortcut skips (-1 = original edge)
+        """
+        self.nodes = list(nodes)
+        self.index = {v: i for i, v in enumerate(self.nodes)}
+        for name in ARRAYS:
+            setattr(self, name, arrays[name])
+        self._sides = ((self.up_offsets, self.up_targets, self.up_weights, self.up_middle),
+                       (self.down_offsets, self.down_targets, self.down_weights, self.down_middle))
+        self._decoded = ({}, {})
+
+    # --- persistence -------------------------------------------------------
+    def save(self, directory):
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in ARRAYS:
+            np.save(directory / f"{name}.npy", getattr(self, name))
+        # The trailing None keeps tuple ids from being unpacked into a 2-D array
+        np.save(directory / "nodes.npy", np.array(self.nodes + [None], dtype=object)[:-1])
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """Load a saved hierarchy; with mmap=True the arrays are memory-mapped, not read.
+        Node ids are a pickled object array (any hashable ids round-trip):
+        only load trusted directories."""
+        directory = Path(directory)
+        mode = "r" if mmap else None
+        arrays = {name: np.load(directory / f"{name}.npy", mmap_mode=mode) for name in ARRAYS}
+        nodes = np.load(directory / "nodes.npy", allow_pickle=True).tolist()
+        return cls(nodes, arrays)
+
+    # --- queries -----------------------------------------------------------
+    def _edges(self, side, v):
+        """Edges of v in side 0 (up) or 1 (down) as (node, weight, middle) tuples.
+        Decoded lazily and kept, so a memory-mapped hierarchy only touches (and
+        converts) the parts of the arrays that queries actually visit."""
+        cache = self._decoded[side]
+        edges = cache.get(v)
+        if edges is None:
+            offsets, targets, weights, middle = self._sides[side]
+            a, b = int(offsets[v]), int(offsets[v + 1])
+            edges = cache[v] = list(zip(targets[a:b].tolist(), weights[a:b].tolist(),
+                                        middle[a:b].tolist()))
+        return edges
+
+    def query(self, source, target):
+        """Return (cost, path) for the shortest source → target path, or None."""
+        s, t = self.index[source], self.index[target]
+        if s == t:
+            return 0, [source]
+        dist = ({s: 0}, {t: 0})
+        parent = ({s: None}, {t: None})          # node -> (previous node, middle)
+        queues = ([(0, s)], [(0, t)])
+        settled = (set(), set())
+        best, meet = float("inf"), None
+
+        while queues[0] or queues[1]:
+            for d in (0, 1):
+                queue = queues[d]
+                if not queue:
+                    continue
+                if queue[0][0] >= best:
+                    queue.clear()   # nothing cheaper can come from this side
+                    continue
+                cost, v = heappop(queue)
+                if v in settled[d]:
+                    continue
+                settled[d].add(v)
+                if v in dist[1 - d] and cost + dist[1 - d][v] < best:
+                    best, meet = cost + dist[1 - d][v], v
+                # Stall-on-demand: if a higher node already reaches v more
+                # cheaply, v is not on a shortest up-path; don't relax it
+                if any(dist[d].get(u, float("inf")) + weight < cost
+                       for u, weight, _ in self._edges(1 - d, v)):
+                    continue
+                for w, weight, mid in self._edges(d, v):
+                    new_cost = cost + weight
+                    if new_cost < dist[d].get(w, float("inf")):
+                        dist[d][w] = new_cost
+                        parent[d][w] = (v, mid)
+                        heappush(queue, (new_cost, w))
+
+        if meet is None:
+            return None
+        hops = []                                    # (from, to, middle) in path order
+        v = meet
+        while parent[0][v] is not None:
+            u, mid = parent[0][v]
+            hops.append((u, v, mid))
+            v = u
+        hops.reverse()
+        v = meet
+        while parent[1][v] is not None:
+            w, mid = parent[1][v]
+            hops.append((v, w, mid))
+            v = w
+
+        path = [s]
+        for u, w, mid in hops:
+            self._unpack(u, w, mid, path)
+        cost = best if best != int(best) else int(best)
+        return cost, [self.nodes[i] for i in path]
+
+    def _unpack(self, u, w, mid, path):
+        """Append the original-edge nodes of u → w (excluding u) to path."""
+        stack = [(u, w, mid)]
+        while stack:
+            u, w, mid = stack.pop()
+            if mid < 0:
+                path.append(w)
+                continue
+            # mid was contracted before u and w: u → mid lives in down[mid], mid → w in up[mid]
+            first = next(m for x, _, m in self._edges(1, mid) if x == u)
+            second = next(m for x, _, m in self._edges(0, mid) if x == w)
+            stack.append((mid, w, second))
+            stack.append((u, mid, first))
+
+
+def _witness_costs(out, source, skip, targets, limit, max_settled):
+    """
+    Bounded Dijkstra from source that ignores `skip`. Stops once every target
+    is settled, the next cost exceeds `limit`, or max_settled nodes are settled.
+    """
+    dist = {source: 0}
+    queue = [(0, source)]
+    remaining = len(targets)
+    settled = 0
+    while queue and settled < max_settled:
+        cost, v = heappop(queue)
+        if cost > dist[v]:
+            continue
+        if cost > limit:
+            break
+        settled += 1
+        if v in targets:
+            remaining -= 1
+            if not remaining:
+                break
+        for w, (weight, _) in out[v].items():
+            if w == skip:
+                continue
+            new_cost = cost + weight
+            if new_cost < dist.get(w, float("inf")):
+                dist[w] = new_cost
+                heappush(queue, (new_cost, w))
+    return dist
+
+
+def build_ch(graph, max_settled=200):
+    """
+    Contract every node of graph ({node: [(neighbor, cost), ...]}, costs >= 0).
+
+    max_settled caps each witness search; hitting the cap only adds extra
+    (harmless) shortcuts, never wrong answers.
+
+    Returns:
+        ContractionHierarchy
+    """
+    nodes = list(dict.fromkeys([*graph, *(w for edges in graph.values() for w, _ in edges)]))
+    index = {v: i for i, v in enumerate(nodes)}
+    n = len(nodes)
+    out = [dict() for _ in range(n)]   # u -> {w: (weight, middle)}
+    inn = [dict() for _ in range(n)]   # w -> {u: (weight, middle)}
+    for u, edges in graph.items():
+        for w, weight in edges:
+            a, b = index[u], index[w]
+            if a != b and weight < out[a].get(b, (float("inf"),))[0]:
+                out[a][b] = inn[b][a] = (weight, -1)
+
+    def shortcuts_for(v):
+        needed = []
+        for u, (w_uv, _) in inn[v].items():
+            targets = {w: w_uv + w_vw for w, (w_vw, _) in out[v].items() if w != u}
+            if not targets:
+                continue
+            witness = _witness_costs(out, u, v, targets, max(targets.values()), max_settled)
+            for w, via in targets.items():
+                if witness.get(w, float("inf")) > via:
+                    needed.append((u, w, via))
+        return needed
+
+    deleted_neighbors = [0] * n
+
+    def priority(v):
+        """Edge difference plus contracted-neighbor count (spreads contraction evenly)."""
+        needed = shortcuts_for(v)
+        return len(needed) - len(inn[v]) - len(out[v]) + deleted_neighbors[v], needed
+
+    queue = [(priority(v)[0], v) for v in range(n)]
+    queue.sort()
+    rank = np.empty(n, dtype=np.int32)
+    up = [[] for _ in range(n)]     # (w, weight, middle)
+    down = [[] for _ in range(n)]   # (u, weight, middle)
+    order = 0
+    while queue:
+        _, v = heappop(queue)
+        # Lazy update: re-evaluate, and defer v if it is no longer the cheapest
+        current, needed = priority(v)
+        if queue and current > queue[0][0]:
+            heappush(queue, (current, v))
+            continue
+        for u, w, via in needed:
+            if via < out[u].get(w, (float("inf"),))[0]:
+                out[u][w] = inn[w][u] = (via, v)
+        rank[v] = order
+        order += 1
+        for w, (weight, mid) in out[v].items():
+            up[v].append((w, weight, mid))
+            del inn[w][v]
+        for u, (weight, mid) in inn[v].items():
+            down[v].append((u, weight, mid))
+            del out[u][v]
+        for x in out[v].keys() | inn[v].keys():
+            deleted_neighbors[x] += 1
+        out[v].clear()
+        inn[v].clear()
+
+    arrays = {"rank": rank}
+    for name, adjacency in (("up", up), ("down", down)):
+        arrays[f"{name}_offsets"] = np.cumsum([0] + [len(a) for a in adjacency], dtype=np.int64)
+        flat = [e for a in adjacency for e in a]
+        arrays[f"{name}_targets"] = np.array([e[0] for e in flat], dtype=np.int32)
+        arrays[f"{name}_weights"] = np.array([e[1] for e in flat], dtype=np.float64)
+        arrays[f"{name}_middle"] = np.array([e[2] for e in flat], dtype=np.int32)
+    return ContractionHierarchy(nodes, arrays)
+
+
+# Example usage: random road-like graph, CH vs. uniform_cost_search
+if __name__ == "__main__":
+    import random
+    import tempfile
+    import time
+
+    from uniform_cost import uniform_cost_search
+
+    rng = random.Random(0)
+    size = 80
+    graph = {(r, c): [] for r in range(size) for c in range(size)}
+    for (r, c) in graph:
+        for dr, dc in ((1, 0), (0, 1), (-1, 0), (0, -1)):
+            if (r + dr, c + dc) in graph and rng.random() < 0.9:
+                graph[(r, c)].append(((r + dr, c + dc), rng.randint(1, 10)))
+
+    t0 = time.perf_counter()
+    ch = build_ch(graph)
+    print(f"build: {time.perf_counter() - t0:.2f}s, {len(graph)} nodes, "
+          f"{len(ch.up_targets) + len(ch.down_targets)} CH edges")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ch.save(tmp)
+        loaded = ContractionHierarchy.load(tmp, mmap=True)
+        assert loaded.nodes == ch.nodes and isinstance(loaded.nodes[0], tuple)
+        ch = loaded
+
+        def cost(path):
+            return sum(dict(graph[a])[b] for a, b in zip(path, path[1:]))
+
+        pairs = [tuple(rng.sample(list(graph), 2)) for _ in range(50)]
+        t_ucs = t_ch = 0.0
+        for s, t in pairs:
+            t0 = time.perf_counter()
+            ref = uniform_cost_search(s, lambda x, t=t: x == t, graph.__getitem__)
+            t_ucs += time.perf_counter() - t0
+            t0 = time.perf_counter()
+            answer = ch.query(s, t)
+            t_ch += time.perf_counter() - t0
+            assert (ref is None) == (answer is None)
+            if ref is not None:
+                assert answer[0] == cost(ref) == cost(answer[1]) and answer[1][0] == s
+        print(f"{len(pairs)} queries: UCS {t_ucs / len(pairs) * 1e3:.2f} ms/query, "
+              f"CH (memory-mapped) {t_ch / len(pairs) * 1e3:.2f} ms/query")
@@ -0,0 +1,167 @@
+"""
+Compressed sparse row (CSR) graph
+---------------------------------
+A static weighted digraph in three flat arrays:
+
+    offsets[i] .. offsets[i+1]   slice of targets/weights holding node i's edges
+    targets                      neighbor index of each edge
+    weights                      cost of each edge
+
+Node ids can be anything hashable; internally they are indices 0..n-1.
+
+A CSRGraph is callable like any neighbors function (graph(state) → list of
+(neighbor, cost)), so it works everywhere. When it is passed straight to
+uniform_cost_search or a_star as `neighbors` (no custom frontier, no stats),
+they hand off to csr_search(). That loop walks the flat arrays by index and
+keeps cost and parent in preallocated lists, so it builds no (neighbor, cost)
+tuples and no per-call lists.
+
+    graph = CSRGraph.from_dict({"A": [("B", 1), ("C", 4)], "B": [("C", 2)], "C": []})
+    uniform_cost_search("A", lambda n: n == "C", graph)
+"""
+
+from heapq import heappush, heappop
+
+import numpy as np
+
+
+class CSRGraph:
+    def __init__(self, offsets, targets, weights, nodes=None):
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.targets = np.asarray(targets, dtype=np.int32)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        n = len(self.offsets) - 1
+        self.nodes = list(range(n)) if nodes is None else list(nodes)
+        if len(self.nodes) != n:
+            raise ValueError(f"{len(self.nodes)} node ids for {n} CSR rows")
+        self.index = {v: i for i, v in enumerate(self.nodes)}
+        self._lists = None
+
+    @classmethod
+    def from_edges(cls, edges, nodes=None):
+        """edges: iterable of (u, v, cost). nodes: optional id order (adds isolated nodes)."""
+        edges = list(edges)
+        order = list(nodes) if nodes is not None else []
+        seen = set(order)
+        for u, v, _ in edges:
+            for x in (u, v):
+                if x not in seen:
+                    seen.add(x)
+                    order.append(x)
+        index = {v: i for i, v in enumerate(order)}
+        src = np.array([index[u] for u, _, _ in edges], dtype=np.int64)
+        dst = np.array([index[v] for _, v, _ in edges], dtype=np.int32)
+        cost = np.array([c for _, _, c in edges], dtype=np.float64)
+        by_src = np.argsort(src, kind="stable")
+        offsets = np.zeros(len(order) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=len(order)), out=offsets[1:])
+        return cls(offsets, dst[by_src], cost[by_src], order)
+
+    @classmethod
+    def from_dict(cls, graph):
+        """graph: {node: [(neighbor, cost), ...]}, the format of the uniform_cost.py demo."""
+        return cls.from_edges(((u, v, c) for u, edges in graph.items() for v, c in edges),
+                              nodes=graph.keys())
+
+    def __len__(self):
+        return len(self.nodes)
+
+    @property
+    def num_edges(self):
+        return len(self.targets)
+
+    def __call__(self, state):
+        i = self.index[state]
+        a, b = self.offsets[i], self.offsets[i + 1]
+        return [(self.nodes[j], w) for j, w in zip(self.targets[a:b].tolist(),
+                                                  self.weights[a:b].tolist())]
+
+    def as_lists(self):
+        """offsets / targets / weights as Python lists (built once): list indexing
+        returns ready-made ints/floats, where NumPy indexing would box a scalar."""
+        if self._lists is None:
+            weights = self.weights
+            if np.all(weights == np.round(weights)):
+                weights = weights.astype(np.int64)   # keep integer costs as ints
+            self._lists = (self.offsets.tolist(), self.targets.tolist(), weights.tolist())
+        return self._lists
+
+
+def csr_search(graph, start, goal_test, h=None):
+    """
+    A* over a CSRGraph (UCS when h is None); same results as a_star /
+    uniform_cost_search with the graph's callable interface.
+    """
+    offsets, targets, weights = graph.as_lists()
+    nodes = graph.nodes
+    n = len(nodes)
+    s = graph.index[start]
+    inf = float("inf")
+    g = [inf] * n
+    parent = [-1] * n
+    closed = bytearray(n)
+    g[s] = 0
+    frontier = [(h(start) if h else 0, s)]
+
+    while frontier:
+        _, u = heappop(frontier)
+        if closed[u]:
+            continue
+        closed[u] = 1
+        if goal_test(nodes[u]):
+            path = []
+            while u != -1:
+                path.append(nodes[u])
+                u = parent[u]
+            return list(reversed(path))
+        g_u = g[u]
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            if closed[v]:
+                continue
+            new_g = g_u + weights[e]
+            if new_g < g[v]:
+                g[v] = new_g
+                parent[v] = u
+                heappush(frontier, (new_g + h(nodes[v]) if h else new_g, v))
+    return None
+
+
+# Example usage: dict-of-lists neighbors vs. CSR fast path
+if __name__ == "__main__":
+    import random
+    import time
+
+    from a_star import a_star
+    from uniform_cost import uniform_cost_search
+    # Use the class the searches check against, not this script's __main__ copy
+    from csr_graph import CSRGraph
+
+    demo = {"A": [("B", 1), ("C", 4)], "B": [("C", 2), ("D", 5)], "C": [("D", 1)], "D": []}
+    csr = CSRGraph.from_dict(demo)
+    assert uniform_cost_search("A", lambda n: n == "D", csr) == ["A", "B", "C", "D"]
+
+    rng = random.Random(0)
+    n, degree = 200_000, 8
+    graph = {u: [(rng.randrange(n), rng.randint(1, 20)) for _ in range(degree)] for u in range(n)}
+    t0 = time.perf_counter()
+    csr = CSRGraph.from_dict(graph)
+    csr.as_lists()
+    print(f"CSR build: {time.perf_counter() - t0:.2f}s for {n} nodes, {csr.num_edges} edges")
+
+    never = lambda s: False  # settle everything reachable
+    t0 = time.perf_counter()
+    uniform_cost_search(0, never, graph.__getitem__)
+    t_dict = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    uniform_cost_search(0, never, csr)
+    t_csr = time.perf_counter() - t0
+    print(f"full UCS: dict-of-lists {t_dict:.2f}s, CSR {t_csr:.2f}s ({t_dict / t_csr:.1f}x)")
+
+    goal = n - 1
+    h = lambda s: 0
+    assert a_star(0, lambda s: s == goal, graph.__getitem__, h) is not None
+    ref = uniform_cost_search(0, lambda s: s == goal, graph.__getitem__)
+    fast = uniform_cost_search(0, lambda s: s == goal, csr)
+    cost = lambda p: sum(min(c for v, c in graph[a] if v == b) for a, b in zip(p, p[1:]))
+    assert cost(ref) == cost(fast) == cost(a_star(0, lambda s: s == goal, csr, h))
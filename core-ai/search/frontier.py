@@ -0,0 +1,158 @@
+"""
+Frontier (priority queue) implementations for the search scaffolds
+------------------------------------------------------------------
+All frontiers share one small interface:
+
+    push(item, priority)  – insert item, or lower its priority if already queued
+    pop()                 – remove and return (priority, item) with the lowest priority
+    len(frontier)         – number of entries currently stored
+    max_size              – largest len() seen so far (for benchmarks)
+
+HeapFrontier        – heapq with lazy deletion: a better priority adds a duplicate
+                      entry, and the search skips the stale one when it pops.
+IndexedHeapFrontier – binary heap plus a position index, so push() performs a real
+                      decrease-key and every item appears at most once.
+BucketFrontier      – bucket (Dial / radix-style) queue for small non-negative
+                      integer priorities that never drop below the last pop
+                      (UCS with integer costs, A* with a consistent integer h).
+"""
+
+from heapq import heappush, heappop
+from itertools import count
+
+
+class HeapFrontier:
+    """heapq-backed frontier; duplicates stand in for decrease-key."""
+
+    def __init__(self):
+        self._heap = []
+        self._tie = count()  # FIFO tie-break, so items never need to be comparable
+        self.max_size = 0
+
+    def push(self, item, priority):
+        heappush(self._heap, (priority, next(self._tie), item))
+        if len(self._heap) > self.max_size:
+            self.max_size = len(self._heap)
+
+    def pop(self):
+        priority, _, item = heappop(self._heap)
+        return priority, item
+
+    def __len__(self):
+        return len(self._heap)
+
+
+class IndexedHeapFrontier:
+    """Binary min-heap with an item → slot index for O(log n) decrease-key."""
+
+    def __init__(self):
+        self._heap = []   # (priority, tie, item); tie is unique, so item is never compared
+        self._pos = {}    # item -> index into _heap
+        self._tie = count()
+        self.max_size = 0
+
+    def push(self, item, priority):
+        i = self._pos.get(item)
+        if i is None:
+            self._heap.append(None)
+            i = len(self._heap) - 1
+            if len(self._heap) > self.max_size:
+                self.max_size = len(self._heap)
+        elif priority >= self._heap[i][0]:
+            return  # not an improvement; keep the existing entry
+        self._sift_up(i, (priority, next(self._tie), item))
+
+    def pop(self):
+        heap = self._heap
+        top = heap[0]
+        last = heap.pop()
+        del self._pos[top[2]]
+        if heap:
+            self._sift_down(0, last)
+        return top[0], top[2]
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __contains__(self, item):
+        return item in self._pos
+
+    def _sift_up(self, i, entry):
+        heap, pos = self._heap, self._pos
+        while i > 0:
+            parent = (i - 1) >> 1
+            if heap[parent] <= entry:
+                break
+            heap[i] = heap[parent]
+            pos[heap[i][2]] = i
+            i = parent
+        heap[i] = entry
+        pos[entry[2]] = i
+
+    def _sift_down(self, i, entry):
+        heap, pos = self._heap, self._pos
+        n = len(heap)
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            right = child + 1
+            if right < n and heap[right] < heap[child]:
+                child = right
+            if entry <= heap[child]:
+                break
+            heap[i] = heap[child]
+            pos[heap[i][2]] = i
+            i = child
+        heap[i] = entry
+        pos[entry[2]] = i
+
+
+class BucketFrontier:
+    """
+    Bucket queue for integer priorities in [last popped, last popped + C].
+
+    Each bucket is an insertion-ordered dict, so decrease-key is an O(1)
+    move between buckets and pop() is FIFO within a priority level.
+    """
+
+    def __init__(self):
+        self._buckets = {}   # priority -> {item: None}
+        self._prio = {}      # item -> current priority
+        self._cursor = 0     # no queued priority is below this
+        self._size = 0
+        self.max_size = 0
+
+    def push(self, item, priority):
+        if priority != int(priority) or priority < self._cursor:
+            raise ValueError(
+                f"BucketFrontier needs monotone integer priorities, got {priority!r} "
+                f"after popping {self._cursor}")
+        priority = int(priority)
+        old = self._prio.get(item)
+        if old is not None:
+            if priority >= old:
+                return
+            del self._buckets[old][item]
+        else:
+            self._size += 1
+            if self._size > self.max_size:
+                self.max_size = self._size
+        self._prio[item] = priority
+        self._buckets.setdefault(priority, {})[item] = None
+
+    def pop(self):
+        if not self._size:
+            raise IndexError("pop from empty frontier")
+        while not self._buckets.get(self._cursor):
+            self._buckets.pop(self._cursor, None)
+            self._cursor += 1
+        bucket = self._buckets[self._cursor]
+        item = next(iter(bucket))
+        del bucket[item]
+        del self._prio[item]
+        self._size -= 1
+        return self._cursor, item
+
+    def __len__(self):
+        return self._size
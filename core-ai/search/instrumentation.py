@@ -0,0 +1,127 @@
+"""
+Search instrumentation
+----------------------
+Pass a SearchStats object to a_star / uniform_cost_search to find out why a
+query was slow:
+
+    stats = SearchStats(on_expand=[lambda state: log.append(state)])
+    path = a_star(start, goal_test, neighbors, h, stats=stats)
+    stats.to_json()          # {"nodes_expanded": ..., "peak_frontier": ..., ...}
+
+Nothing here runs inside the search loop itself. SearchStats wraps the
+callables the search already calls (neighbors, h, the frontier) and reruns
+the unmodified search with the wrappers. With stats=None the searches take
+their normal path and pay for a single `is None` check per call.
+
+Recorded per run:
+    nodes_expanded   states whose successors were generated
+    nodes_generated  successors returned by neighbors()
+    peak_frontier    largest frontier size (stale entries included)
+    stale_pops       pops of states that were already closed
+    heuristic_calls  calls to h (A* only)
+    heuristic_time   seconds spent inside h
+    wall_time        seconds for the whole search
+    found            whether a path was returned
+"""
+
+import json
+import time
+
+from frontier import HeapFrontier
+
+
+class _CountingFrontier:
+    """Forwards to the real frontier and counts pops."""
+
+    def __init__(self, inner, stats):
+        self.inner = inner
+        self.stats = stats
+
+    def push(self, item, priority):
+        self.inner.push(item, priority)
+
+    def pop(self):
+        self.stats.pops += 1
+        return self.inner.pop()
+
+    def __len__(self):
+        return len(self.inner)
+
+    @property
+    def max_size(self):
+        return self.inner.max_size
+
+
+class SearchStats:
+    FIELDS = ("nodes_expanded", "nodes_generated", "peak_frontier", "stale_pops",
+              "heuristic_calls", "heuristic_time", "wall_time", "found")
+
+    def __init__(self, on_expand=None):
+        """on_expand – callables invoked as callback(state) before each expansion."""
+        self.on_expand = list(on_expand or [])
+        self.reset()
+
+    def reset(self):
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.peak_frontier = 0
+        self.stale_pops = 0
+        self.heuristic_calls = 0
+        self.heuristic_time = 0.0
+        self.wall_time = 0.0
+        self.found = False
+        self.pops = 0
+
+    def _wrap_neighbors(self, neighbors):
+        callbacks = self.on_expand
+
+        def counted(state):
+            self.nodes_expanded += 1
+            for callback in callbacks:
+                callback(state)
+            successors = neighbors(state)
+            self.nodes_generated += len(successors)
+            return successors
+        return counted
+
+    def _wrap_heuristic(self, h):
+        clock = time.perf_counter
+
+        def timed(state):
+            t0 = clock()
+            value = h(state)
+            self.heuristic_time += clock() - t0
+            self.heuristic_calls += 1
+            return value
+        return timed
+
+    def run(self, search, start, goal_test, neighbors, h=None, frontier=None):
+        """Run search (a_star if h is given, else uniform_cost_search) with counters attached."""
+        self.reset()
+        inner = frontier if frontier is not None else HeapFrontier()
+        args = [start, goal_test, self._wrap_neighbors(neighbors)]
+        if h is not None:
+            args.append(self._wrap_heuristic(h))
+        t0 = time.perf_counter()
+        path = search(*args, frontier=_CountingFrontier(inner, self))
+        self.wall_time = time.perf_counter() - t0
+        self.found = path is not None
+        self.peak_frontier = inner.max_size
+        # Every non-stale pop either expands a state or hits the goal
+        self.stale_pops = self.pops - self.nodes_expanded - int(self.found)
+        return path
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def to_json(self, path=None, **json_kwargs):
+        """Return the stats as a JSON string; also write them to path if given."""
+        text = json.dumps(self.to_dict(), **json_kwargs)
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        return text
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.FIELDS)
+        return f"SearchStats({fields})"
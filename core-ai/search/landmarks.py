@@ -0,0 +1,172 @@
+"""
+ALT (A*, Landmarks, Triangle inequality) heuristics
+---------------------------------------------------
+For graphs without coordinates there is no obvious h for a_star, so it
+degrades to UCS. ALT precomputes exact distances to and from K landmark
+nodes; by the triangle inequality, for any landmark L and goal t
+
+    d(v, t) >= d(L, t) - d(L, v)      and      d(v, t) >= d(v, L) - d(t, L)
+
+so the largest of these bounds is an admissible (and consistent) heuristic.
+
+Tables are float64 arrays of shape (n_nodes, K), one row per node, so a
+heuristic lookup is one contiguous row read.
+
+    tables = build_landmarks(nodes, neighbors, k=8, processes=None)
+    path = a_star(start, lambda s: s == goal, neighbors, tables.heuristic(goal))
+    tables.save("landmarks.npz"); tables = LandmarkTables.load("landmarks.npz")
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import random
+
+import numpy as np
+
+from shortest_path_tree import ShortestPathTree
+
+
+def _distance_column(args):
+    """Exact distances from `root` to every node (in `nodes` order); inf if unreachable."""
+    root, neighbors, nodes = args
+    dist = ShortestPathTree(root, neighbors).settle_all().dist
+    return np.array([dist.get(v, np.inf) for v in nodes], dtype=np.float64)
+
+
+class LandmarkTables:
+    def __init__(self, nodes, landmarks, from_landmark, to_landmark):
+        """
+        nodes          – list of node ids; row i of each table belongs to nodes[i]
+        landmarks      – list of the K landmark node ids
+        from_landmark  – (n, K) array, d(L_k, v)
+        to_landmark    – (n, K) array, d(v, L_k)
+        """
+        self.nodes = list(nodes)
+        self.index = {v: i for i, v in enumerate(self.nodes)}
+        self.landmarks = list(landmarks)
+        self.from_landmark = np.ascontiguousarray(from_landmark, dtype=np.float64)
+        self.to_landmark = np.ascontiguousarray(to_landmark, dtype=np.float64)
+
+    def heuristic(self, goal):
+        """Return h(state) → admissible estimate of d(state, goal), for a_star."""
+        t = self.index[goal]
+        from_t = self.from_landmark[t]   # d(L, t)
+        to_t = self.to_landmark[t]       # d(t, L)
+        index, from_l, to_l = self.index, self.from_landmark, self.to_landmark
+
+        def h(state):
+            i = index.get(state)
+            if i is None:
+                return 0.0
+            with np.errstate(invalid="ignore"):
+                bounds = np.maximum(from_t - from_l[i], to_l[i] - to_t)
+            # inf - inf (both unreachable from a landmark) carries no information
+            best = np.nanmax(bounds) if not np.isnan(bounds).all() else 0.0
+            return max(float(best), 0.0)
+        return h
+
+    def save(self, path):
+        # The trailing None keeps tuple ids from being unpacked into a 2-D array
+        np.savez_compressed(path,
+                            nodes=np.array(self.nodes + [None], dtype=object)[:-1],
+                            landmarks=np.array(self.landmarks + [None], dtype=object)[:-1],
+                            from_landmark=self.from_landmark,
+                            to_landmark=self.to_landmark)
+
+    @classmethod
+    def load(cls, path):
+        # Node ids are stored as a pickled object array: only load trusted files
+        with np.load(path, allow_pickle=True) as data:
+            return cls(data["nodes"].tolist(), data["landmarks"].tolist(),
+                       data["from_landmark"], data["to_landmark"])
+
+
+def build_landmarks(nodes, neighbors, k=8, reverse_neighbors=None,
+                    strategy="farthest", processes=1, seed=0):
+    """
+    Parameters:
+        nodes             – every node of the graph
+        neighbors         – function(state) → list of (neighbor, cost)
+        k                 – number of landmarks
+        reverse_neighbors – function(state) → list of (predecessor, cost);
+                            None means the graph is undirected
+        strategy          – "farthest": each new landmark is the node farthest
+                            from those already picked (better bounds, the
+                            forward Dijkstras run one after another);
+                            "random": k random nodes (fully parallel)
+        processes         – worker processes for the Dijkstra runs; 1 runs
+                            inline, None uses every core. neighbors must be
+                            picklable when processes != 1.
+
+    Returns:
+        LandmarkTables
+    """
+    nodes = list(nodes)
+    k = min(k, len(nodes))
+    rng = random.Random(seed)
+    reverse_neighbors = reverse_neighbors or neighbors
+    pool = ProcessPoolExecutor(max_workers=processes) if processes != 1 else None
+    run = pool.map if pool else map
+    try:
+        if strategy == "random":
+            landmarks = rng.sample(nodes, k)
+            from_cols = list(run(_distance_column, [(L, neighbors, nodes) for L in landmarks]))
+        elif strategy == "farthest":
+            landmarks, from_cols = [], []
+            closest = np.full(len(nodes), np.inf)
+            candidate = rng.choice(nodes)
+            for _ in range(k):
+                landmarks.append(candidate)
+                col = _distance_column((candidate, neighbors, nodes))
+                from_cols.append(col)
+                closest = np.minimum(closest, col)
+                reachable = np.where(np.isfinite(closest), closest, -1.0)
+                candidate = nodes[int(np.argmax(reachable))]
+        else:
+            raise ValueError(f"unknown landmark strategy: {strategy!r}")
+        to_cols = list(run(_distance_column, [(L, reverse_neighbors, nodes) for L in landmarks]))
+    finally:
+        if pool:
+            pool.shutdown()
+    return LandmarkTables(nodes, landmarks, np.column_stack(from_cols), np.column_stack(to_cols))
+
+
+# Example usage: weighted grid with opaque node ids (no coordinates to exploit)
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import time
+
+    from a_star import a_star
+
+    rng = random.Random(0)
+    size = 70
+    ids = {(r, c): f"n{rng.getrandbits(40):x}" for r in range(size) for c in range(size)}
+    graph = {v: [] for v in ids.values()}
+    for (r, c), v in ids.items():
+        for dr, dc in ((1, 0), (0, 1)):
+            if (r + dr, c + dc) in ids:
+                u, w = ids[(r + dr, c + dc)], rng.randint(1, 10)
+                graph[v].append((u, w))
+                graph[u].append((v, w))
+
+    t0 = time.perf_counter()
+    tables = build_landmarks(list(graph), graph.__getitem__, k=8, processes=None)
+    print(f"preprocessing: {time.perf_counter() - t0:.2f}s for {len(graph)} nodes, 8 landmarks")
+
+    path_file = os.path.join(tempfile.gettempdir(), "landmarks_demo.npz")
+    tables.save(path_file)
+    tables = LandmarkTables.load(path_file)
+
+    def cost(path):
+        return sum(dict(graph[a])[b] for a, b in zip(path, path[1:]))
+
+    for _ in range(3):
+        start, goal = rng.sample(list(graph), 2)
+        for label, h in (("UCS (h=0)", lambda s: 0), ("ALT", tables.heuristic(goal))):
+            expanded = [0]
+
+            def counting(s):
+                expanded[0] += 1
+                return graph[s]
+            path = a_star(start, lambda s: s == goal, counting, h)
+            print(f"  {label:10s} cost {cost(path):4d}  expansions {expanded[0]}")
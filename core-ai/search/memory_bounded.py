@@ -0,0 +1,234 @@
+"""
+Memory-bounded search: IDA* and simplified memory-bounded A* (SMA*)
+-------------------------------------------------------------------
+a_star keeps every generated state in its g / came_from tables. In puzzle-like
+implicit state spaces those tables are what runs the process out of memory.
+Both searches here take the a_star signature (start, goal_test, neighbors, h)
+and hold a bounded number of states.
+
+ida_star        Depth-first iterations with an f = g + h cutoff that rises to the
+                smallest f that exceeded it. Memory is the current path only
+                (max_nodes caps its depth). It re-expands states across
+                iterations.
+sma_star        A* that stores at most max_nodes states. When full it forgets
+                the worst leaf and backs its f-value up into the parent, so the
+                subtree is regenerated only if it becomes promising again.
+                Optimal if the shallowest optimal solution path fits in memory.
+
+Both need an admissible h. For a consistent h and a big enough max_nodes,
+the cost matches a_star's.
+
+What max_nodes bounds: for SMA* it is the number of search-tree nodes. Each
+node also keeps its successor list (up to b more states) and a few heap
+entries; on the 15-puzzle that is about 2.5 KB per node. So memory is
+O(max_nodes * b), not max_nodes states. On an instance that a_star solves
+with fewer states than that, a_star can use less memory (see bench_memory).
+
+Unreachable goals: neither search keeps a closed set, so proving there is
+no path means trying every cycle-free path. In a big cyclic state space
+that never finishes in practice. Pass max_cost to give up (return None)
+once every path of cost <= max_cost has been ruled out.
+"""
+
+from heapq import heappush, heappop
+from itertools import count
+
+INF = float("inf")
+
+
+class MemoryLimitExceeded(RuntimeError):
+    """The search needs more than max_nodes states to continue."""
+
+
+def ida_star(start, goal_test, neighbors, h, max_nodes=None, max_cost=INF):
+    """
+    Iterative-deepening A*. max_nodes bounds the recursion path length; the
+    f cutoff never rises above max_cost.
+
+    Returns:
+        path (list) or None if no path of cost <= max_cost exists
+    """
+    path = [start]
+    on_path = {start}
+
+    def search(g, bound):
+        """Return (found, smallest f above bound seen in this subtree)."""
+        state = path[-1]
+        f = g + h(state)
+        if f > bound:
+            return False, f
+        if goal_test(state):
+            return True, f
+        if max_nodes is not None and len(path) >= max_nodes:
+            raise MemoryLimitExceeded(f"IDA* path longer than max_nodes={max_nodes}")
+        next_bound = INF
+        for nxt, step_cost in neighbors(state):
+            if nxt in on_path:
+                continue  # no cycles along the current path
+            path.append(nxt)
+            on_path.add(nxt)
+            found, t = search(g + step_cost, bound)
+            if found:
+                return True, t
+            path.pop()
+            on_path.discard(nxt)
+            next_bound = min(next_bound, t)
+        return False, next_bound
+
+    bound = h(start)
+    while bound <= max_cost:
+        found, t = search(0, bound)
+        if found:
+            return list(path)
+        if t == INF:
+            return None    # nothing was cut off: no path at any cost
+        bound = t
+    return None
+
+
+class _Node:
+    __slots__ = ("state", "parent", "index", "g", "f", "depth", "successors",
+                 "children", "forgotten", "cursor", "all_generated", "alive")
+
+    def __init__(self, state, parent, index, g, f, depth):
+        self.state = state
+        self.parent = parent
+        self.index = index           # position in the parent's successor list
+        self.g = g
+        self.f = f
+        self.depth = depth
+        self.successors = None       # [(state, cost)], generated on first expansion
+        self.children = {}           # successor index -> child _Node in memory
+        self.forgotten = {}          # successor index -> backed-up f of a dropped child
+        self.cursor = 0              # next successor index to try
+        self.all_generated = False
+        self.alive = True
+
+    def is_open(self):
+        return self.successors is None or len(self.children) < len(self.successors)
+
+
+def sma_star(start, goal_test, neighbors, h, max_nodes=10_000, max_cost=INF):
+    """
+    Simplified memory-bounded A* (Russell 1992), one successor at a time.
+    Nodes with f > max_cost are treated as dead ends.
+
+    Returns:
+        path (list) or None if no path of cost <= max_cost was found within max_nodes
+    """
+    if max_nodes < 2:
+        raise ValueError("sma_star needs max_nodes >= 2")
+    tie = count()
+    open_heap = []   # (f, -depth, tie, node): best f, deepest first
+    leaf_heap = []   # (-f, depth, tie, node): worst f, shallowest first
+    root_f = h(start)
+    root = _Node(start, None, None, 0, root_f if root_f <= max_cost else INF, 0)
+    stored = 1
+
+    def touch(node):
+        """Re-queue node after its f or its open/leaf status changed."""
+        if node.is_open():
+            heappush(open_heap, (node.f, -node.depth, next(tie), node))
+        if not node.children and node is not root:
+            heappush(leaf_heap, (-node.f, node.depth, next(tie), node))
+
+    def backup(node):
+        # Once every successor has been seen, f(node) = min over them (pathmax)
+        while node is not None and node.all_generated:
+            best = min([c.f for c in node.children.values()] + list(node.forgotten.values()),
+                       default=INF)
+            if best == node.f:
+                return
+            node.f = best
+            touch(node)
+            node = node.parent
+
+    def compact():
+        """Rebuild both heaps from the live tree; stale entries would keep
+        forgotten nodes (and their successor lists) reachable."""
+        open_heap.clear()
+        leaf_heap.clear()
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            touch(node)
+            stack.extend(node.children.values())
+
+    def forget_worst_leaf(keep):
+        skipped = None
+        while leaf_heap:
+            entry = heappop(leaf_heap)
+            leaf = entry[3]
+            if not leaf.alive or leaf.children or -entry[0] != leaf.f:
+                continue   # stale entry
+            if leaf is keep:
+                skipped = entry
+                continue
+            break
+        else:
+            raise MemoryLimitExceeded(f"nothing left to forget at max_nodes={max_nodes}")
+        if skipped is not None:
+            heappush(leaf_heap, skipped)
+        leaf.alive = False
+        parent = leaf.parent
+        del parent.children[leaf.index]
+        parent.forgotten[leaf.index] = leaf.f
+        touch(parent)
+
+    touch(root)
+    while open_heap:
+        f, _, _, node = heappop(open_heap)
+        if not node.alive or f != node.f or not node.is_open():
+            continue   # stale entry
+        if f == INF:
+            return None
+        if goal_test(node.state):
+            path = []
+            while node is not None:
+                path.append(node.state)
+                node = node.parent
+            return list(reversed(path))
+
+        if node.successors is None:
+            on_path = set()
+            p = node.parent
+            while p is not None:
+                on_path.add(p.state)
+                p = p.parent
+            node.successors = [(s, c) for s, c in neighbors(node.state) if s not in on_path]
+            if not node.successors:
+                node.all_generated = True
+                node.f = INF
+                touch(node)
+                backup(node.parent)
+                continue
+
+        # Next successor that is not in memory (never generated, or forgotten)
+        n = len(node.successors)
+        i = node.cursor
+        while i in node.children:
+            i = (i + 1) % n
+        node.cursor = (i + 1) % n
+        if node.cursor == 0:
+            node.all_generated = True
+        state, step_cost = node.successors[i]
+        g = node.g + step_cost
+        depth = node.depth + 1
+        if depth >= max_nodes - 1 and not goal_test(state):
+            child_f = INF   # the path to it already fills memory
+        else:
+            child_f = max(node.f, g + h(state), node.forgotten.pop(i, 0))
+            if child_f > max_cost:
+                child_f = INF
+        child = _Node(state, node, i, g, child_f, depth)
+        node.children[i] = child
+        stored += 1
+        touch(child)
+        touch(node)
+        backup(node)
+        if stored > max_nodes:
+            forget_worst_leaf(keep=child)
+            stored -= 1
+        if len(open_heap) + len(leaf_heap) > 4 * max_nodes:
+            compact()
+    return None
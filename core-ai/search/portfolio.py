@@ -0,0 +1,236 @@
+"""
+Portfolio search across processes
+---------------------------------
+No single configuration is fastest on every query: weighted A* finds *a*
+path quickly, plain A* proves optimality with few expansions when h is good,
+bidirectional A* wins when both ends are cheap to grow, UCS wins when h is
+useless and costs almost nothing. portfolio_search runs several of them at
+once, one process each, and returns
+
+  * the first answer that is proven optimal (or proves there is no path), or
+  * the cheapest answer seen so far when the time budget runs out.
+
+Every other worker is then told to stop (a shared flag byte, checked on each
+neighbors() call) and terminated if it does not exit within a short grace
+period.
+
+    result = portfolio_search(start, goal_test, neighbors, h, time_budget=2.0,
+                              goal=goal, reverse_neighbors=reverse)
+    result.path, result.cost, result.optimal, result.winner
+
+The searches run in child processes, so with the "spawn" / "forkserver" start
+methods every callable must be picklable (module-level functions,
+dict.__getitem__, ...). With "fork" (the Linux default) closures work too.
+"""
+
+from collections import namedtuple
+import multiprocessing
+import queue
+import time
+
+from a_star import a_star, bidirectional_a_star
+from anytime import ARAStar
+from memory_bounded import ida_star
+from uniform_cost import uniform_cost_search
+
+INF = float("inf")
+
+SearchConfig = namedtuple("SearchConfig", "name kind weight", defaults=(1.0,))
+SearchConfig.__doc__ = """kind: "a_star", "ucs", "weighted" (A* on g + weight·h),
+"ara" (ARA* starting at weight), "bidirectional" or "ida" """
+
+DEFAULT_PORTFOLIO = (
+    SearchConfig("a_star", "a_star"),
+    SearchConfig("weighted x2", "weighted", 2.0),
+    SearchConfig("ara", "ara", 3.0),
+    SearchConfig("ucs", "ucs"),
+)
+
+PortfolioResult = namedtuple("PortfolioResult", "path cost bound optimal winner elapsed")
+PortfolioResult.__doc__ = """path/cost of the chosen answer (None/inf if none);
+bound: cost <= bound * optimal; optimal: proven optimal (or proven unreachable);
+winner: name of the config that produced it"""
+
+
+class _Cancelled(Exception):
+    pass
+
+
+def _zero(state):
+    return 0
+
+
+def _path_cost(neighbors, path):
+    return sum(min(c for s, c in neighbors(a) if s == b) for a, b in zip(path, path[1:]))
+
+
+def _worker(config, problem, results, cancel):
+    """Run one configuration; report (name, path, cost, bound, optimal) on results."""
+    start, goal_test, neighbors, h, goal, reverse_neighbors, h_bwd = problem
+
+    def checked(state):
+        if cancel.value:
+            raise _Cancelled
+        return neighbors(state)
+
+    def report(path, bound, optimal):
+        cost = INF if path is None else _path_cost(neighbors, path)
+        results.put((config.name, path, cost, bound, optimal))
+
+    kind = config.kind
+    try:
+        if kind == "ara":
+            planner = ARAStar(start, goal_test, checked, h, epsilon=config.weight)
+            best = INF
+            while True:
+                r = planner.improve(time_budget=0.05)
+                if r.optimal or (planner.done and r.path is None):
+                    report(r.path, 1.0, True)
+                    break
+                if r.path is not None and r.cost < best:
+                    best = r.cost
+                    report(r.path, r.bound, False)
+        elif kind == "weighted":
+            scaled = lambda s: config.weight * h(s)
+            path = a_star(start, goal_test, checked, scaled)
+            # weighted A* is complete: "no path" is still a proof
+            report(path, config.weight, path is None)
+        elif kind == "a_star":
+            report(a_star(start, goal_test, checked, h), 1.0, True)
+        elif kind == "ucs":
+            report(uniform_cost_search(start, goal_test, checked), 1.0, True)
+        elif kind == "ida":
+            report(ida_star(start, goal_test, checked, h), 1.0, True)
+        elif kind == "bidirectional":
+            if goal is None or reverse_neighbors is None:
+                raise ValueError("bidirectional needs goal= and reverse_neighbors=")
+            path, _ = bidirectional_a_star(start, goal, checked, reverse_neighbors, h, h_bwd)
+            report(path, 1.0, True)
+        else:
+            raise ValueError(f"unknown search kind {kind!r}")
+    except _Cancelled:
+        pass
+    except Exception as exc:
+        results.put((config.name, exc))
+
+
+def portfolio_search(start, goal_test, neighbors, h, configs=DEFAULT_PORTFOLIO,
+                     time_budget=None, goal=None, reverse_neighbors=None, h_bwd=None,
+                     mp_context=None, grace=1.0):
+    """
+    Parameters:
+        start, goal_test, neighbors, h – as for a_star (h admissible, and
+                                          consistent for "bidirectional")
+        configs           – SearchConfig entries, one process each
+        time_budget       – seconds before returning the best answer so far
+                            (None waits for a proven-optimal one)
+        goal, reverse_neighbors, h_bwd – needed only by "bidirectional" configs
+                            (h_bwd estimates cost from start; default 0)
+        mp_context        – multiprocessing context (default: the platform's)
+        grace             – seconds a cancelled worker gets to exit before it
+                            is terminated
+
+    Returns:
+        PortfolioResult. If every worker fails, the first worker's exception
+        is raised.
+    """
+    ctx = mp_context or multiprocessing.get_context()
+    results = ctx.Queue()
+    cancel = ctx.RawValue("b", 0)   # lock-free: read on every neighbors() call
+    problem = (start, goal_test, neighbors, h, goal, reverse_neighbors, h_bwd or _zero)
+    workers = [ctx.Process(target=_worker, args=(config, problem, results, cancel), daemon=True)
+               for config in configs]
+    t0 = time.perf_counter()
+    deadline = None if time_budget is None else t0 + time_budget
+    best = PortfolioResult(None, INF, INF, False, None, 0.0)
+    errors = []
+    try:
+        for w in workers:
+            w.start()
+        while True:
+            if deadline is None:
+                timeout = 0.1
+            else:
+                timeout = min(0.1, deadline - time.perf_counter())
+                if timeout <= 0:
+                    break
+            try:
+                message = results.get(timeout=timeout)
+            except queue.Empty:
+                if not any(w.is_alive() for w in workers) and results.empty():
+                    break   # everyone finished without a proof
+                continue
+            if len(message) == 2:
+                errors.append(message[1])
+                continue
+            name, path, cost, bound, optimal = message
+            elapsed = time.perf_counter() - t0
+            if optimal:
+                best = PortfolioResult(path, cost, 1.0, True, name, elapsed)
+                break
+            if cost < best.cost:
+                best = PortfolioResult(path, cost, bound, False, name, elapsed)
+    finally:
+        cancel.value = 1
+        stop_by = time.perf_counter() + grace
+        for w in workers:
+            w.join(max(0.0, stop_by - time.perf_counter()))
+        for w in workers:
+            if w.is_alive():
+                w.terminate()
+                w.join()
+        results.close()
+        results.join_thread()
+    if best.winner is None and errors and len(errors) == len(workers):
+        raise errors[0]
+    return best
+
+
+# Example usage: weighted grid with walls, portfolio vs. each search alone
+if __name__ == "__main__":
+    import random
+
+    rng = random.Random(1)
+    N = 300
+    cost = {(r, c): rng.choice((1, 1, 2, 5)) for r in range(N) for c in range(N)
+            if rng.random() > 0.25 or (r, c) in ((0, 0), (N - 1, N - 1))}
+    goal = (N - 1, N - 1)
+
+    def neighbors(p):
+        r, c = p
+        return [((r + dr, c + dc), cost[(r + dr, c + dc)])
+                for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1)) if (r + dr, c + dc) in cost]
+
+    def reverse_neighbors(p):
+        r, c = p
+        return [((r + dr, c + dc), cost[p])
+                for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1)) if (r + dr, c + dc) in cost]
+
+    def h(p):
+        return abs(p[0] - goal[0]) + abs(p[1] - goal[1])
+
+    def h_bwd(p):
+        return p[0] + p[1]
+
+    def goal_test(p):
+        return p == goal
+
+    for name, run in (("a_star", lambda: a_star((0, 0), goal_test, neighbors, h)),
+                      ("ucs", lambda: uniform_cost_search((0, 0), goal_test, neighbors))):
+        t0 = time.perf_counter()
+        path = run()
+        print(f"{name:12s} alone: cost {_path_cost(neighbors, path)} "
+              f"in {time.perf_counter() - t0:.2f}s")
+
+    configs = DEFAULT_PORTFOLIO + (SearchConfig("bidirectional", "bidirectional"),)
+    t0 = time.perf_counter()
+    result = portfolio_search((0, 0), goal_test, neighbors, h, configs=configs,
+                              goal=goal, reverse_neighbors=reverse_neighbors, h_bwd=h_bwd)
+    print(f"portfolio: cost {result.cost}, optimal {result.optimal}, won by {result.winner} "
+          f"after {result.elapsed:.2f}s ({time.perf_counter() - t0:.2f}s incl. shutdown)")
+
+    result = portfolio_search((0, 0), goal_test, neighbors, h, time_budget=0.3,
+                              configs=(SearchConfig("weighted x3", "weighted", 3.0),
+                                       SearchConfig("ucs", "ucs")))
+    print(f"0.3s budget: cost {result.cost}, bound {result.bound}, optimal {result.optimal}, "
+          f"from {result.winner}")
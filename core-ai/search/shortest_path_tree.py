@@ -0,0 +1,219 @@
+"""
+One-to-all Dijkstra with reusable search state
+----------------------------------------------
+uniform_cost_search answers one (start, goal_test) question and throws its
+frontier away. When the same start is queried over and over, keep the search
+instead: ShortestPathTree settles nodes lazily and resumes from where it
+stopped, so every lookup after the first one only pays for the nodes that
+are not settled yet.
+
+    tree = ShortestPathTree("A", neighbors)
+    tree.path_to("D")        # expands until D is settled
+    tree.cost_to("C")        # already settled -> dict lookup
+
+many_to_many() builds one tree per distinct source (stopping as soon as all
+targets are settled) and can spread the sources across a process pool. Given
+the reverse graph, it builds one backward tree per target instead when there
+are fewer targets than sources, so each search serves every source.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heappush, heappop
+
+
+class ShortestPathTree:
+    def __init__(self, start, neighbors):
+        """
+        Parameters:
+            start      – the root state
+            neighbors  – function(state) → list of (neighbor, cost), costs >= 0
+        """
+        self.start = start
+        self.neighbors = neighbors
+        self.dist = {}                 # settled state -> exact cost from start
+        self.parent = {start: None}
+        self._best = {start: 0}        # tentative costs of frontier states
+        self._frontier = [(0, 0, start)]
+        self._tie = 1                  # insertion order; states are never compared
+
+    def _settle_next(self):
+        """Settle one more state; return it, or None when the search is exhausted."""
+        while self._frontier:
+            cost, _, state = heappop(self._frontier)
+            if state in self.dist:
+                continue
+            self.dist[state] = cost
+            del self._best[state]
+            for nxt, step_cost in self.neighbors(state):
+                if nxt in self.dist:
+                    continue
+                new_cost = cost + step_cost
+                if nxt not in self._best or new_cost < self._best[nxt]:
+                    self._best[nxt] = new_cost
+                    self.parent[nxt] = state
+                    heappush(self._frontier, (new_cost, self._tie, nxt))
+                    self._tie += 1
+            return state
+        return None
+
+    def settle(self, goal):
+        """Expand until goal is settled; return True if it is reachable."""
+        while goal not in self.dist:
+            if self._settle_next() is None:
+                return False
+        return True
+
+    def settle_all(self):
+        while self._settle_next() is not None:
+            pass
+        return self
+
+    def find(self, goal_test):
+        """First settled state (in cost order) satisfying goal_test, like UCS."""
+        for state in self.dist:        # insertion order is settle order = cost order
+            if goal_test(state):
+                return state
+        while True:
+            state = self._settle_next()
+            if state is None or goal_test(state):
+                return state
+
+    def cost_to(self, goal):
+        return self.dist[goal] if self.settle(goal) else None
+
+    def path_to(self, goal):
+        if not self.settle(goal):
+            return None
+        path = []
+        while goal is not None:
+            path.append(goal)
+            goal = self.parent[goal]
+        return list(reversed(path))
+
+
+def _solve_source(args):
+    source, targets, neighbors = args
+    tree = ShortestPathTree(source, neighbors)
+    answers = {}
+    for t in targets:
+        path = tree.path_to(t)
+        answers[t] = None if path is None else (tree.dist[t], path)
+    return source, answers
+
+
+def _solve_target(args):
+    target, sources, reverse_neighbors = args
+    tree = ShortestPathTree(target, reverse_neighbors)
+    answers = {}
+    for s in sources:
+        if not tree.settle(s):
+            answers[s] = None
+            continue
+        path = [s]                     # a backward tree's parents point toward target
+        while path[-1] != target:
+            path.append(tree.parent[path[-1]])
+        answers[s] = (tree.dist[s], path)
+    return target, answers
+
+
+def many_to_many(sources, targets, neighbors, processes=1, reverse_neighbors=None):
+    """
+    Shortest paths from every source to every target.
+
+    Parameters:
+        sources, targets  – iterables of states (duplicates are solved once)
+        neighbors         – function(state) → list of (neighbor, cost); must be
+                            picklable (module-level function, dict.__getitem__, ...)
+                            when processes != 1
+        processes         – worker processes; 1 runs inline, None uses every core
+        reverse_neighbors – function(state) → list of (predecessor, cost)
+                            (neighbors itself for an undirected graph). With it,
+                            fewer targets than sources are solved by one backward
+                            search per target; costs are the same, and among
+                            equal-cost paths a different one may be returned.
+
+    Returns:
+        {source: {target: (cost, path) or None}}
+    """
+    sources = list(dict.fromkeys(sources))
+    targets = list(dict.fromkeys(targets))
+    if reverse_neighbors is not None and len(targets) < len(sources):
+        solve, jobs = _solve_target, [(t, sources, reverse_neighbors) for t in targets]
+    else:
+        solve, jobs = _solve_source, [(s, targets, neighbors) for s in sources]
+    if processes == 1 or len(jobs) <= 1:
+        solved = list(map(solve, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            solved = list(pool.map(solve, jobs))
+    if solve is _solve_source:
+        return dict(solved)
+    result = {s: {} for s in sources}
+    for t, answers in solved:
+        for s, answer in answers.items():
+            result[s][t] = answer
+    return result
+
+
+# Example usage: same graph as the uniform_cost.py demo
+if __name__ == "__main__":
+    import random
+    import time
+
+    from uniform_cost import uniform_cost_search
+
+    graph = {
+        "A": [("B", 1), ("C", 4)],
+        "B": [("C", 2), ("D", 5)],
+        "C": [("D", 1)],
+        "D": []
+    }
+    tree = ShortestPathTree("A", graph.__getitem__)
+    print("A -> D:", tree.path_to("D"), "cost", tree.cost_to("D"))
+    assert tree.path_to("D") == uniform_cost_search("A", lambda n: n == "D", graph.__getitem__)
+
+    # Batch: 5 starts x 200 goals on a random graph, UCS per pair vs. trees
+    rng = random.Random(0)
+    n = 5000
+    big = {u: [(rng.randrange(n), rng.randint(1, 20)) for _ in range(6)] for u in range(n)}
+    starts, goals = list(range(5)), rng.sample(range(n), 200)
+
+    t0 = time.perf_counter()
+    for s in starts:
+        for g in goals:
+            uniform_cost_search(s, lambda x, g=g: x == g, big.__getitem__)
+    t_ucs = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    result = many_to_many(starts, goals, big.__getitem__)
+    t_tree = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    parallel = many_to_many(starts, goals, big.__getitem__, processes=None)
+    t_pool = time.perf_counter() - t0
+    assert parallel == result
+    print(f"{len(starts) * len(goals)} queries: UCS per pair {t_ucs:.2f}s, "
+          f"shared trees {t_tree:.2f}s, process pool {t_pool:.2f}s")
+
+    # Many sources, few targets: one backward tree per target instead of one per source
+    reverse = {u: [] for u in big}
+    for u, edges in big.items():
+        for v, w in edges:
+            reverse[v].append((u, w))
+    starts, goals = rng.sample(range(n), 200), list(range(5))
+    t0 = time.perf_counter()
+    forward = many_to_many(starts, goals, big.__getitem__)
+    t_forward = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    backward = many_to_many(starts, goals, big.__getitem__, reverse_neighbors=reverse.__getitem__)
+    t_backward = time.perf_counter() - t0
+    for s in starts:
+        for g in goals:
+            assert (forward[s][g] is None) == (backward[s][g] is None)
+            if backward[s][g]:
+                cost, path = backward[s][g]
+                assert cost == forward[s][g][0] and path[0] == s and path[-1] == g
+                assert cost == sum(min(w for v, w in big[a] if v == b)
+                                   for a, b in zip(path, path[1:]))
+    print(f"{len(starts)} sources x {len(goals)} targets: {len(starts)} forward trees "
+          f"{t_forward:.2f}s, {len(goals)} backward trees {t_backward:.2f}s")
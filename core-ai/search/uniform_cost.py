@@ -10,43 +10,58 @@ Concepts:
   - Cumulative path cost (g)
 """
 
-from heapq import heappush, heappop
+from csr_graph import CSRGraph, csr_search
+from frontier import HeapFrontier
 
-def uniform_cost_search(start, goal_test, neighbors):
+def uniform_cost_search(start, goal_test, neighbors, frontier=None, stats=None):
     """
     Parameters:
         start        – the initial state
         goal_test    – function(state) → bool, returns True when goal found
-        neighbors    – function(state) → list of (neighbor, cost)
+        neighbors    – function(state) → list of (neighbor, cost), or a
+                       csr_graph.CSRGraph (fast path when frontier is None)
+        frontier     – empty priority queue from frontier.py
+                       (default: HeapFrontier)
+        stats        – optional instrumentation.SearchStats, filled in for this run
 
     Returns:
         path (list): the least-cost path from start to goal, if one exists
     """
-    frontier = []
-    heappush(frontier, (0, start, None))  # (cumulative cost, state, parent)
-    came_from = {}
+    if stats is not None:
+        return stats.run(uniform_cost_search, start, goal_test, neighbors, frontier=frontier)
+    if frontier is None and isinstance(neighbors, CSRGraph):
+        return csr_search(neighbors, start, goal_test)
+    if frontier is None:
+        frontier = HeapFrontier()
+    frontier.push(start, 0)
+    came_from = {start: None}
     cost_so_far = {start: 0}
+    explored = set()
 
     while frontier:
-        current_cost, state, parent = heappop(frontier)
+        current_cost, state = frontier.pop()
 
-        # Record parent (first time we see the node)
-        if state not in came_from:
-            came_from[state] = parent
+        # A lazy frontier may still hold stale, costlier copies of a state
+        if state in explored:
+            continue
+        explored.add(state)
 
-            if goal_test(state):
-                # Reconstruct path
-                path = []
-                while state is not None:
-                    path.append(state)
-                    state = came_from[state]
-                return list(reversed(path))
+        if goal_test(state):
+            # Reconstruct path
+            path = []
+            while state is not None:
+                path.append(state)
+                state = came_from[state]
+            return list(reversed(path))
 
-            for neighbor, step_cost in neighbors(state):
-                new_cost = current_cost + step_cost
-                if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
-                    cost_so_far[neighbor] = new_cost
-                    heappush(frontier, (new_cost, neighbor, state))
+        for neighbor, step_cost in neighbors(state):
+            if neighbor in explored:
+                continue
+            new_cost = current_cost + step_cost
+            if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
+                cost_so_far[neighbor] = new_cost
+                came_from[neighbor] = state
+                frontier.push(neighbor, new_cost)
 
     return None  # Goal not found
 
@@ -64,4 +79,9 @@ if __name__ == "__main__":
     def goal_test(n): return n == "D"
 
     path = uniform_cost_search("A", goal_test, neighbors)
-    print("Least-cost path:", path)
\ No newline at end of file
+    print("Least-cost path:", path)
+
+    from instrumentation import SearchStats
+    stats = SearchStats(on_expand=[lambda s: print("  expanding", s)])
+    uniform_cost_search("A", goal_test, neighbors, stats=stats)
+    print("Stats:", stats.to_json())
\ No newline at end of file
@@ -0,0 +1,169 @@
+"""
+Map-reduce aggregation over many CSV shards
+-------------------------------------------
+Computes per-group count / mean / min / max / std of one numeric column over
+any number of CSV files, the same numbers as loading everything into one
+DataFrame and running
+
+    df.groupby(group)[value].agg(["count", "mean", "min", "max", "std"])
+
+Map: each shard is read in chunks (usecols, so only the two columns are
+parsed) and reduced to a partial per group: (count, sum, min, max, m2),
+where m2 is the sum of squared deviations from the group mean.
+Reduce: partials merge pairwise. Counts, sums (exact Python ints for integer
+columns, fsum otherwise), min and max add up directly. m2 combines with
+Chan et al.'s parallel-variance formula, so no shard ever needs another
+shard's data.
+
+    table = aggregate_csvs(sorted(Path("daily").glob("*.csv")), "Subject", "Score",
+                           processes=None)
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from glob import glob
+import math
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+STATS = ("count", "mean", "min", "max", "std")
+
+
+def _merge(a, b):
+    """Combine two partials (count, sum, min, max, m2) for the same group."""
+    n_a, sum_a, min_a, max_a, m2_a = a
+    n_b, sum_b, min_b, max_b, m2_b = b
+    if not n_a or not n_b:
+        return b if not n_a else a    # an all-missing partial adds nothing
+    n = n_a + n_b
+    delta = sum_b / n_b - sum_a / n_a
+    m2 = m2_a + m2_b + delta * delta * n_a * n_b / n
+    total = sum_a + sum_b if isinstance(sum_a, int) else math.fsum((sum_a, sum_b))
+    return n, total, min(min_a, min_b), max(max_a, max_b), m2
+
+
+def merge_partials(into, partials):
+    """Merge {group: partial} dict `partials` into `into` (in place) and return it."""
+    for key, part in partials.items():
+        into[key] = _merge(into[key], part) if key in into else part
+    return into
+
+
+def _chunk_partials(chunk, group, value):
+    partials = {}
+    column = chunk[value]
+    exact = pd.api.types.is_integer_dtype(column.dtype)
+    for key, values in column.groupby(chunk[group], sort=False):
+        values = values.to_numpy()
+        values = values[~np.isnan(values)] if values.dtype.kind == "f" else values
+        n = len(values)
+        if not n:
+            # All missing: pandas still lists the group, with count 0
+            partials[key] = (0, 0.0, math.nan, math.nan, 0.0)
+            continue
+        if exact:
+            total = sum(values.tolist())            # Python ints: no overflow, exact
+            mean = total / n
+        else:
+            total = math.fsum(values.tolist())
+            mean = total / n
+        deviations = values - mean
+        partials[key] = (n, total, values.min().item(), values.max().item(),
+                         float(np.dot(deviations, deviations)))
+    return partials
+
+
+def shard_partials(path, group, value, chunksize=1_000_000):
+    """Map step: {group: (count, sum, min, max, m2)} for one CSV file."""
+    partials = {}
+    with pd.read_csv(path, usecols=[group, value], chunksize=chunksize) as reader:
+        for chunk in reader:
+            merge_partials(partials, _chunk_partials(chunk, group, value))
+    return partials
+
+
+def finalize(partials, group, value, stats=STATS):
+    """Turn merged partials into a DataFrame like pandas' groupby().agg(stats)."""
+    rows = {}
+    for key, (n, total, lo, hi, m2) in partials.items():
+        rows[key] = {"count": n, "mean": total / n if n else math.nan, "min": lo, "max": hi,
+                     "std": math.sqrt(m2 / (n - 1)) if n > 1 else float("nan")}
+    table = pd.DataFrame.from_dict(rows, orient="index", columns=list(STATS))
+    table = table.sort_index()
+    table.index.name = group
+    table.columns.name = None
+    return table[list(stats)]
+
+
+def aggregate_csvs(paths, group="Subject", value="Score", stats=STATS, processes=1,
+                   chunksize=1_000_000):
+    """
+    Parameters:
+        paths      – CSV paths, or a glob pattern string
+        group      – column to group by
+        value      – numeric column to summarize
+        stats      – subset/order of "count", "mean", "min", "max", "std"
+        processes  – worker processes; 1 runs inline, None uses every core
+        chunksize  – rows per pandas chunk inside a shard (bounds memory)
+
+    Returns:
+        DataFrame indexed by group (sorted) with one column per stat
+    """
+    if isinstance(paths, (str, Path)):
+        paths = sorted(glob(str(paths))) if any(ch in str(paths) for ch in "*?[") else [paths]
+    unknown = set(stats) - set(STATS)
+    if unknown:
+        raise ValueError(f"unknown stats: {sorted(unknown)}")
+    merged = {}
+    if processes == 1 or len(paths) <= 1:
+        for path in paths:
+            merge_partials(merged, shard_partials(path, group, value, chunksize))
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            jobs = pool.map(shard_partials, paths, [group] * len(paths), [value] * len(paths),
+                            [chunksize] * len(paths), chunksize=max(1, len(paths) // 64))
+            for partials in jobs:
+                merge_partials(merged, partials)
+    return finalize(merged, group, value, stats)
+
+
+# Example usage: 200 random shards, map-reduce vs. concatenating into pandas
+if __name__ == "__main__":
+    import random
+    import tempfile
+    import time
+
+    rng = random.Random(0)
+    subjects = ["Math", "Science", "History", "Art", "Music"]
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for day in range(200):
+            path = Path(tmp) / f"scores_{day:03d}.csv"
+            with path.open("w") as f:
+                f.write("Name,Subject,Score\n")
+                for i in range(5_000):
+                    f.write(f"s{i},{rng.choice(subjects)},{rng.randint(0, 100)}\n")
+            paths.append(path)
+
+        t0 = time.perf_counter()
+        df = pd.concat(pd.read_csv(p) for p in paths)
+        expected = df.groupby("Subject")["Score"].agg(list(STATS))
+        t_pandas = time.perf_counter() - t0
+
+        for processes in (1, None):
+            t0 = time.perf_counter()
+            table = aggregate_csvs(paths, processes=processes)
+            elapsed = time.perf_counter() - t0
+            print(f"processes={processes}: {elapsed:.2f}s (single pandas frame: {t_pandas:.2f}s)")
+            pd.testing.assert_frame_equal(table, expected, check_exact=False, rtol=1e-12)
+            assert (table["count"] == expected["count"]).all()
+            assert (table["mean"].round(2) == expected["mean"].round(2)).all()
+        print(table)
+
+        # A group whose values are all missing keeps its row, like pandas
+        path = Path(tmp) / "gaps.csv"
+        path.write_text("Subject,Score\nMath,1.5\nDrama,\nMath,\nDrama,\n")
+        pd.testing.assert_frame_equal(aggregate_csvs([path, paths[0]]),
+                                      pd.concat([pd.read_csv(path), pd.read_csv(paths[0])])
+                                      .groupby("Subject")["Score"].agg(list(STATS)))
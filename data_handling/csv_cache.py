@@ -0,0 +1,199 @@
+"""
+Memory-mapped columnar sidecar cache for CSV files
+--------------------------------------------------
+Parsing the same CSV every night costs the same every night. convert() parses
+it once and writes a sidecar directory next to it:
+
+    students.csv
+    students.csv.cols/
+        meta.json            columns, kinds, row count, source size/mtime
+        Score.npy            numeric columns: one .npy each
+        Name.codes.npy       string columns: int32 dictionary codes (-1 = missing)
+        Name.dict.json       ... and the distinct strings, in code order
+
+read_csv_cached() uses the sidecar while it is newer than the CSV (and the
+CSV's size/mtime still match), otherwise it rebuilds it. The .npy files are
+memory-mapped, so opening even a multi-GB table only reads meta.json and the
+string dictionaries; pages are loaded as columns are touched. Numeric columns
+become DataFrame columns without a copy, strings become pandas Categoricals
+over the mapped codes.
+
+    df = read_csv_cached("students.csv")           # builds the sidecar if needed
+    cols = load_columns("students.csv")            # {name: np.memmap | Categorical}
+
+Conversion streams through csv_parser.CSVStream (pandas chunks), so it needs
+one batch of memory, not the whole file.
+"""
+
+import json
+import os
+from pathlib import Path
+import struct
+
+import numpy as np
+import pandas as pd
+
+from csv_parser import CSVStream
+
+HEADER_BYTES = 128   # fixed .npy header, rewritten in place once the row count is known
+
+
+def sidecar_dir(csv_path):
+    csv_path = Path(csv_path)
+    return csv_path.with_name(csv_path.name + ".cols")
+
+
+def _npy_header(dtype, rows):
+    header = {"descr": np.lib.format.dtype_to_descr(np.dtype(dtype)),
+              "fortran_order": False, "shape": (rows,)}
+    text = repr(header).ljust(HEADER_BYTES - 10 - 1) + "\n"
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(text)) + text.encode("latin1")
+
+
+def _promote_to_float(f, rows, block=1 << 20):
+    """Rewrite the int64 values already written to f as float64, in place."""
+    f.flush()
+    for start in range(0, rows, block):
+        count = min(block, rows - start)
+        f.seek(HEADER_BYTES + 8 * start)
+        values = np.frombuffer(f.read(8 * count), dtype=np.int64)
+        f.seek(HEADER_BYTES + 8 * start)
+        f.write(values.astype(np.float64).tobytes())
+    f.seek(0, os.SEEK_END)
+
+
+def is_fresh(csv_path):
+    """True if the sidecar exists, is complete and was built from the current CSV."""
+    csv_path = Path(csv_path)
+    meta_path = sidecar_dir(csv_path) / "meta.json"
+    try:
+        meta = json.loads(meta_path.read_text())
+        stat = csv_path.stat()
+    except (OSError, ValueError):
+        return False
+    return (meta_path.stat().st_mtime_ns >= stat.st_mtime_ns
+            and meta.get("source_size") == stat.st_size
+            and meta.get("source_mtime_ns") == stat.st_mtime_ns)
+
+
+def convert(csv_path, batch_size=100_000, types=None):
+    """Write (or rewrite) the sidecar for csv_path; returns its directory."""
+    csv_path = Path(csv_path)
+    stat = csv_path.stat()
+    out = sidecar_dir(csv_path)
+    out.mkdir(exist_ok=True)
+    (out / "meta.json").unlink(missing_ok=True)   # incomplete until meta.json is back
+
+    stream = CSVStream(csv_path, batch_size=batch_size, types=types)
+    dtypes = stream.dtypes()
+    kinds, files, dictionaries = {}, {}, {}
+    for name, dtype in dtypes.items():
+        if dtype is object:
+            kinds[name] = "dict"
+            dictionaries[name] = {}
+            files[name] = (out / f"{name}.codes.npy").open("wb")
+            files[name].write(_npy_header(np.int32, 0))
+        else:
+            kinds[name] = np.dtype(dtype).str
+            files[name] = (out / f"{name}.npy").open("w+b")
+            files[name].write(_npy_header(dtype, 0))
+
+    rows = 0
+    try:
+        for chunk in stream.frames():
+            for name in stream.columns:
+                column = chunk[name]
+                if kinds[name] == "dict":
+                    # Per-chunk factorize, then remap chunk codes to file-wide codes
+                    codes, uniques = pd.factorize(column)
+                    index = dictionaries[name]
+                    remap = np.array([index.setdefault(u, len(index)) for u in uniques] + [-1],
+                                     dtype=np.int32)
+                    values = remap[codes]        # code -1 (missing) picks the trailing -1
+                else:
+                    if dtypes[name] is np.int64 and column.dtype == np.float64:
+                        # A missing value after the first batch: the column is float64 now
+                        _promote_to_float(files[name], rows)
+                        dtypes[name] = np.float64
+                        kinds[name] = np.dtype(np.float64).str
+                    values = column.to_numpy(dtypes[name])
+                files[name].write(values.tobytes())
+            rows += len(chunk)
+    finally:
+        for name, f in files.items():
+            dtype = np.int32 if kinds[name] == "dict" else dtypes[name]
+            f.seek(0)
+            f.write(_npy_header(dtype, rows))
+            f.close()
+
+    for name, index in dictionaries.items():
+        (out / f"{name}.dict.json").write_text(json.dumps(list(index)))
+    meta = {"columns": stream.columns, "kinds": kinds, "rows": rows,
+            "source_size": stat.st_size, "source_mtime_ns": stat.st_mtime_ns}
+    (out / "meta.json").write_text(json.dumps(meta))
+    return out
+
+
+def load_columns(csv_path, mmap=True, rebuild=True):
+    """
+    {column: array} from the sidecar: numeric columns as (memory-mapped)
+    ndarrays, string columns as pandas Categoricals over the mapped codes.
+    Builds the sidecar first if it is missing or stale (unless rebuild=False,
+    which raises FileNotFoundError instead).
+    """
+    if not is_fresh(csv_path):
+        if not rebuild:
+            raise FileNotFoundError(f"no up-to-date sidecar for {csv_path}")
+        convert(csv_path)
+    directory = sidecar_dir(csv_path)
+    meta = json.loads((directory / "meta.json").read_text())
+    mode = "r" if mmap else None
+    columns = {}
+    for name in meta["columns"]:
+        if meta["kinds"][name] == "dict":
+            codes = np.load(directory / f"{name}.codes.npy", mmap_mode=mode)
+            categories = json.loads((directory / f"{name}.dict.json").read_text())
+            columns[name] = pd.Categorical.from_codes(codes, categories=pd.Index(categories),
+                                                      validate=False)
+        else:
+            columns[name] = np.load(directory / f"{name}.npy", mmap_mode=mode)
+    return columns
+
+
+def read_csv_cached(csv_path, mmap=True):
+    """pd.read_csv replacement backed by the sidecar (strings come back as categories)."""
+    return pd.DataFrame(load_columns(csv_path, mmap=mmap), copy=False)
+
+
+# Example usage: 2M-row CSV, pandas parse vs. cold sidecar build vs. warm mmap load
+if __name__ == "__main__":
+    import random
+    import tempfile
+    import time
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "students.csv"
+        with path.open("w") as f:
+            f.write("Name,Subject,Score,Hours\n")
+            for i in range(2_000_000):
+                f.write(f"student{i % 50_000},{rng.choice(['Math', 'Science', 'History'])},"
+                        f"{rng.randint(0, 100)},{rng.random() * 10:.2f}\n")
+
+        t0 = time.perf_counter()
+        expected = pd.read_csv(path)
+        print(f"pd.read_csv:           {time.perf_counter() - t0:.2f}s")
+        t0 = time.perf_counter()
+        convert(path)
+        print(f"sidecar build (once):  {time.perf_counter() - t0:.2f}s")
+        t0 = time.perf_counter()
+        df = read_csv_cached(path)
+        print(f"read_csv_cached:       {(time.perf_counter() - t0) * 1e3:.1f} ms")
+
+        assert df["Score"].to_numpy().base is not None   # still backed by the mapping
+        for name in expected.columns:
+            assert (df[name].astype(expected[name].dtype) == expected[name]).all(), name
+        print(df.groupby("Subject", observed=True)["Score"].mean().round(2))
+
+        os.utime(path)            # touching the CSV invalidates the sidecar
+        assert not is_fresh(path)
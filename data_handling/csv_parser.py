@@ -1,4 +1,36 @@
-import csv, sys
+"""
+CSV parsing: a quick peek (read_csv) and a streaming batch reader (CSVStream)
+for files too large to load at once.
+
+    stream = CSVStream("scores.csv", batch_size=50_000)
+    stream.columns, stream.types          # header and per-column int/float/str
+    for rows in stream.rows():            # lists of typed tuples
+        ...
+    for chunk in stream.arrays():         # {column: np.ndarray}
+        ...
+    for df in stream.frames():            # pandas DataFrames
+        ...
+
+Only one batch is held in memory at a time. Column types come from the first
+batch unless given; empty fields are missing values (None in rows, NaN in
+float arrays). An int column that meets a missing value after the first
+batch is read as float64 from that batch on. Blank lines are skipped, short
+rows are padded with missing values, and a row with more fields than the
+header raises ValueError.
+
+CLI:
+    python csv_parser.py <path>                                  # first 5 rows
+    python csv_parser.py <path> --bench [--mode rows|numpy|pandas] [--batch-size N]
+"""
+
+import csv
+
+import numpy as np
+
+TYPES = {"int": int, "float": float, "str": str}
+DTYPES = {int: np.int64, float: np.float64, str: object}
+
+
 def read_csv(path, limit=5):
     with open(path, newline='') as f:
         reader = csv.reader(f)
@@ -6,8 +38,193 @@ def read_csv(path, limit=5):
             print(row)
             if i + 1 >= limit:
                 break
+
+
+def infer_type(values):
+    """Narrowest of int / float / str that parses every non-empty value."""
+    kind = int
+    for v in values:
+        if not v:
+            continue
+        if kind is int:
+            try:
+                int(v)
+                continue
+            except ValueError:
+                kind = float
+        try:
+            float(v)
+        except ValueError:
+            return str
+    return kind
+
+
+def _batches(reader, width, size):
+    """
+    Lists of up to size records of exactly width fields. Blank lines are
+    skipped and short rows padded with "" (missing values, as in pandas);
+    a row with too many fields is an error.
+    """
+    batch = []
+    for row in reader:
+        if len(row) != width:
+            if not row:
+                continue
+            if len(row) > width:
+                raise ValueError(f"line {reader.line_num}: {len(row)} fields, "
+                                 f"expected {width}")
+            row = row + [""] * (width - len(row))
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class CSVStream:
+    def __init__(self, path, batch_size=10_000, types=None, encoding="utf-8"):
+        """
+        path        – CSV file with a header row
+        batch_size  – rows per yielded batch
+        types       – {column: int | float | str} (or "int"/"float"/"str");
+                      columns left out are inferred from the first batch
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        self.path = path
+        self.batch_size = batch_size
+        self.encoding = encoding
+        with open(path, newline="", encoding=encoding) as f:
+            reader = csv.reader(f)
+            self.columns = next((row for row in reader if row), [])
+            sample = next(_batches(reader, len(self.columns), batch_size), [])
+        given = {k: TYPES.get(v, v) for k, v in (types or {}).items()}
+        unknown = set(given) - set(self.columns)
+        if unknown:
+            raise KeyError(f"no such columns: {sorted(unknown)}")
+        sample_columns = list(zip(*sample)) or [()] * len(self.columns)
+        self.types = [given.get(name) or infer_type(values)
+                      for name, values in zip(self.columns, sample_columns)]
+        # A missing value forces an int column to float in array/frame form
+        self._has_missing = [any(not v for v in values) for values in sample_columns]
+
+    def _raw_batches(self):
+        with open(self.path, newline="", encoding=self.encoding) as f:
+            reader = csv.reader(f)
+            next((row for row in reader if row), None)
+            yield from _batches(reader, len(self.columns), self.batch_size)
+
+    def rows(self):
+        """Yield lists of tuples with typed values (None for empty fields, str ones too)."""
+        for batch in self._raw_batches():
+            columns = [self._convert(name, kind, values)
+                       for name, kind, values in zip(self.columns, self.types, zip(*batch))]
+            yield list(zip(*columns))
+
+    @staticmethod
+    def _convert(name, kind, values):
+        if kind is str:
+            return values if all(values) else [v or None for v in values]
+        try:
+            return list(map(kind, values))
+        except ValueError:
+            pass
+        out = []
+        for v in values:   # slow path: missing values or a bad field
+            if not v:
+                out.append(None)
+                continue
+            try:
+                out.append(kind(v))
+            except ValueError:
+                raise ValueError(f"column {name!r}: cannot parse {v!r} as {kind.__name__} "
+                                 f"(pass types={{{name!r}: str}} to override)") from None
+        return out
+
+    def dtypes(self):
+        """NumPy dtype per column from the first batch, as used by arrays() and frames()
+        (an int column is promoted to float64 once it meets a missing value)."""
+        return {name: (np.float64 if kind is int and missing else DTYPES[kind])
+                for name, kind, missing in zip(self.columns, self.types, self._has_missing)}
+
+    def arrays(self):
+        """Yield {column: np.ndarray} chunks; numbers go straight into typed buffers
+        (np.fromiter), several times faster than building and casting a string array."""
+        dtypes = self.dtypes()
+        nan = float("nan")
+        for batch in self._raw_batches():
+            chunk = {}
+            for name, values in zip(self.columns, zip(*batch)):
+                dtype = dtypes[name]
+                if dtype is object:
+                    chunk[name] = np.array(values, dtype=object)
+                    continue
+                parse = int if dtype is np.int64 else float
+                try:
+                    chunk[name] = np.fromiter(map(parse, values), dtype, len(values))
+                    continue
+                except ValueError:
+                    if dtype is np.int64:
+                        if all(values):
+                            raise ValueError(f"column {name!r}: non-numeric value in an int "
+                                             f"column (pass types={{{name!r}: float}})") from None
+                        dtype = dtypes[name] = np.float64   # missing value past the first batch
+                chunk[name] = np.fromiter((float(v) if v else nan for v in values),
+                                          dtype, len(values))
+            yield chunk
+
+    def frames(self):
+        """Yield pandas DataFrames of batch_size rows (pandas' C parser)."""
+        import pandas as pd
+        dtypes = {name: ("string" if dtype is object else dtype)
+                  for name, dtype in self.dtypes().items()}
+        # int columns are left to pandas (int64, or float64 for a chunk with a
+        # missing value) and stay float64 once one chunk needed it
+        ints = [name for name, dtype in dtypes.items() if dtype is np.int64]
+        for name in ints:
+            del dtypes[name]
+        with pd.read_csv(self.path, chunksize=self.batch_size, dtype=dtypes,
+                         encoding=self.encoding) as reader:
+            for df in reader:
+                for name in ints:
+                    if df[name].dtype != np.int64:
+                        dtypes[name] = np.float64
+                    if name in dtypes:
+                        df[name] = df[name].astype(np.float64)
+                yield df
+
+
+def bench(path, mode="rows", batch_size=50_000):
+    """Stream the whole file once and print rows/sec."""
+    import os
+    import resource
+    import time
+
+    t0 = time.perf_counter()
+    stream = CSVStream(path, batch_size=batch_size)
+    batches = {"rows": stream.rows, "numpy": stream.arrays, "pandas": stream.frames}[mode]()
+    total = 0
+    for batch in batches:
+        total += len(batch) if mode != "numpy" else len(next(iter(batch.values()), ()))
+    elapsed = time.perf_counter() - t0
+    size_mb = os.path.getsize(path) / 1e6
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode}: {total:,} rows in {elapsed:.2f}s = {total / elapsed:,.0f} rows/sec "
+          f"({size_mb / elapsed:.1f} MB/s), peak RSS {peak_mb:.0f} MB")
+    print("types:", dict(zip(stream.columns, (t.__name__ for t in stream.types))))
+
+
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python csv_parser.py <path-to-csv>")
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Peek at or stream through a CSV file.")
+    parser.add_argument("path")
+    parser.add_argument("--bench", action="store_true", help="stream the whole file, report rows/sec")
+    parser.add_argument("--mode", choices=("rows", "numpy", "pandas"), default="rows")
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    args = parser.parse_args()
+    if args.bench:
+        bench(args.path, args.mode, args.batch_size)
     else:
-        read_csv(sys.argv[1])
+        read_csv(args.path)
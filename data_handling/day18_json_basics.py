@@ -5,7 +5,11 @@
 from __future__ import annotations
 import json
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List
+
+from json_stream import iter_records, write_json, write_json_array, write_jsonl
+from schema import USER_SCHEMA
+from user_store import UserStore
 
 # ---------------------------------------------------------------------
 # Helpers: paths & tiny sample data
@@ -54,17 +58,27 @@ print("📄 JSON read from file:\n", loaded_data)
 import os
 print("CWD:", os.getcwd())
 
-def save_json(data: Any, path: Path, *, pretty: bool = True) -> None:
+def save_json(data: Any, path: Path, *, pretty: bool = True, lines: bool | None = None) -> None:
     """
     Save Python data to a JSON file.
     pretty=True -> indent=2, sorted keys for readability.
+    Lists and generators of records are written record by record (a
+    generator is never materialized); lines=True, or a .jsonl / .ndjson
+    path, writes JSON Lines instead of an array. The file is written to a
+    temp file and renamed into place, so a crash never leaves half a file.
     """
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        if pretty:
-            json.dump(data, f, indent=2, sort_keys=True, ensure_ascii=False)
-        else:
-            json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+    if pretty:
+        options = {"indent": 2, "sort_keys": True, "ensure_ascii": False}
+    else:
+        options = {"separators": (",", ":"), "ensure_ascii": False}
+    if lines is None:
+        lines = path.suffix.lower() in (".jsonl", ".ndjson")
+    if lines:
+        write_jsonl(data, path)
+    elif isinstance(data, (list, tuple, Iterator)):
+        write_json_array(data, path, **options)
+    else:
+        write_json(data, path, **options)
 
 def load_json(path: Path) -> Any:
     """
@@ -79,33 +93,30 @@ def load_json(path: Path) -> Any:
 # ---------------------------------------------------------------------
 # Part B: Validation & safe access patterns
 # ---------------------------------------------------------------------
-def validate_user(record: Dict[str, Any]) -> bool:
-    """
-    Minimal schema check for a 'user' record.
-    Required: id(int), name(str), age(int), skills(list), active(bool).
+# Minimal schema check for a 'user' record.
+# Required: id(int), name(str), age(int), skills(list), active(bool).
+# Compiled once from schema.USER_SCHEMA; for whole batches use
+# USER_SCHEMA.failures(records) or USER_SCHEMA.failures_columnar(df),
+# which return the indices of the rows that fail.
+validate_user = USER_SCHEMA.validate
+
+def iter_active_python_users(users: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
     """
-    return (
-        isinstance(record, dict)
-        and isinstance(record.get("id"), int)
-        and isinstance(record.get("name"), str)
-        and isinstance(record.get("age"), int)
-        and isinstance(record.get("skills"), list)
-        and isinstance(record.get("active"), bool)
-    )
-
-def filter_active_python_users(users: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """
-    Return users who are active and have 'python' in skills.
+    Generator version of filter_active_python_users: works on a streamed
+    source (e.g. iter_users(path)) without holding all records.
     """
-    result = []
     for u in users:
         if not validate_user(u):
             # skip invalid records silently for now (we can log in Day 19)
             continue
-        skills = u.get("skills", [])
-        if u.get("active") and isinstance(skills, list) and "python" in skills:
-            result.append(u)
-    return result
+        if u["active"] and "python" in u["skills"]:
+            yield u
+
+def filter_active_python_users(users: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Return users who are active and have 'python' in skills.
+    """
+    return list(iter_active_python_users(users))
 
 def add_skill(users: List[Dict[str, Any]], name: str, skill: str) -> None:
     """
@@ -163,15 +174,51 @@ def safe_load_json(filepath: Path):
         print(f"Error: Invalid JSON in file - {filepath}")
         return []
 
-def to_id_name_map(users: List[Dict[str, Any]]) -> Dict[int, str]:
-    """Convert list of users into {id: name} map."""
+def to_id_name_map(users: Iterable[Dict[str, Any]]) -> Dict[int, str]:
+    """Convert users (a list or a stream) into {id: name} map."""
     return {u["id"]: u["name"] for u in users if "id" in u and "name" in u}
 
-def extract_contacts(users: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+def iter_contacts(users: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, str]]:
+    """Generator version of extract_contacts, one contact per user."""
+    for u in users:
+        yield {"name": u.get("name", "N/A"), "email": u.get("email", "N/A")}
+
+def extract_contacts(users: Iterable[Dict[str, Any]]) -> List[Dict[str, str]]:
     """Extract only names and emails for contact export."""
-    return [{"name": u.get("name", "N/A"), "email": u.get("email", "N/A")} for u in users]
+    return list(iter_contacts(users))
 
+# ---------------------------------------------------------------------
+# Part E: Streaming – multi-GB exports without json.load
+# ---------------------------------------------------------------------
+def iter_users(filepath: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Stream records from a JSON array file (.json) or JSON Lines (.jsonl /
+    .ndjson), one at a time. Memory stays at one record plus a read buffer.
+    """
+    return iter_records(filepath)
+
+def safe_iter_users(filepath: Path) -> Iterator[Dict[str, Any]]:
+    """Streaming safe_load_json: report a missing/invalid file and stop."""
+    try:
+        yield from iter_records(filepath)
+    except FileNotFoundError:
+        print(f"Error: File not found - {filepath}")
+    except ValueError as exc:
+        print(f"Error: Invalid JSON in file - {filepath} ({exc})")
+
+
+
+
+# ---------------------------------------------------------------------
+# Part F: Indexed store – bulk tagging / filtering without list scans
+# ---------------------------------------------------------------------
+def save_store(store: UserStore, path: Path, *, pretty: bool = True) -> None:
+    """Persist a UserStore as the same JSON array of users save_json writes."""
+    save_json(store.to_records(), path, pretty=pretty)
 
+def load_store(path: Path) -> UserStore:
+    """Load users saved by save_json / save_store and rebuild the indexes."""
+    return UserStore.from_records(load_json(path))
 
 
 # ---------------------------------------------------------------------
@@ -234,4 +281,22 @@ if __name__ == "__main__":
     print(id_map)
 
     print("\nContacts list:")
-    print(contacts)
\ No newline at end of file
+    print(contacts)
+
+    # 7) Streaming pipeline: JSON array -> active Python users -> JSON Lines
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:   # scratch output, not kept in samples/
+        jsonl_path = Path(tmp) / "active_python_users.jsonl"
+        count = write_jsonl(iter_active_python_users(iter_users(SAMPLE_JSON_PATH)), jsonl_path)
+        print(f"\nStreamed {count} active Python users -> {jsonl_path}")
+        print("Streamed ID → Name map:", to_id_name_map(safe_iter_users(jsonl_path)))
+    print("Streamed contacts:", list(iter_contacts(safe_iter_users(Path("users.json")))))
+
+    # 8) Indexed store: tag, query by index intersection, round-trip via JSON
+    store = load_store(SAMPLE_JSON_PATH)
+    store.add_skills([("bob", "python"), ("DANIEL", "git")])
+    print("\nStore: active AND python ->", [u["name"] for u in store.query(active=True, skills=["python"])])
+    with tempfile.TemporaryDirectory() as tmp:
+        store_path = Path(tmp) / "users_store.json"
+        save_store(store, store_path)
+        assert load_store(store_path).to_records() == store.to_records()
\ No newline at end of file
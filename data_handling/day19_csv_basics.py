@@ -10,6 +10,10 @@ import csv
 from pathlib import Path
 import pandas as pd
 
+from csv_aggregate import aggregate_csvs
+from csv_cache import read_csv_cached
+from running_stats import GroupedStats
+
 DATA_DIR = Path(__file__).parent
 CSV_PATH = DATA_DIR / "students.csv"   # placeholder CSV file
 
@@ -39,10 +43,15 @@ def write_csv(filepath: Path, data):
 # Part C: Reading & Filtering CSV with pandas
 # ---------------------------------------------------------------------------
 
-def read_csv_pandas(filepath: Path):
-    """Read CSV using pandas and show basic summary"""
+def read_csv_pandas(filepath: Path, cache=False):
+    """Read CSV using pandas and show basic summary
+
+    cache=True reads through csv_cache: the first call writes a memory-mapped
+    columnar sidecar next to the CSV, later calls map it instead of parsing
+    (string columns then come back as categoricals).
+    """
     try:
-        df = pd.read_csv(filepath)
+        df = read_csv_cached(filepath) if cache else pd.read_csv(filepath)
         print("=== DataFrame Head ===")
         print(df.head())
         print("\n=== Summary ===")
@@ -56,14 +65,36 @@ def read_csv_pandas(filepath: Path):
 # Part D: Mini Project – CSV Aggregator
 # ---------------------------------------------------------------------------
 
-def summarize_scores(filepath: Path):
-    """Compute average score per subject using pandas"""
-    df = pd.read_csv(filepath)
-    summary = df.groupby("Subject")["Score"].mean().round(2)
+def summarize_scores(filepath, processes=1):
+    """Compute average score per subject.
+
+    filepath may be one CSV, a list of CSV shards, or a glob pattern such as
+    "daily/*.csv"; shards are reduced to partial sums/counts (in a process pool
+    if processes != 1) and merged, so the result equals a single pd.read_csv +
+    groupby mean over all rows. See csv_aggregate.aggregate_csvs for
+    min/max/count/std.
+    """
+    table = aggregate_csvs(filepath, "Subject", "Score", stats=("mean",), processes=processes)
+    summary = table["mean"].rename("Score").round(2)
     print("\n=== Average Score per Subject ===")
     print(summary)
     return summary
 
+def summarize_score_stream(batches, quantiles=(0.5,), stats=None):
+    """Per-subject count/mean/min/max/std plus approximate quantiles over a feed.
+
+    batches is any iterable of DataFrames with Subject and Score columns
+    (pd.read_csv(..., chunksize=N), or a live feed that never ends); no batch
+    is kept. Pass the returned GroupedStats back as stats to continue a
+    feed, or .merge() the stats of other workers into it.
+    """
+    stats = stats if stats is not None else GroupedStats()
+    for batch in batches:
+        stats.add_batch(batch["Subject"], batch["Score"])
+    print("\n=== Streaming Score Summary per Subject ===")
+    print(stats.summary(quantiles).round(2))
+    return stats
+
 # ---------------------------------------------------------------------------
 # Smoke Test
 # ---------------------------------------------------------------------------
@@ -84,4 +115,8 @@ if __name__ == "__main__":
     df = read_csv_pandas(CSV_PATH)
 
     print("\nRunning CSV aggregator:")
-    summarize_scores(CSV_PATH)
\ No newline at end of file
+    summary = summarize_scores(CSV_PATH)
+
+    print("\nStreaming the same file two rows at a time:")
+    stats = summarize_score_stream(pd.read_csv(CSV_PATH, chunksize=2))
+    assert (stats.summary()["mean"].round(2) == summary).all()
\ No newline at end of file
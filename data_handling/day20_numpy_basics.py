@@ -1,5 +1,8 @@
 import numpy as np
 
+from grading import grade
+from running_stats import QuantileSketch, RunningStats
+
 students = np.array(["Ava", "Ben", "Clara", "David", "Ella"])
 subjects = np.array(["Math", "Science", "English", "History"])
 
@@ -12,25 +15,39 @@ scores = np.array([
     [75, 80, 84, 89]
 ])
 
-# Calculate averages and grades
-averages = scores.mean(axis=1)
-grades = np.where(averages >= 90, "A",
-          np.where(averages >= 80, "B",
-          np.where(averages >= 70, "C", "D")))
+# Calculate averages, grades, top students and subject stats in one pass
+# (grading.grade: cutoffs {"A": 90, "B": 80, "C": 70}, below that "D";
+# the same call works on a memory-mapped 10M-student .npy file)
+N = 3
+report = grade(scores, top=N)
+averages = report.averages
+grades = report.letters
 
 # ---- SIMPLE, CLEAN LOOP ----
-for name, avg, grade in zip(students, averages, grades):
-    print(f"{name:6s} → Avg = {avg:.1f}, Grade = {grade}")
+for name, avg, letter in zip(students, averages, grades):
+    print(f"{name:6s} → Avg = {avg:.1f}, Grade = {letter}")
 
 # ---- TOP 3 STUDENTS ----
-N = 3
-top_indices = np.argsort(averages)[::-1][:N]
+top_indices = report.top          # argpartition, not a full argsort
 print("\nTop 3 Students:")
 for i in top_indices:
     print(f"{students[i]} → {averages[i]:.2f}")
 
 # ---- SUBJECT STATS ----
+stats = report.stats              # every subject from one reduction
 print("\nSubject Statistics:")
-for j, subject in enumerate(subjects):
-    col = scores[:, j]
-    print(f"{subject:8s} → Mean:{col.mean():.1f} Max:{col.max()} Min:{col.min()}")
\ No newline at end of file
+for subject, mean, high, low in zip(subjects, stats["mean"], stats["max"], stats["min"]):
+    print(f"{subject:8s} → Mean:{mean:.1f} Max:{high} Min:{low}")
+# ---- STREAMING SUBJECT STATS ----
+# Rows arriving one student at a time (an unbounded feed): per-subject
+# accumulators that never keep the rows; add_batch() takes NumPy blocks and
+# merge() combines accumulators built by separate workers.
+running = [RunningStats() for _ in subjects]
+medians = [QuantileSketch() for _ in subjects]
+for row in scores:
+    for stat, sketch, score in zip(running, medians, row.tolist()):
+        stat.add(score)
+        sketch.add(score)
+print("\nStreaming Subject Statistics:")
+for subject, stat, sketch in zip(subjects, running, medians):
+    print(f"{subject:8s} → Mean:{stat.mean:.1f} Std:{stat.std:.1f} Median:{sketch.quantile(0.5):.1f}")
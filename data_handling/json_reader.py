@@ -1,10 +1,25 @@
 import json, sys
-def read_json(path):
+from json_stream import iter_json_array, iter_json_object
+def read_json(path, stream=False):
+    if stream:
+        # One top-level value in memory at a time (see json_stream.py)
+        with open(path, 'r', encoding='utf-8') as f:
+            first = ''
+            while not first:
+                chunk = f.read(64)
+                if not chunk:
+                    break
+                first = chunk.lstrip()[:1]
+        if first == '[':
+            print("Top-level array items:", sum(1 for _ in iter_json_array(path)))
+        else:
+            print("Top-level keys:", [key for key, _ in iter_json_object(path)])
+        return
     with open(path, 'r') as f:
         data = json.load(f)
     print("Top-level keys:", list(data.keys()))
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python json_reader.py <path-to-json>")
+        print("Usage: python json_reader.py <path-to-json> [--stream]")
     else:
-        read_json(sys.argv[1])
+        read_json(sys.argv[1], stream="--stream" in sys.argv[2:])
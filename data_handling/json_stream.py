@@ -0,0 +1,403 @@
+"""
+Streaming JSON: top-level array/object items and JSON Lines
+-----------------------------------------------------------
+json.load() has to hold the whole document (and its Python objects) in memory.
+These readers hold one chunk of text plus the item being decoded:
+
+    for user in iter_json_array("users.json"):        # [ {...}, {...}, ... ]
+        ...
+    for key, value in iter_json_object("config.json"):
+        ...
+    for user in iter_jsonl("users.jsonl"):            # one JSON value per line
+        ...
+    iter_records(path)                                # .jsonl/.ndjson -> lines, else array
+
+Each item is decoded by the C decoder (json.JSONDecoder.raw_decode), so
+per-item speed is the same as json.loads; only the outer [ , , ] / { : , }
+punctuation is scanned here.
+
+The writers take any iterable (a generator never has to fit in memory):
+
+    write_jsonl(records, "users.jsonl")
+    write_json_array(records, "users.json", indent=2, sort_keys=True)
+    write_json(value, "config.json")                  # any value, encoded at once
+
+Compact output is encoded by one C-encoder call per record (json.dump always
+uses the pure-Python encoder, which is about twice as slow); indented output
+is encoded INDENT_BATCH records at a time, and the batches are framed into
+one array here. Either way the text is joined and written in blocks of about
+buffer_size characters instead of json.dump's many small writes. Output goes
+to a temp file next to the target. That file is fsynced and renamed over the
+target (os.replace) only once it is complete, and the directory is fsynced
+after the rename, so a crash never leaves a half-written file behind. An
+existing target keeps its permissions. The array writer's output is
+byte-for-byte what json.dump(list(records), f, ...) writes with the same
+indent / sort_keys / separators / ensure_ascii (json.dump's defaults apply).
+
+bench_write() (run this file) on 500k users, 1-core VM, each in a fresh process:
+
+    json.dump pretty (the old save_json)    ~7.9 s   peak RSS ~270 MB
+    json.dump compact                       ~7.2 s            ~270 MB
+    write_json_array, indent=2 sorted       ~6.6 s             ~22 MB
+    write_json_array, compact               ~3.4 s             ~20 MB
+    write_jsonl                             ~3.3 s             ~20 MB
+"""
+
+from contextlib import contextmanager
+from itertools import islice
+import json
+import os
+from pathlib import Path
+import re
+import stat
+
+CHUNK_SIZE = 1 << 16
+BUFFER_SIZE = 1 << 20
+INDENT_BATCH = 1000       # records per encoder call for indented arrays
+_NON_WS = re.compile(r"[^ \t\n\r]")
+_NUMBER_CHARS = frozenset("0123456789.eE+-")
+# A value cut at the buffer edge fails at most this far from the end (a partial
+# token like "-Infinit", "\u00e" or "1e+"); an unterminated string fails at its
+# opening quote
+_CUT_TAIL = 16
+
+
+class _Scanner:
+    """Cursor over a text file that refills its buffer on demand."""
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.offset = 0      # characters dropped from the front of buf
+        self.eof = False
+        self.decode = json.JSONDecoder().raw_decode
+
+    def _fill(self):
+        """Read more text (at least as much as is buffered, so retries stay linear)."""
+        more = self.f.read(max(self.chunk_size, len(self.buf) - self.pos))
+        if not more:
+            self.eof = True
+        if self.pos > self.chunk_size or not more:
+            self.offset += self.pos
+            self.buf, self.pos = self.buf[self.pos:], 0
+        self.buf += more
+
+    def error(self, message, pos=None):
+        pos = self.pos if pos is None else pos
+        return ValueError(f"invalid JSON at character {self.offset + pos}: {message}")
+
+    def peek(self):
+        """Next non-whitespace character ('' at end of input), without consuming it."""
+        while True:
+            m = _NON_WS.search(self.buf, self.pos)
+            if m:
+                self.pos = m.start()
+                return self.buf[self.pos]
+            self.pos = len(self.buf)
+            if self.eof:
+                return ""
+            self._fill()
+
+    def expect(self, chars):
+        ch = self.peek()
+        if not ch or ch not in chars:
+            raise self.error(f"expected {' or '.join(repr(c) for c in chars)}, got {ch!r}")
+        self.pos += 1
+        return ch
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decode(self.buf, self.pos)
+                # A number cut at the buffer edge ("12" of "12.5") may continue;
+                # a complete value is never directly followed by these characters
+                if self.eof or end < len(self.buf) and self.buf[end] not in _NUMBER_CHARS:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError as exc:
+                # Only a value running into the end of the buffer may be complete
+                # with more text; anything else is malformed, so don't read on
+                cut = (exc.msg.startswith("Unterminated string")
+                       or len(self.buf) - exc.pos <= _CUT_TAIL)
+                if self.eof or not cut:
+                    raise self.error(exc.msg, exc.pos) from None
+            self._fill()
+
+
+def _open(path):
+    return Path(path).open("r", encoding="utf-8")
+
+
+def iter_json_array(path, chunk_size=CHUNK_SIZE):
+    """Yield the elements of a file whose top level is a JSON array, one at a time."""
+    with _open(path) as f:
+        scan = _Scanner(f, chunk_size)
+        scan.expect("[")
+        if scan.peek() == "]":
+            scan.pos += 1
+        else:
+            while True:
+                yield scan.value()
+                if scan.expect(",]") == "]":
+                    break
+        if scan.peek():
+            raise scan.error("extra data after the top-level array")
+
+
+def iter_json_object(path, chunk_size=CHUNK_SIZE):
+    """Yield (key, value) pairs of a file whose top level is a JSON object."""
+    with _open(path) as f:
+        scan = _Scanner(f, chunk_size)
+        scan.expect("{")
+        if scan.peek() == "}":
+            scan.pos += 1
+        else:
+            while True:
+                if scan.peek() != '"':
+                    raise scan.error("expected a string key")
+                key = scan.value()
+                scan.expect(":")
+                yield key, scan.value()
+                if scan.expect(",}") == "}":
+                    break
+        if scan.peek():
+            raise scan.error("extra data after the top-level object")
+
+
+def iter_jsonl(path):
+    """Yield one decoded value per non-blank line of a JSON Lines file."""
+    with _open(path) as f:
+        for lineno, line in enumerate(f, 1):
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as exc:
+                    raise ValueError(f"{path}:{lineno}: {exc.msg}") from None
+
+
+def _fsync_dir(directory):
+    """Make a rename in directory durable (directories can't be opened on Windows)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_open(path, encoding="utf-8"):
+    """
+    Text file for writing that replaces path only when the with-block
+    completes; on an exception the temp file is removed and path is untouched.
+    An existing path keeps its permission bits.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp.open("w", encoding=encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(tmp, stat.S_IMODE(path.stat().st_mode))
+        except FileNotFoundError:
+            pass                                  # new file: default permissions
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    _fsync_dir(path.parent)
+
+
+def _write_buffered(f, pieces, buffer_size):
+    """Write an iterable of strings in joined blocks of ~buffer_size characters."""
+    block, size = [], 0
+    for piece in pieces:
+        block.append(piece)
+        size += len(piece)
+        if size >= buffer_size:
+            f.write("".join(block))
+            block, size = [], 0
+    f.write("".join(block))
+
+
+def _encoder(indent=None, sort_keys=False, separators=None, ensure_ascii=True):
+    """JSONEncoder with json.dump's keyword arguments and defaults."""
+    return json.JSONEncoder(ensure_ascii=ensure_ascii, indent=indent, sort_keys=sort_keys,
+                            separators=separators)
+
+
+def write_jsonl(records, path, buffer_size=BUFFER_SIZE):
+    """Write an iterable of JSON-serializable values as JSON Lines; returns the count."""
+    encode = _encoder(separators=(",", ":"), ensure_ascii=False).encode
+    count = 0
+
+    def lines():
+        nonlocal count
+        for record in records:
+            count += 1
+            yield encode(record) + "\n"
+
+    with atomic_open(path) as f:
+        _write_buffered(f, lines(), buffer_size)
+    return count
+
+
+def write_json_array(records, path, indent=None, sort_keys=False, separators=None,
+                     ensure_ascii=True, buffer_size=BUFFER_SIZE):
+    """
+    Write an iterable as one top-level JSON array, item by item; returns the
+    count. indent, sort_keys, separators and ensure_ascii mean what they do
+    for json.dump, and the output is the same bytes.
+    """
+    encoder = _encoder(indent, sort_keys, separators, ensure_ascii)
+    comma = encoder.item_separator
+    count = 0
+
+    def compact():                  # one C-encoder call per record
+        nonlocal count
+        encode = encoder.encode
+        for record in records:
+            yield (comma if count else "[") + encode(record)
+            count += 1
+        yield "]" if count else "[]"
+
+    def indented():                 # json.dump's layout, a batch of records at a time
+        nonlocal count
+        encode = encoder.encode
+        items = iter(records)
+        while True:
+            batch = list(islice(items, INDENT_BATCH))
+            if not batch:
+                break
+            # "[\n  a,\n  b\n]" -> "\n  a,\n  b": the items laid out exactly as in one array
+            yield (comma if count else "[") + encode(batch)[1:-2]
+            count += len(batch)
+        yield "\n]" if count else "[]"
+
+    pieces = compact() if indent is None else indented()
+    with atomic_open(path) as f:
+        _write_buffered(f, pieces, buffer_size)
+    return count
+
+
+def write_json(value, path, indent=None, sort_keys=False, separators=None, ensure_ascii=True):
+    """Write any JSON value in one go (the C encoder when indent is None), atomically;
+    same options and output as json.dump."""
+    with atomic_open(path) as f:
+        f.write(_encoder(indent, sort_keys, separators, ensure_ascii).encode(value))
+
+
+def iter_records(path, chunk_size=CHUNK_SIZE):
+    """Records from .jsonl / .ndjson (line per record) or a top-level JSON array."""
+    if Path(path).suffix.lower() in (".jsonl", ".ndjson"):
+        return iter_jsonl(path)
+    return iter_json_array(path, chunk_size)
+
+
+def _users(n):
+    return ({"id": i, "name": f"user{i}", "age": 20 + i % 40, "active": i % 3 != 0,
+             "skills": ["python", "sql"][: i % 3], "email": f"user{i}@example.com"}
+            for i in range(n))
+
+
+WRITE_MODES = ("json.dump pretty", "json.dump compact", "stream pretty", "stream compact",
+               "stream jsonl")
+
+
+def _bench_write(mode, path, n):
+    """Runs in a fresh process: (seconds, peak RSS MB) to export n users one way."""
+    import resource
+    import sys
+    import time
+
+    t0 = time.perf_counter()
+    if mode.startswith("json.dump"):          # the old save_json: needs the whole list
+        kwargs = ({"indent": 2, "sort_keys": True} if mode.endswith("pretty")
+                  else {"separators": (",", ":")})
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(list(_users(n)), f, ensure_ascii=False, **kwargs)
+    elif mode == "stream pretty":
+        write_json_array(_users(n), path, indent=2, sort_keys=True, ensure_ascii=False)
+    elif mode == "stream compact":
+        write_json_array(_users(n), path, separators=(",", ":"), ensure_ascii=False)
+    else:
+        write_jsonl(_users(n), path)
+    elapsed = time.perf_counter() - t0
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def bench_write(n=500_000, directory=None):
+    """Time and peak RSS of each WRITE_MODES export of n users, each in a fresh process."""
+    from concurrent.futures import ProcessPoolExecutor
+    import hashlib
+    import multiprocessing
+    import tempfile
+
+    spawn = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        outputs = {}
+        for mode in WRITE_MODES:
+            path = Path(tmp) / ("users.jsonl" if mode.endswith("jsonl") else "users.json")
+            with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+                elapsed, rss = pool.submit(_bench_write, mode, path, n).result()
+            digest = hashlib.sha1()
+            with path.open("rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+            outputs[mode] = digest.hexdigest()
+            print(f"{mode:18s} {n:,} users in {elapsed:6.2f}s = {n / elapsed:>9,.0f}/s, "
+                  f"{path.stat().st_size / 1e6:6.1f} MB, peak RSS {rss:7.1f} MB")
+        assert outputs["stream pretty"] == outputs["json.dump pretty"]
+        assert outputs["stream compact"] == outputs["json.dump compact"]
+
+
+# Example usage: a 500k-user export written by json.dump (the old save_json) vs. the
+# streaming writers, then read back by json.load vs. streaming (peak memory via tracemalloc)
+if __name__ == "__main__":
+    import sys
+    import tempfile
+    import time
+    import tracemalloc
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    bench_write(n)     # first: workers inherit the parent's peak RSS
+    print()
+    with tempfile.TemporaryDirectory() as tmp:
+        # Same bytes as json.dumps for every combination of json.dump's options
+        path = Path(tmp) / "check.json"
+        records = [{"b": 1, "a": [1.5, None, {"é": "x\ny"}]}, [], {}, "ü", 7]
+        for indent in (None, 0, 2, "\t"):
+            for options in ({}, {"sort_keys": True}, {"ensure_ascii": False},
+                            {"separators": (",", ":")}, {"separators": (";", "=")}):
+                for items in (records, records[:1], []):
+                    write_json_array(iter(items), path, indent=indent, **options)
+                    expected = json.dumps(items, indent=indent, **options)
+                    assert path.read_text(encoding="utf-8") == expected, (indent, options)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "users.json"
+        with path.open("w") as f:
+            json.dump(list(_users(n)), f, indent=2)
+
+        for label, load in (("json.load", lambda: len(json.load(path.open()))),
+                            ("iter_json_array", lambda: sum(1 for _ in iter_json_array(path)))):
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            count = load()
+            elapsed = time.perf_counter() - t0
+            peak = tracemalloc.get_traced_memory()[1] / 1e6
+            tracemalloc.stop()
+            print(f"{label:16s} {count} records in {elapsed:.2f}s, peak {peak:.1f} MB")
+
+        lines = Path(tmp) / "users.jsonl"
+        write_jsonl(iter_json_array(path), lines)
+        assert list(iter_jsonl(lines)) == json.load(path.open())
+        assert dict(iter_json_object(Path(__file__).parent / "student_data.json"))
@@ -0,0 +1,358 @@
+"""
+Streaming summary statistics: mergeable accumulators
+----------------------------------------------------
+Summaries that never need the data in memory, so they work on unbounded
+feeds, on chunks of a huge file, or in several workers at once:
+
+    stats = RunningStats()              # count, mean, variance/std, min, max
+    stats.add(87)                       # one value (Welford's update)
+    stats.add_batch(np.array(scores))   # a NumPy batch, reduced vectorized
+    stats.merge(other_worker_stats)     # Chan et al.'s parallel combination
+
+    sketch = QuantileSketch()           # approximate quantiles (t-digest-like)
+    sketch.add(87); sketch.add_batch(scores); sketch.merge(other)
+    sketch.quantile(0.5), sketch.quantile([0.9, 0.99])
+
+    by_subject = GroupedStats()         # both of the above per key
+    by_subject.add("Math", 87)
+    by_subject.add_batch(df["Subject"], df["Score"])
+    by_subject.summary()                # DataFrame: count mean min max std p50 ...
+
+None and NaN values are skipped, as pandas does. All three classes pickle,
+so workers can send their accumulators back to be merged.
+
+RunningStats keeps (count, mean, m2, min, max), where m2 is the sum of
+squared deviations from the mean. add() is Welford's update. add_batch()
+reduces the batch with NumPy, then merges it as if it came from another
+worker. Merging is exact up to floating-point rounding, in any order.
+
+QuantileSketch is a merging t-digest: values are buffered, then sorted
+together with the current centroids and grouped so that each centroid
+covers at most one unit of the scale k(q) = compression/(2π)·asin(2q - 1).
+That scale makes centroids small near q = 0 and q = 1 and larger in the
+middle, so tail quantiles stay accurate. The grouping is one vectorized pass
+(cumulative weights, floor(k), np.add.reduceat). quantile() interpolates
+between centroid centers, using the exact min and max at the ends. Around
+compression/2 centroids are kept, whatever the count.
+"""
+
+import math
+
+import numpy as np
+
+COMPRESSION = 200
+
+
+def _clean(values):
+    """1-D array of the non-missing values (integer dtypes are kept as is)."""
+    values = np.asarray(values)
+    if values.dtype.kind not in "iub":
+        values = values.astype(np.float64)
+        values = values[~np.isnan(values)]
+    return values.ravel()
+
+
+def _missing(x):
+    return x is None or x != x
+
+
+class RunningStats:
+    __slots__ = ("count", "mean", "m2", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x):
+        """Add one value (skipped if None or NaN)."""
+        if _missing(x):
+            return
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    def add_batch(self, values):
+        """Add an array-like of values in one vectorized reduction."""
+        values = _clean(values)
+        if not len(values):
+            return
+        mean = values.mean(dtype=np.float64)
+        deviations = values - mean
+        self._merge(len(values), float(mean), float(deviations @ deviations),
+                    values.min().item(), values.max().item())
+
+    def merge(self, other):
+        """Fold another RunningStats (e.g. from a worker) into this one; returns self."""
+        if other.count:
+            self._merge(other.count, other.mean, other.m2, other.min, other.max)
+        return self
+
+    def _merge(self, n_b, mean_b, m2_b, min_b, max_b):
+        n_a = self.count
+        n = n_a + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta * delta * n_a * n_b / n
+        self.count = n
+        if min_b < self.min:
+            self.min = min_b
+        if max_b > self.max:
+            self.max = max_b
+
+    @property
+    def variance(self):
+        """Sample variance (ddof=1, like pandas); NaN below two values."""
+        return self.m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def summary(self):
+        """{"count", "mean", "min", "max", "std"} (NaN where undefined)."""
+        if not self.count:
+            return {"count": 0, "mean": math.nan, "min": math.nan, "max": math.nan,
+                    "std": math.nan}
+        return {"count": self.count, "mean": self.mean, "min": self.min, "max": self.max,
+                "std": self.std}
+
+    def __repr__(self):
+        return f"RunningStats({', '.join(f'{k}={v}' for k, v in self.summary().items())})"
+
+
+class QuantileSketch:
+    __slots__ = ("compression", "buffer_size", "means", "weights", "count", "min", "max",
+                 "_values", "_pending", "_pending_count")
+
+    def __init__(self, compression=COMPRESSION, buffer_size=None):
+        """
+        compression  – accuracy / size trade-off (about compression/2 centroids)
+        buffer_size  – values collected before they are merged into the centroids
+        """
+        self.compression = compression
+        self.buffer_size = buffer_size or 20 * compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._values = []            # from add()
+        self._pending = []           # (means, weights or None) from add_batch() / merge()
+        self._pending_count = 0
+
+    def add(self, x):
+        """Add one value (skipped if None or NaN)."""
+        if _missing(x):
+            return
+        self._values.append(x)
+        self.count += 1
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+        if len(self._values) >= self.buffer_size:
+            self._compress()
+
+    def add_batch(self, values):
+        """Add an array-like of values."""
+        values = _clean(values)
+        if not len(values):
+            return
+        self.count += len(values)
+        self.min = min(self.min, values.min().item())
+        self.max = max(self.max, values.max().item())
+        self._pending.append((values.astype(np.float64), None))
+        self._pending_count += len(values)
+        if self._pending_count >= self.buffer_size:
+            self._compress()
+
+    def merge(self, other):
+        """Fold another sketch (e.g. from a worker) into this one; returns self."""
+        if not other.count:
+            return self
+        self._pending.append((other.means, other.weights))
+        self._pending.extend(other._pending)
+        if other._values:
+            self._pending.append((np.asarray(other._values, dtype=np.float64), None))
+        self._pending_count += other.count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _compress(self):
+        """Merge buffered values and pending centroids into the centroid list."""
+        means = [self.means]
+        weights = [self.weights]
+        if self._values:
+            self._pending.append((np.asarray(self._values, dtype=np.float64), None))
+            self._values = []
+        for m, w in self._pending:
+            means.append(m)
+            weights.append(np.ones(len(m)) if w is None else w)
+        self._pending, self._pending_count = [], 0
+        means = np.concatenate(means)
+        weights = np.concatenate(weights)
+        if not len(means):
+            return
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        cumulative = np.cumsum(weights)
+        q = (cumulative - weights / 2) / cumulative[-1]
+        k = np.floor(self.compression / (2 * math.pi) * np.arcsin(2 * q - 1))
+        starts = np.flatnonzero(np.concatenate(([True], k[1:] != k[:-1])))
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def quantile(self, q):
+        """Approximate q-quantile (q in [0, 1], scalar or array); NaN if empty."""
+        if self._values or self._pending:
+            self._compress()
+        q = np.asarray(q, dtype=np.float64)
+        if not self.count:
+            return np.full(q.shape, np.nan)[()]
+        centers = np.cumsum(self.weights) - self.weights / 2
+        positions = np.concatenate(([0.0], centers, [self.count]))
+        values = np.concatenate(([self.min], self.means, [self.max]))
+        return np.interp(q * self.count, positions, values)[()]
+
+    def __len__(self):
+        """Number of centroids currently kept."""
+        if self._values or self._pending:
+            self._compress()
+        return len(self.means)
+
+
+def _quantile_column(q):
+    return f"p{q * 100:g}"
+
+
+class GroupedStats:
+    """RunningStats (and, with quantiles=True, a QuantileSketch) per key."""
+
+    def __init__(self, quantiles=True, compression=COMPRESSION):
+        self.stats = {}
+        self.sketches = {} if quantiles else None
+        self.compression = compression
+
+    def _group(self, key):
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = RunningStats()
+            if self.sketches is not None:
+                self.sketches[key] = QuantileSketch(self.compression)
+        return stats
+
+    def add(self, key, value):
+        self._group(key).add(value)
+        if self.sketches is not None:
+            self.sketches[key].add(value)
+
+    def add_batch(self, keys, values):
+        """Add parallel arrays (or pandas Series) of keys and values."""
+        import pandas as pd
+
+        codes, uniques = pd.factorize(np.asarray(keys, dtype=object))
+        values = np.asarray(values)
+        order = np.argsort(codes, kind="stable")
+        codes, values = codes[order], values[order]
+        starts = np.flatnonzero(np.concatenate(([True], codes[1:] != codes[:-1])))
+        for start, stop in zip(starts, np.append(starts[1:], len(codes))):
+            if codes[start] < 0:                   # missing key
+                continue
+            key = uniques[codes[start]]
+            self._group(key).add_batch(values[start:stop])
+            if self.sketches is not None:
+                self.sketches[key].add_batch(values[start:stop])
+
+    def merge(self, other):
+        """Fold another GroupedStats into this one; returns self. Both must
+        have been built with the same quantiles setting."""
+        if (self.sketches is None) != (other.sketches is None):
+            raise ValueError("cannot merge GroupedStats with and without quantile sketches")
+        for key, stats in other.stats.items():
+            self._group(key).merge(stats)
+            if self.sketches is not None:
+                self.sketches[key].merge(other.sketches[key])
+        return self
+
+    def summary(self, quantiles=(0.5,)):
+        """DataFrame indexed by key (sorted): count, mean, min, max, std, then p50, ..."""
+        import pandas as pd
+
+        rows = {}
+        for key, stats in self.stats.items():
+            row = stats.summary()
+            if self.sketches is not None:
+                for q in quantiles:
+                    row[_quantile_column(q)] = self.sketches[key].quantile(q)
+            rows[key] = row
+        columns = ["count", "mean", "min", "max", "std"]
+        if self.sketches is not None:
+            columns += [_quantile_column(q) for q in quantiles]
+        table = pd.DataFrame.from_dict(rows, orient="index", columns=columns)
+        return table.sort_index()
+
+
+def _worker_stats(seed, n, batch):
+    """One worker's share of the demo feed: (RunningStats, QuantileSketch)."""
+    rng = np.random.default_rng(seed)
+    stats, sketch = RunningStats(), QuantileSketch()
+    for _ in range(n // batch):
+        values = rng.lognormal(4, 0.5, batch)
+        stats.add_batch(values)
+        sketch.add_batch(values)
+    return stats, sketch
+
+
+# Example usage: per-record vs. batch updates, 4 merged workers vs. one pass,
+# and the sketch's quantiles against np.quantile on the same values
+if __name__ == "__main__":
+    from concurrent.futures import ProcessPoolExecutor
+    import time
+
+    n, batch = 1_000_000, 10_000
+    values = np.concatenate([np.random.default_rng(seed).lognormal(4, 0.5, n)
+                             for seed in range(4)])
+    first = values[:n].tolist()
+
+    t0 = time.perf_counter()
+    stats, sketch = RunningStats(), QuantileSketch()
+    for x in first:
+        stats.add(x)
+        sketch.add(x)
+    t_record = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    batched, batched_sketch = _worker_stats(0, n, batch)
+    t_batch = time.perf_counter() - t0
+    print(f"{n:,} values: per record {t_record:.2f}s, batches of {batch:,} {t_batch:.2f}s")
+    assert math.isclose(stats.mean, batched.mean) and math.isclose(stats.std, batched.std)
+
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        parts = list(pool.map(_worker_stats, range(4), [n] * 4, [batch] * 4))
+    total, total_sketch = RunningStats(), QuantileSketch()
+    for part_stats, part_sketch in parts:
+        total.merge(part_stats)
+        total_sketch.merge(part_sketch)
+    print(f"4 workers merged: count {total.count:,}, mean {total.mean:.4f} "
+          f"(np {values.mean():.4f}), std {total.std:.4f} (np {values.std(ddof=1):.4f}), "
+          f"min {total.min:.3f}, max {total.max:.3f}")
+    assert math.isclose(total.mean, values.mean()) and math.isclose(total.std, values.std(ddof=1))
+    assert total.min == values.min() and total.max == values.max()
+
+    qs = [0.001, 0.01, 0.1, 0.5, 0.9, 0.99, 0.999]
+    estimates = total_sketch.quantile(qs)
+    exact = np.quantile(values, qs)
+    ranks = np.searchsorted(np.sort(values), estimates) / len(values)
+    print(f"sketch: {len(total_sketch)} centroids for {total_sketch.count:,} values")
+    for q, est, ex, rank in zip(qs, estimates, exact, ranks):
+        print(f"  q={q:<6} sketch {est:9.3f}  exact {ex:9.3f}  (rank error {abs(rank - q):.5f})")
@@ -0,0 +1,193 @@
+"""
+Compiled record schemas: one-off checks, bulk record checks, columnar checks
+-------------------------------------------------------------------------------
+Declare the fields once:
+
+    USER = Schema({"id": int, "name": str, "age": int, "skills": list, "active": bool})
+
+and get three validators with the same rules as validate_user's
+isinstance() chain (a field may also name a tuple of types):
+
+    USER.validate(record)        -> bool, for one dict
+    USER.failures(records)       -> [row indices], for an iterable of dicts
+    USER.failures_columnar(data) -> np.ndarray of row indices, for a DataFrame
+                                    or {field: array}
+
+validate() and failures() are Python source generated for this schema and
+exec'd once: the same flat `isinstance(record.get("id"), int) and ...` chain
+a hand-written validator would use (the form CPython 3.11+ specializes best),
+with no loop over the schema at run time. failures() runs its whole loop
+inside one generated function, so there is no function call per record.
+
+failures_columnar() never looks at individual values when a column already
+has a matching dtype (int64 for int, bool for bool, a pandas string / Int64 /
+boolean column: only its missing-value mask). Categoricals (csv_cache's
+dictionary-encoded strings) check each distinct value once and index the
+result by code. Object columns (lists, mixed values) are checked with
+map(isinstance, ...) into a NumPy mask. The check sees the columnar data as
+stored: an int field that pandas upcast to float64 (because of a missing or
+1.0 value) fails on every row.
+
+Measured with the demo below (1-core VM). The record paths use 1M dicts
+because 10M of them do not fit in its 5 GB. They scale linearly, so multiply
+by 10 for 10M records.
+
+    validate_user per record, 1M dicts        ~0.52 s   (~5.2 s per 10M)
+    USER.validate per record, 1M dicts        ~0.55 s   (same: same bytecode)
+    USER.failures(records), 1M dicts          ~0.37 s   (~1.4x)
+    USER.failures_columnar, 10M rows          ~0.84 s   (~6x; nearly all of it is
+                                                          the skills list column)
+    ... same without the object column        ~0.05 s   (~100x)
+
+Row-wise validation stays bound by CPython's per-record cost. The big win
+comes from validating data that is already columnar (csv_parser.CSVStream
+arrays, csv_cache sidecars, DataFrames).
+"""
+
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+# dtype kinds whose every value passes isinstance(value, T) (bool is an int subclass)
+_KINDS = {int: "iub", bool: "b", float: "f", str: "U"}
+
+
+def _types(spec):
+    return spec if isinstance(spec, tuple) else (spec,)
+
+
+class Schema:
+    def __init__(self, fields):
+        """fields: {name: type or tuple of types}; every field is required."""
+        self.fields = dict(fields)
+        for name, spec in self.fields.items():
+            if not all(isinstance(t, type) for t in _types(spec)):
+                raise TypeError(f"field {name!r}: expected a type or tuple of types, got {spec!r}")
+        self.validate, self.failures = self._compile()
+
+    def _compile(self):
+        env = {}
+        checks = ["isinstance(record, dict)"]
+        for i, (name, spec) in enumerate(self.fields.items()):
+            env[f"_t{i}"] = spec
+            checks.append(f"isinstance(record.get({name!r}), _t{i})")
+        expression = "\n            and ".join(checks)
+        source = (
+            "def validate(record):\n"
+            f"    return ({expression})\n"
+            "\n"
+            "def failures(records):\n"
+            "    bad = []\n"
+            "    append = bad.append\n"
+            "    i = -1\n"
+            "    for record in records:\n"
+            "        i += 1\n"
+            f"        if not ({expression}):\n"
+            "            append(i)\n"
+            "    return bad\n")
+        exec(compile(source, f"<schema {list(self.fields)}>", "exec"), env)
+        env["validate"].__doc__ = "True if record is a dict whose fields match the schema."
+        env["failures"].__doc__ = "Indices of the records that fail validate()."
+        return env["validate"], env["failures"]
+
+    def _column_mask(self, column, spec, n):
+        """Boolean mask of valid rows for one column."""
+        types = _types(spec)
+        kinds = "".join(_KINDS.get(t, "") for t in types)
+        if isinstance(column, pd.Series):
+            column = column.to_numpy() if isinstance(column.dtype, np.dtype) else column.array
+        if isinstance(column, pd.Categorical):
+            # Dictionary-encoded (e.g. csv_cache strings): check each distinct value once
+            categories = np.asarray(column.categories, dtype=object)
+            valid = self._column_mask(categories, spec, len(categories))
+            return np.append(valid, False)[column.codes]    # code -1 (missing) -> False
+        if isinstance(column, pd.api.extensions.ExtensionArray):
+            # pandas string / Int64 / boolean / Float64 ...: only missing values fail
+            dtype = column.dtype
+            if (str in types and isinstance(dtype, pd.StringDtype)
+                    or dtype.kind in kinds and dtype.kind != "O"):
+                return ~np.asarray(column.isna(), dtype=bool)
+            column = column.to_numpy(dtype=object)
+        column = np.asarray(column)
+        if column.dtype.kind in kinds:
+            return np.ones(n, dtype=bool)
+        if column.dtype != object:
+            return np.zeros(n, dtype=bool)
+        return np.fromiter(map(isinstance, column, repeat(spec)), dtype=bool, count=n)
+
+    def failures_columnar(self, data):
+        """Row indices that fail the schema in a DataFrame or {field: array-like}."""
+        n = len(data) if isinstance(data, pd.DataFrame) else len(next(iter(data.values()), ()))
+        ok = np.ones(n, dtype=bool)
+        for name, spec in self.fields.items():
+            if name not in data:
+                return np.arange(n)
+            column = data[name]
+            if len(column) != n:
+                raise ValueError(f"column {name!r} has {len(column)} rows, expected {n}")
+            ok &= self._column_mask(column, spec, n)
+        return np.flatnonzero(~ok)
+
+
+USER_SCHEMA = Schema({"id": int, "name": str, "age": int, "skills": list, "active": bool})
+
+
+# Example usage: the timings quoted in the module docstring
+if __name__ == "__main__":
+    import sys
+    import time
+
+    def validate_user(record):   # the original isinstance chain from day18_json_basics
+        return (isinstance(record, dict)
+                and isinstance(record.get("id"), int)
+                and isinstance(record.get("name"), str)
+                and isinstance(record.get("age"), int)
+                and isinstance(record.get("skills"), list)
+                and isinstance(record.get("active"), bool))
+
+    n_records = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    n_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000_000
+
+    skills = (["python"], ["sql", "excel"], [])
+    records = [{"id": i, "name": f"u{i % 1000}", "age": 20 + i % 50,
+                "skills": skills[i % 3], "active": i % 2 == 0} for i in range(n_records)]
+    for i in range(0, n_records, 100_003):
+        records[i]["age"] = str(records[i]["age"])        # a few bad rows
+    expected = [i for i, r in enumerate(records) if not validate_user(r)]
+
+    t0 = time.perf_counter()
+    slow = [i for i, r in enumerate(records) if not validate_user(r)]
+    t_orig = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    one = [i for i, r in enumerate(records) if not USER_SCHEMA.validate(r)]
+    t_one = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    bulk = USER_SCHEMA.failures(records)
+    t_bulk = time.perf_counter() - t0
+    assert slow == one == bulk == expected
+    print(f"{n_records:,} dicts: validate_user {t_orig:.2f}s, Schema.validate {t_one:.2f}s, "
+          f"Schema.failures {t_bulk:.2f}s ({t_orig / t_bulk:.1f}x)")
+    del records
+
+    skills_column = np.empty(n_rows, dtype=object)
+    for k, s in enumerate(skills):
+        skills_column[k::3] = [s]
+    names = pd.Categorical.from_codes(np.arange(n_rows) % 1000,
+                                      categories=[f"u{i}" for i in range(1000)])
+    columns = {"id": np.arange(n_rows), "name": names,
+               "age": pd.Series(np.arange(n_rows) % 50 + 20, dtype="Int64"),
+               "skills": skills_column, "active": np.arange(n_rows) % 2 == 0}
+    columns["age"].iloc[::1_000_003] = pd.NA
+    t0 = time.perf_counter()
+    bad = USER_SCHEMA.failures_columnar(columns)
+    t_cols = time.perf_counter() - t0
+    assert (bad == np.arange(0, n_rows, 1_000_003)).all()
+    typed = Schema({k: v for k, v in USER_SCHEMA.fields.items() if k != "skills"})
+    t0 = time.perf_counter()
+    typed.failures_columnar(columns)
+    t_typed = time.perf_counter() - t0
+    per_row = t_orig / n_records
+    print(f"{n_rows:,} rows columnar: {t_cols:.2f}s ({per_row * n_rows / t_cols:.0f}x vs. "
+          f"validate_user per row), typed columns only {t_typed:.3f}s "
+          f"({per_row * n_rows / t_typed:.0f}x)")
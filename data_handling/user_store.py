@@ -0,0 +1,206 @@
+"""
+Indexed user store
+------------------
+day18's add_skill() scans every user (and lower-cases every name) per call,
+and filters test `"python" in skills` list by list, so tagging M users in a
+list of N costs O(N·M). UserStore keeps the records by id plus three indexes:
+
+    by_id      id -> record
+    by_name    name.lower() -> {ids}       (names need not be unique)
+    by_skill   skill -> {ids}              (inverted index)
+    active     {ids} with a truthy "active"
+
+so lookups are dict hits and combined filters are set intersections,
+smallest set first:
+
+    store = UserStore.from_records(load_json(path))     # or any iterable/stream
+    store.add_skill("bob", "python")                    # O(users named bob)
+    store.upsert_many(new_or_changed_records)           # re-indexes only those
+    store.query(active=True, skills=["python"])         # active AND python
+    save_json(store.to_records(), path)
+
+day18_json_basics.save_store / load_store wrap the save_json / load_json
+round trip.
+
+Records are stored as copies; change them through upsert()/add_skill() (not
+in place), or the indexes will go stale.
+"""
+
+
+def _name_key(record):
+    name = record.get("name")
+    return name.lower() if isinstance(name, str) else None
+
+
+def _skills(record):
+    skills = record.get("skills")
+    return skills if isinstance(skills, list) else []
+
+
+class UserStore:
+    def __init__(self):
+        self.by_id = {}
+        self.by_name = {}
+        self.by_skill = {}
+        self.active = set()
+        self._position = {}    # id -> insertion counter, for query() ordering
+        self._next = 0
+
+    @classmethod
+    def from_records(cls, records):
+        store = cls()
+        store.upsert_many(records)
+        return store
+
+    def to_records(self):
+        """Records in insertion order, ready for save_json."""
+        return list(self.by_id.values())
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __contains__(self, user_id):
+        return user_id in self.by_id
+
+    def get(self, user_id, default=None):
+        return self.by_id.get(user_id, default)
+
+    # --- index maintenance -------------------------------------------------
+    def _index(self, uid, record):
+        key = _name_key(record)
+        if key is not None:
+            self.by_name.setdefault(key, set()).add(uid)
+        for skill in _skills(record):
+            self.by_skill.setdefault(skill, set()).add(uid)
+        if record.get("active"):
+            self.active.add(uid)
+
+    def _unindex(self, uid, record):
+        key = _name_key(record)
+        if key is not None:
+            _discard(self.by_name, key, uid)
+        for skill in _skills(record):
+            _discard(self.by_skill, skill, uid)
+        self.active.discard(uid)
+
+    # --- updates -------------------------------------------------------------
+    def upsert(self, record):
+        """Insert or replace the record with record["id"]."""
+        uid = record["id"]
+        old = self.by_id.get(uid)
+        if old is not None:
+            self._unindex(uid, old)
+        else:
+            self._position[uid] = self._next
+            self._next += 1
+        record = dict(record)
+        if isinstance(record.get("skills"), list):
+            record["skills"] = list(dict.fromkeys(record["skills"]))   # copy, drop duplicates
+        self.by_id[uid] = record
+        self._index(uid, record)
+
+    def upsert_many(self, records):
+        """Bulk upsert from any iterable (a list, or a json_stream generator)."""
+        upsert = self.upsert
+        for record in records:
+            upsert(record)
+
+    def remove(self, user_id):
+        record = self.by_id.pop(user_id)
+        del self._position[user_id]
+        self._unindex(user_id, record)
+        return record
+
+    def add_skill(self, name, skill):
+        """Like day18.add_skill: every user with this name (case-insensitive)
+        gets the skill once. Returns how many users were changed."""
+        changed = 0
+        for uid in self.by_name.get(name.lower(), ()):
+            record = self.by_id[uid]
+            if not isinstance(record.get("skills"), list):
+                record["skills"] = []
+            if uid not in self.by_skill.get(skill, ()):
+                record["skills"].append(skill)
+                self.by_skill.setdefault(skill, set()).add(uid)
+                changed += 1
+        return changed
+
+    def add_skills(self, pairs):
+        """Bulk tagging: pairs of (name, skill). Returns the number of changes."""
+        return sum(self.add_skill(name, skill) for name, skill in pairs)
+
+    # --- queries -------------------------------------------------------------
+    def ids(self, active=None, skills=(), name=None):
+        """Set of ids matching every given condition (skills: all of them)."""
+        sets = [self.by_skill.get(skill, set()) for skill in skills]
+        if name is not None:
+            sets.append(self.by_name.get(name.lower(), set()))
+        if active:
+            sets.append(self.active)
+        if not sets:
+            result = set(self.by_id)
+        else:
+            sets.sort(key=len)
+            result = sets[0].intersection(*sets[1:])
+        if active is False:
+            result = result - self.active
+        return result
+
+    def query(self, active=None, skills=(), name=None):
+        """Matching records in insertion order, e.g. query(active=True, skills=["python"])."""
+        position = self._position
+        return [self.by_id[uid] for uid in sorted(self.ids(active, skills, name),
+                                                   key=position.__getitem__)]
+
+
+def _discard(index, key, uid):
+    ids = index.get(key)
+    if ids is not None:
+        ids.discard(uid)
+        if not ids:
+            del index[key]
+
+
+# Example usage: bulk skill tagging, day18-style list scans vs. the store
+if __name__ == "__main__":
+    import random
+    import time
+
+    def add_skill(users, name, skill):   # day18_json_basics.add_skill, for comparison
+        for u in users:
+            if isinstance(u.get("name"), str) and u["name"].lower() == name.lower():
+                if "skills" not in u or not isinstance(u["skills"], list):
+                    u["skills"] = []
+                if skill not in u["skills"]:
+                    u["skills"].append(skill)
+
+    rng = random.Random(0)
+    n, m = 50_000, 500
+    users = [{"id": i, "name": f"User{i}", "age": 20 + i % 40, "active": i % 3 != 0,
+              "skills": rng.sample(["python", "sql", "excel", "git", "c"], i % 3)}
+             for i in range(n)]
+    tags = [(f"user{rng.randrange(n)}", rng.choice(["python", "rust", "go"])) for _ in range(m)]
+
+    t0 = time.perf_counter()
+    store = UserStore.from_records(users)
+    t_build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    store.add_skills(tags)
+    t_store = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for name, skill in tags:
+        add_skill(users, name, skill)
+    t_scan = time.perf_counter() - t0
+    print(f"{m} tags over {n} users: list scans {t_scan:.2f}s, "
+          f"store {t_store * 1e3:.1f} ms (+{t_build:.2f}s one-off build)")
+
+    t0 = time.perf_counter()
+    scan = [u for u in users if u.get("active") and "python" in u.get("skills", [])]
+    t_scan = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    hits = store.query(active=True, skills=["python"])
+    t_store = time.perf_counter() - t0
+    assert hits == scan
+    print(f"active AND python: scan {t_scan * 1e3:.1f} ms, index intersection "
+          f"{t_store * 1e3:.1f} ms ({len(hits)} users)")
+    assert store.to_records() == users
@@ -1,12 +1,503 @@
+"""
+XML reading: whole-tree (read_xml) and streaming (iter_elements / iter_records),
+and conversion of XML records to JSON Lines or CSV (convert).
+
+ET.parse builds every element of the document before you can look at one.
+The streaming readers use ET.iterparse: each matched element is handed over
+as soon as its end tag is parsed, then cleared and detached from its parent,
+and elements outside any match are dropped when they close, so memory stays
+at one record plus the open ancestors no matter how big the file is.
+
+    for rec in iter_records("feed.xml", "catalog/book"):    # {"id": "b1", "title": ...}
+        ...
+    for path, elem in iter_elements("feed.xml", ["book", "magazine"]):
+        ...                                                 # elem is valid until next()
+
+A path is matched against the end of the element's tag path, so "book"
+matches any <book> and "catalog/book" only <book> directly under <catalog>.
+
+Conversion is parse -> flatten -> write:
+
+    convert("feed.xml", "books.csv", "book", processes=4)
+
+    parse    records stream out of iter_records (one process), or out of byte
+             ranges of the file (processes > 1, see below)
+    flatten  nested fields become dotted columns:
+             <price currency="USD">9.50</price> -> price.currency, price
+    schema   columns and int/float/str types are inferred from the first
+             `sample` records; JSON Lines values are typed with it ("9.50" ->
+             9.5), CSV gets it as the header (columns first seen after the
+             sample are dropped from CSV and reported)
+    write    batch_size records are formatted into one string and written
+             with one call, into a temp file renamed over the output at the end
+
+With processes > 1 the file is cut into equal byte ranges, one per worker.
+Each worker finds the first record start tag (<book> or <book ...>) at or
+after its range start and converts every record that *starts* inside its
+range, so each record is converted exactly once, by exactly one worker.
+Records are pulled out as raw bytes and parsed batch_size at a time under a
+synthetic root that carries the document root's namespace declarations.
+The part files are concatenated in order, so the output keeps document
+order. In this mode records are matched by tag name only (the last part of
+the path), must not nest inside each other, and the input must be UTF-8
+without the record tag inside comments or CDATA sections. If a record does
+not parse on its own (say it uses a prefix declared on an element between
+the root and the records), the whole file is converted in one process.
+
+CLI:
+    python xml_converter.py <path-to-xml>                   # root and child tags (ET.parse)
+    python xml_converter.py <path-to-xml> --stream          # same output, streamed
+    python xml_converter.py <path-to-xml> --records book    # print records as dicts
+    python xml_converter.py <path-to-xml> --bench [--records book]
+    python xml_converter.py <path-to-xml> --records book --out books.jsonl|books.csv
+                            [--processes N] [--sample N] [--batch-size N]
+"""
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import io
+from itertools import islice, repeat
+import json
+import mmap
+import os
+from pathlib import Path
+import re
+import shutil
 import sys
+import time
 import xml.etree.ElementTree as ET
-def read_xml(path):
+from xml.sax.saxutils import quoteattr
+
+from csv_parser import infer_type
+
+FORMATS = ("jsonl", "csv")
+_TAG_END = {bytes([c]) for c in b" \t\r\n/>"}
+# Rest of a start tag up to its ">", skipping quoted attribute values (which may hold ">")
+_START_TAG_REST = re.compile(rb"""(?:[^>"']|"[^"]*"|'[^']*')*>""")
+
+
+def read_xml(path, stream=False):
+    if stream:
+        root, children, depth = None, [], 0
+        for event, elem in ET.iterparse(path, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                if depth == 1:
+                    root = elem
+                elif depth == 2:
+                    children.append(elem.tag)
+            else:
+                depth -= 1
+                if depth == 1:
+                    root.remove(elem)   # keep only the root itself
+        print("Root tag:", root.tag)
+        print("Child tags:", children)
+        return
     tree = ET.parse(path)
     root = tree.getroot()
     print("Root tag:", root.tag)
     print("Child tags:", [child.tag for child in root])
+
+
+def _split(path):
+    return tuple(part for part in path.strip("/").split("/") if part)
+
+
+def iter_elements(source, paths):
+    """
+    Yield (path, element) for every element whose tag path ends with one of
+    paths (a string or a list of strings). The element is cleared after the
+    caller moves on, so copy out what you need before the next iteration.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    wanted = {_split(p): p for p in paths}
+    lengths = sorted({len(k) for k in wanted}, reverse=True)
+    last_tags = {k[-1] for k in wanted}
+    stack = []        # open elements, root first
+    tags = []         # their tags
+    inside = 0        # how many open elements are themselves matches
+    matched = []      # per open element: matched path or None
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            tags.append(elem.tag)
+            hit = None
+            if elem.tag in last_tags:
+                for n in lengths:
+                    hit = wanted.get(tuple(tags[-n:])) if n <= len(tags) else None
+                    if hit is not None:
+                        break
+            matched.append(hit)
+            inside += hit is not None
+            continue
+        hit = matched.pop()
+        stack.pop()
+        tags.pop()
+        if hit is not None:
+            inside -= 1
+            yield hit, elem
+        if hit is not None or not inside:
+            # Done with it: free its subtree and detach it from the parent
+            elem.clear()
+            if stack:
+                stack[-1].remove(elem)
+
+
+def element_to_dict(elem):
+    """Attributes and children as a dict; leaf children become their text,
+    repeated tags become lists, the element's own text goes under "#text"
+    (so a matched leaf like <title>Foo</title> is {"#text": "Foo"})."""
+    record = dict(elem.attrib)
+    for child in elem:
+        value = element_to_dict(child) if len(child) or child.attrib else (child.text or "").strip()
+        if child.tag in record:
+            previous = record[child.tag]
+            if isinstance(previous, list):
+                previous.append(value)
+            else:
+                record[child.tag] = [previous, value]
+        else:
+            record[child.tag] = value
+    text = (elem.text or "").strip()
+    if text:
+        record["#text"] = text
+    return record
+
+
+def iter_records(source, paths):
+    """Yield element_to_dict() of each matched element (see iter_elements)."""
+    for _, elem in iter_elements(source, paths):
+        yield element_to_dict(elem)
+
+
+# --- conversion: parse -> flatten -> write -------------------------------------
+def flatten(record, prefix="", keep_lists=False):
+    """
+    One flat dict with dotted keys for a nested element_to_dict() record;
+    "#text" next to attributes takes the parent's name. Lists are kept
+    (keep_lists, for JSON) or turned into one CSV field: plain values joined
+    with "|", lists of dicts as a JSON string.
+    """
+    flat = {}
+    for key, value in record.items():
+        if key == "#text" and prefix:
+            name = prefix
+        else:
+            name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name, keep_lists))
+        elif not isinstance(value, list):
+            flat[name] = value
+        elif keep_lists:
+            flat[name] = [flatten(v, "", True) if isinstance(v, dict) else v for v in value]
+        elif any(isinstance(v, dict) for v in value):
+            flat[name] = json.dumps(value, ensure_ascii=False)
+        else:
+            flat[name] = "|".join(value)
+    return flat
+
+
+def _flat_record(elem, keep_lists):
+    """
+    flatten(element_to_dict(elem)) in one pass for the usual record shape:
+    children that are leaves, with or without attributes, each tag once.
+    Anything else takes the general path.
+    """
+    flat = dict(elem.attrib)
+    seen = set()
+    for child in elem:
+        tag = child.tag
+        if len(child) or tag in seen or tag in flat:
+            return flatten(element_to_dict(elem), keep_lists=keep_lists)
+        seen.add(tag)
+        text = (child.text or "").strip()
+        if child.attrib:
+            for key, value in child.attrib.items():
+                flat[f"{tag}.{key}"] = value
+            if text:
+                flat[tag] = text
+        else:
+            flat[tag] = text
+    text = (elem.text or "").strip()
+    if text:
+        flat["#text"] = text
+    return flat
+
+
+def infer_schema(records):
+    """{column: int | float | str | list} for flat records, columns in first-seen order."""
+    values = {}
+    for record in records:
+        for key, value in record.items():
+            values.setdefault(key, []).append(value)
+    return {key: list if any(isinstance(v, list) for v in column) else infer_type(column)
+            for key, column in values.items()}
+
+
+def _typed(record, numeric):
+    """Convert the numeric columns ({column: int | float}) of a flat record in place."""
+    for key, kind in numeric.items():
+        value = record.get(key)
+        if isinstance(value, str):
+            try:
+                record[key] = kind(value) if value else None
+            except ValueError:
+                pass              # the sample missed this; keep the text
+    return record
+
+
+_dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def _format_batch(records, fmt, schema):
+    if fmt == "jsonl":
+        numeric = {key: kind for key, kind in schema.items() if kind is int or kind is float}
+        return "".join([_dumps(_typed(record, numeric)) + "\n" for record in records])
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, list(schema), extrasaction="ignore", lineterminator="\n")
+    writer.writerows(records)
+    return buf.getvalue()
+
+
+def _convert_stream(elements, out, fmt, schema, batch_size):
+    """Flatten, format and write record elements a batch at a time: (count, unknown columns)."""
+    keep_lists = fmt == "jsonl"
+    columns = schema.keys()
+    unknown = set()
+    count = 0
+    while True:
+        batch = [_flat_record(elem, keep_lists) for elem in islice(elements, batch_size)]
+        if not batch:
+            return count, unknown
+        if fmt == "csv":
+            for record in batch:
+                extra = record.keys() - columns
+                if extra:
+                    unknown |= extra
+        out.write(_format_batch(batch, fmt, schema))
+        count += len(batch)
+
+
+def _record_spans(data, tag, start, end):
+    """(begin, stop) byte offsets of every <tag>...</tag> whose start tag begins in [start, end)."""
+    open_tag, close_tag = b"<" + tag, b"</" + tag
+    n = len(open_tag)
+    pos = start
+    while True:
+        begin = data.find(open_tag, pos)
+        if begin < 0 or begin >= end:
+            return
+        pos = begin + n
+        if data[pos:pos + 1] not in _TAG_END:     # <bookshelf>, not <book>
+            continue
+        rest = _START_TAG_REST.match(data, pos)
+        if rest is None:
+            raise ValueError(f"<{tag.decode()}> at byte {begin} is cut off")
+        gt = rest.end() - 1
+        if data[gt - 1:gt] == b"/":                    # <book ... />
+            stop = gt + 1
+        else:
+            close = data.find(close_tag, gt)
+            while close >= 0 and data[close + n + 1:close + n + 2] not in _TAG_END:
+                close = data.find(close_tag, close + n + 1)
+            stop = data.find(b">", close) + 1 if close >= 0 else 0
+            if not stop:
+                raise ValueError(f"<{tag.decode()}> at byte {begin} is never closed")
+        yield begin, stop
+        pos = stop
+
+
+def _shard_tag(path):
+    """<shard> start tag carrying the root element's namespace declarations,
+    so prefixed names inside the records still resolve."""
+    declarations = []
+    for event, item in ET.iterparse(path, events=("start-ns", "start")):
+        if event == "start":
+            break
+        prefix, uri = item
+        name = f"xmlns:{prefix}" if prefix else "xmlns"
+        declarations.append(f" {name}={quoteattr(uri)}")
+    return f"<shard{''.join(declarations)}>".encode()
+
+
+def _iter_shard(path, tag, start, end, batch_size, shard_tag=b"<shard>"):
+    """Elements of the records starting in [start, end), parsed batch_size at a time."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        spans = _record_spans(data, tag.encode(), start, end)
+        while True:
+            batch = [data[begin:stop] for begin, stop in islice(spans, batch_size)]
+            if not batch:
+                return
+            batch.insert(0, shard_tag)
+            batch.append(b"</shard>")
+            yield from ET.fromstring(b"".join(batch))
+
+
+def _convert_shard(path, tag, start, end, part, fmt, schema, batch_size, shard_tag):
+    """Worker: convert one byte range of path into the part file."""
+    with open(part, "w", encoding="utf-8", newline="") as out:
+        return _convert_stream(_iter_shard(path, tag, start, end, batch_size, shard_tag),
+                               out, fmt, schema, batch_size)
+
+
+def _sample_schema(path, records, keep_lists, sample):
+    head = iter_elements(path, records)
+    try:
+        return infer_schema(_flat_record(elem, keep_lists) for _, elem in islice(head, sample))
+    finally:
+        head.close()
+
+
+def convert(path, out_path, records, fmt=None, processes=1, sample=1000, batch_size=5000):
+    """
+    Convert the records matched by `records` (a path as in iter_elements)
+    from the XML file at path into JSON Lines or CSV.
+
+        fmt         "jsonl" or "csv"; default from out_path's suffix
+        processes   worker processes splitting the file by byte ranges;
+                    1 streams in this process, None uses every core
+        sample      records used to infer the columns and their types
+        batch_size  records per formatted write (and per parse in workers)
+
+    Returns {"records", "seconds", "mb", "mb_per_s", "schema", "dropped",
+    "sharded"}, where dropped lists CSV columns that appeared only after the
+    sample and sharded is False if the byte-range split had to fall back to
+    one process.
+    """
+    fmt = fmt or ("csv" if Path(out_path).suffix.lower() == ".csv" else "jsonl")
+    if fmt not in FORMATS:
+        raise ValueError(f"fmt must be one of {FORMATS}, got {fmt!r}")
+    processes = processes or os.cpu_count()
+    size = os.path.getsize(path)
+    sharded = processes > 1 and size > 0
+    tag = _split(records)[-1]
+    if sharded and tag.startswith("{"):
+        raise ValueError("namespaced records cannot be split by byte ranges; use processes=1")
+
+    t0 = time.perf_counter()
+    keep_lists = fmt == "jsonl"
+    schema = _sample_schema(path, tag if sharded else records, keep_lists, sample)
+
+    tmp = f"{out_path}.tmp"
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    try:
+        if sharded:
+            bounds = [size * i // processes for i in range(processes + 1)]
+            parts = [f"{tmp}.{i}" for i in range(processes)]
+            try:
+                with ProcessPoolExecutor(max_workers=processes) as pool:
+                    results = list(pool.map(_convert_shard, repeat(path), repeat(tag),
+                                            bounds[:-1], bounds[1:], parts, repeat(fmt),
+                                            repeat(schema), repeat(batch_size),
+                                            repeat(_shard_tag(path))))
+            except ET.ParseError:
+                # A record does not parse on its own (e.g. a namespace prefix
+                # declared on an element between the root and the records)
+                sharded = False
+                schema = _sample_schema(path, records, keep_lists, sample)
+        with open(tmp, "w", encoding="utf-8", newline="") as out:
+            if fmt == "csv":
+                csv.writer(out, lineterminator="\n").writerow(schema)
+            if not sharded:
+                elements = (elem for _, elem in iter_elements(path, records))
+                count, unknown = _convert_stream(elements, out, fmt, schema, batch_size)
+        if sharded:
+            with open(tmp, "ab") as out:
+                for part in parts:
+                    with open(part, "rb") as f:
+                        shutil.copyfileobj(f, out, 1 << 20)
+                    os.remove(part)
+            count = sum(n for n, _ in results)
+            unknown = set().union(*(u for _, u in results))
+        os.replace(tmp, out_path)
+    finally:
+        for leftover in [tmp] + [f"{tmp}.{i}" for i in range(processes)]:
+            if os.path.exists(leftover):
+                os.remove(leftover)
+    elapsed = time.perf_counter() - t0
+    return {"records": count, "seconds": elapsed, "mb": size / 1e6,
+            "mb_per_s": size / 1e6 / elapsed if elapsed else float("inf"),
+            "schema": schema, "dropped": sorted(unknown) if fmt == "csv" else [],
+            "sharded": sharded}
+
+
+def _peak_rss_mb():
+    import resource
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def _bench_one(mode, path, records):
+    """Runs in a fresh process: (elements or records seen, seconds, peak RSS MB)."""
+    t0 = time.perf_counter()
+    if mode == "ET.parse":
+        count = sum(1 for _ in ET.parse(path).getroot().iter())
+    elif records:
+        count = sum(1 for _ in iter_records(path, records))
+    else:
+        count, stack = 0, []
+        for event, elem in ET.iterparse(path, events=("start", "end")):
+            if event == "start":
+                stack.append(elem)
+                continue
+            count += 1
+            stack.pop()
+            elem.clear()
+            if stack:
+                stack[-1].remove(elem)
+    return count, time.perf_counter() - t0, _peak_rss_mb()
+
+
+def bench(path, records=None):
+    """Compare ET.parse with the streaming reader, each in a fresh process."""
+    import multiprocessing
+
+    spawn = multiprocessing.get_context("spawn")
+    size_mb = os.path.getsize(path) / 1e6
+    unit = "records" if records else "elements"
+    print(f"{path}: {size_mb:.1f} MB")
+    for mode in ("ET.parse", "iterparse"):
+        with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+            count, elapsed, rss = pool.submit(_bench_one, mode, path, records).result()
+        label = mode if mode == "ET.parse" else f"iterparse ({unit})"
+        print(f"{label:24s} {count:>10,} in {elapsed:6.2f}s = {count / elapsed:>12,.0f}/s, "
+              f"peak RSS {rss:7.1f} MB")
+
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python xml_converter.py <path-to-xml>")
+        # Leaf records keep their text when streamed
+        feed = io.BytesIO(b"<catalog><title>Dune</title><title lang='fr'>Solaris</title></catalog>")
+        titles = list(iter_records(feed, "title"))
+        assert titles == [{"#text": "Dune"}, {"lang": "fr", "#text": "Solaris"}], titles
+        print("streamed leaf records:", titles)
+        print("Usage: python xml_converter.py <path-to-xml> [--stream] [--records PATH] [--bench]\n"
+              "       python xml_converter.py <path-to-xml> --records PATH --out FILE.jsonl|FILE.csv"
+              " [--processes N] [--sample N] [--batch-size N]")
     else:
-        read_xml(sys.argv[1])
+        args = sys.argv[2:]
+
+        def option(name, default=None):
+            return args[args.index(name) + 1] if name in args else default
+
+        record_path = option("--records")
+        if "--out" in args:
+            if not record_path:
+                sys.exit("--out needs --records PATH")
+            summary = convert(sys.argv[1], option("--out"), record_path,
+                              processes=int(option("--processes", 1)),
+                              sample=int(option("--sample", 1000)),
+                              batch_size=int(option("--batch-size", 5000)))
+            print(f"{summary['records']:,} records, {len(summary['schema'])} columns, "
+                  f"{summary['mb']:.1f} MB in {summary['seconds']:.2f}s = "
+                  f"{summary['mb_per_s']:.1f} MB/s")
+            if summary["dropped"]:
+                print(f"columns not in the first {option('--sample', 1000)} records were "
+                      f"dropped: {summary['dropped']} (raise --sample)")
+        elif "--bench" in args:
+            bench(sys.argv[1], record_path)
+        elif record_path:
+            for record in iter_records(sys.argv[1], record_path):
+                print(record)
+        else:
+            read_xml(sys.argv[1], stream="--stream" in args)
@@ -10,7 +10,10 @@ def compute_total(scores):
 
 
 def compute_average(scores):
-    """Return the average of a list of numbers using compute_total()."""
+    """Return the average of a list of numbers using compute_total().
+
+    For streams, or stats that merge across workers, see data_handling/running_stats.py.
+    """
     total = compute_total(scores)
     return total / len(scores)
 